@@ -4,19 +4,22 @@ Admin Dashboard API Endpoints
 Provides APIs for Admin Dashboard monitoring and management.
 """
 
+import asyncio
+import json
 import logging
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
-from io import StringIO
-import csv
-import json
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Path, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.services import webhook_log_service
+from app.core.config import settings
+from app.core.metrics import api_call_summary
+from app.core.response_cache import cached_response
+from app.core.streaming import iter_csv, iter_json_array, iter_ndjson, gzip_chunks, json_default
+from app.services import webhook_log_service, dashboard_service, columnar_export_service, activity_feed_service
 # from app.core.auth import get_current_user, require_admin  # TODO: Implement auth
 
 logger = logging.getLogger(__name__)
@@ -77,7 +80,8 @@ async def get_webhook_logs(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status (success/failed/retrying)"),
     date_from: Optional[datetime] = Query(None, description="Filter logs from this date"),
     date_to: Optional[datetime] = Query(None, description="Filter logs until this date"),
-    search: Optional[str] = Query(None, description="Full-text search in payload"),
+    search: Optional[str] = Query(None, description="Payload search (field:value terms and/or free text)"),
+    search_mode: str = Query("auto", regex="^(auto|structured|text)$", description="Payload search mode"),
     organization_id: Optional[UUID] = Query(None, description="Organization ID (for customer view)"),
     user_role: str = Query("member", description="User role (sb_admin, sb_operator, owner, admin, member)")
 ):
@@ -92,7 +96,13 @@ async def get_webhook_logs(
     - campaign_id: Filter by specific campaign
     - status: Filter by status (success, failed, retrying, pending)
     - date_from/date_to: Date range filter
-    - search: Full-text search in webhook payload
+    - search: Search in webhook payload
+        - `field:value` / `extra_data.key:value` match payload fields exactly (GIN index)
+        - `field:prefix*` matches a prefix, `field:*` requires the field
+        - remaining free text is a substring match (trigram index)
+    - search_mode: auto (default: field terms only on known payload fields, so
+      `https://...` stays a substring search), structured (field terms on any
+      path only), text (substring only)
 
     **Pagination:**
     - limit: Max 500 logs per request
@@ -119,7 +129,8 @@ async def get_webhook_logs(
             date_to=date_to,
             search=search,
             organization_id=organization_id,
-            user_role=user_role
+            user_role=user_role,
+            search_mode=search_mode
         )
 
         return {
@@ -127,6 +138,11 @@ async def get_webhook_logs(
             "data": result
         }
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to fetch webhook logs: {e}")
         raise HTTPException(
@@ -265,13 +281,16 @@ async def cleanup_old_webhook_logs(
     """
     Delete old webhook logs to free up database space.
 
+    webhook_log is partitioned by month, so this drops whole partitions
+    whose rows are all older than `older_than_days` (no DELETE, no bloat).
+
     **Admin Only** - Requires sb_admin role
 
     **Args:**
     - older_than_days: Delete logs older than this many days (default: 90, max: 365)
 
     **Returns:**
-    - Number of deleted logs
+    - Estimated number of deleted logs
 
     **⚠️ Warning:** This operation is irreversible!
     """
@@ -297,9 +316,17 @@ async def cleanup_old_webhook_logs(
         )
 
 
+# Columns of the CSV export
+WEBHOOK_LOG_EXPORT_FIELDS = [
+    "id", "event_type", "event_source", "campaign_name",
+    "contact_email", "status", "error_message", "created_at"
+]
+
+
 @router.get("/webhooks/logs/export", status_code=status.HTTP_200_OK)
 async def export_webhook_logs(
-    format: str = Query("csv", regex="^(csv|json)$", description="Export format"),
+    format: str = Query("csv", regex="^(csv|json|ndjson)$", description="Export format"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
     event_type: Optional[str] = Query(None),
     campaign_id: Optional[UUID] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
@@ -311,91 +338,79 @@ async def export_webhook_logs(
 
     **Admin Only**
 
+    All matching rows are exported (no row cap). Rows are read from a
+    server-side cursor and encoded while streaming, so memory use does not
+    grow with the size of the export.
+
     **Formats:**
     - csv: Comma-separated values
     - json: JSON array
+    - ndjson: One JSON object per line
 
     **Returns:**
-    - File download with appropriate content-type
+    - File download with appropriate content-type (.gz if gzip=true)
     """
     # TODO: Add auth check (admin only)
     # user = Depends(require_admin)
 
-    try:
-        # Get logs with same filters
-        result = await webhook_log_service.get_webhook_logs(
-            limit=10000,  # Max export limit
-            offset=0,
-            event_type=event_type,
-            campaign_id=campaign_id,
-            status=status_filter,
-            date_from=date_from,
-            date_to=date_to,
-            user_role="sb_admin"  # Admin export sees all
-        )
-
-        logs = result["logs"]
-
-        if format == "csv":
-            # Generate CSV
-            output = StringIO()
-            writer = csv.DictWriter(output, fieldnames=[
-                "id", "event_type", "event_source", "campaign_name",
-                "contact_email", "status", "error_message", "created_at"
-            ])
-            writer.writeheader()
-
-            for log in logs:
-                writer.writerow({
-                    "id": str(log["id"]),
-                    "event_type": log["event_type"],
-                    "event_source": log["event_source"],
-                    "campaign_name": log.get("campaign_name", ""),
-                    "contact_email": log.get("contact_email", ""),
-                    "status": log["status"],
-                    "error_message": log.get("error_message", ""),
-                    "created_at": log["created_at"].isoformat()
-                })
-
-            content = output.getvalue()
-
-            return StreamingResponse(
-                iter([content]),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=webhook_logs_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-                }
-            )
-
-        else:  # json
-            # Generate JSON
-            # Convert datetime objects to strings
-            for log in logs:
-                log["created_at"] = log["created_at"].isoformat()
-                if log.get("processed_at"):
-                    log["processed_at"] = log["processed_at"].isoformat()
-                if log.get("last_retry_at"):
-                    log["last_retry_at"] = log["last_retry_at"].isoformat()
-
-            content = json.dumps(logs, indent=2)
-
-            return StreamingResponse(
-                iter([content]),
-                media_type="application/json",
-                headers={
-                    "Content-Disposition": f"attachment; filename=webhook_logs_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-                }
-            )
+    logs = webhook_log_service.stream_webhook_logs(
+        event_type=event_type,
+        campaign_id=campaign_id,
+        status=status_filter,
+        date_from=date_from,
+        date_to=date_to,
+        user_role="sb_admin"  # Admin export sees all
+    )
+
+    async def csv_rows():
+        async for log in logs:
+            yield {
+                "id": str(log["id"]),
+                "event_type": log["event_type"],
+                "event_source": log["event_source"],
+                "campaign_name": log.get("campaign_name") or "",
+                "contact_email": log.get("contact_email") or "",
+                "status": log["status"],
+                "error_message": log.get("error_message") or "",
+                "created_at": log["created_at"].isoformat()
+            }
 
-    except Exception as e:
-        logger.error(f"Failed to export webhook logs: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    async def logged(chunks):
+        # Headers are already sent once streaming starts; a failure can only truncate the body
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            logger.error(f"Failed to export webhook logs: {e}")
+            raise
+
+    if format == "csv":
+        chunks = iter_csv(csv_rows(), WEBHOOK_LOG_EXPORT_FIELDS)
+        media_type = "text/csv"
+    elif format == "json":
+        chunks = iter_json_array(logs)
+        media_type = "application/json"
+    else:  # ndjson
+        chunks = iter_ndjson(logs)
+        media_type = "application/x-ndjson"
+
+    filename = f"webhook_logs_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{format}"
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        logged(chunks),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
 
 
 @router.get("/webhooks/stats", status_code=status.HTTP_200_OK)
+@cached_response(tags=["webhooks"])
 async def get_webhook_stats():
     """
     Get webhook statistics for dashboard.
@@ -421,11 +436,71 @@ async def get_webhook_stats():
         )
 
 
+# ========================================
+# Analytics Export Endpoints
+# ========================================
+
+@router.get("/exports/{table}", status_code=status.HTTP_200_OK)
+async def export_table_columnar(
+    table: str = Path(..., regex="^(message|event_log|webhook_log)$"),
+    format: str = Query("parquet", regex="^(parquet|arrow)$", description="Export format"),
+    campaign_id: Optional[UUID] = Query(None),
+    organization_id: Optional[UUID] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    row_group_size: int = Query(50000, ge=1000, le=500000, description="Rows per row group")
+):
+    """
+    Export message, event_log or webhook_log as Parquet or Arrow IPC.
+
+    **Admin Only**
+
+    For analytics pulls: typed columns, compressed (zstd), streamed row group
+    by row group from a server-side cursor.
+
+    **Formats:**
+    - parquet: Apache Parquet
+    - arrow: Arrow IPC file (Feather v2)
+
+    **Returns:**
+    - File download (501 if pyarrow is not installed)
+    """
+    # TODO: Add auth check (admin only)
+
+    if not columnar_export_service.pyarrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar export requires pyarrow"
+        )
+
+    media_type, extension = columnar_export_service.EXPORT_CONTENT_TYPES[format]
+    filename = f"{table}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+    chunks = columnar_export_service.stream_export(
+        table,
+        format,
+        campaign_id=campaign_id,
+        organization_id=organization_id,
+        date_from=date_from,
+        date_to=date_to,
+        row_group_size=row_group_size
+    )
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
+
+
 # ========================================
 # Campaign Filter Endpoints
 # ========================================
 
 @router.get("/campaigns/filter", status_code=status.HTTP_200_OK)
+@cached_response(tags=["campaigns"])
 async def get_campaigns_for_filter(
     organization_id: Optional[UUID] = Query(None, description="Filter by organization"),
     search: Optional[str] = Query(None, description="Search campaign names"),
@@ -504,7 +579,7 @@ async def get_dashboard_stats(
     **Returns:**
     - Total campaigns, contacts, messages
     - Webhook statistics
-    - API health metrics
+    - API call metrics (this worker, since start: total, 5xx errors, avg response time)
     - User counts
     """
     # TODO: Add auth check
@@ -513,99 +588,52 @@ async def get_dashboard_stats(
     #     organization_id = user.organization_id
 
     try:
-        from app.core import db
+        stats = await dashboard_service.get_dashboard_stats(organization_id)
 
-        async with db.tenant_db_pool.acquire() as conn:
-            # Build WHERE clause for organization filtering
-            org_filter = ""
-            params = []
-            if organization_id:
-                org_filter = "WHERE c.organization_id = $1"
-                params.append(organization_id)
-
-            # Get campaign stats
-            campaign_stats = await conn.fetchrow(f"""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') as today,
-                    COUNT(*) FILTER (WHERE status = 'active') as active
-                FROM campaign c
-                {org_filter}
-            """, *params)
+        return {
+            "success": True,
+            "data": {
+                **stats,
+                "api_calls": api_call_summary()
+            }
+        }
 
-            # Get contact stats
-            contact_stats = await conn.fetchrow(f"""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') as today,
-                    ROUND(AVG(lead_score), 1) as lead_score_avg
-                FROM contact c
-                {org_filter.replace('c.organization_id', 'c.organization_id') if organization_id else ''}
-            """, *params)
+    except Exception as e:
+        logger.error(f"Failed to fetch dashboard stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
 
-            # Get message stats
-            message_stats = await conn.fetchrow(f"""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE sent_at >= NOW() - INTERVAL '24 hours') as today,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE opened_at IS NOT NULL)::numeric * 100 /
-                        NULLIF(COUNT(*), 0), 1
-                    ) as open_rate,
-                    ROUND(
-                        COUNT(*) FILTER (WHERE replied_at IS NOT NULL)::numeric * 100 /
-                        NULLIF(COUNT(*), 0), 1
-                    ) as reply_rate
-                FROM message m
-                JOIN campaign c ON m.campaign_id = c.id
-                {org_filter.replace('c.organization_id', 'c.organization_id') if organization_id else ''}
-            """, *params)
 
-            # Get webhook stats (last hour and 24h)
-            webhook_filter = ""
-            if organization_id:
-                webhook_filter = "WHERE wl.organization_id = $1"
-
-            webhook_stats = await conn.fetchrow(f"""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '1 hour') as last_hour,
-                    COUNT(*) FILTER (WHERE status = 'failed' AND created_at >= NOW() - INTERVAL '1 hour') as failed_last_hour,
-                    CASE
-                        WHEN COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '1 minute') > 0
-                        THEN ROUND(COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '1 minute')::numeric / 60, 1)
-                        ELSE 0
-                    END as avg_per_second
-                FROM webhook_log wl
-                {webhook_filter}
-            """, *params)
+@router.post("/dashboard/rollups/rebuild", status_code=status.HTTP_200_OK)
+async def rebuild_dashboard_rollups(
+    date_from: Optional[datetime] = Query(None, description="Rebuild buckets from this date"),
+    date_to: Optional[datetime] = Query(None, description="Rebuild buckets until this date (exclusive)")
+):
+    """
+    Recompute dashboard rollup counters from the source tables.
 
-            # Get user count (admin only, no org filter for now)
-            user_stats = await conn.fetchrow("""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE status = 'active') as active_now
-                FROM "user"
-            """)
+    **Admin Only** - Reconciliation job; counters are normally maintained
+    incrementally on insert. Blocks webhook ingest while running, so prefer
+    small date ranges.
+
+    **Returns:**
+    - Number of rebuilt message and webhook buckets
+    """
+    # TODO: Add auth check (sb_admin only)
+    # user = Depends(require_admin)
+
+    try:
+        result = await dashboard_service.rebuild_dashboard_rollups(date_from, date_to)
 
         return {
             "success": True,
-            "data": {
-                "campaigns": dict(campaign_stats) if campaign_stats else {},
-                "contacts": dict(contact_stats) if contact_stats else {},
-                "messages": dict(message_stats) if message_stats else {},
-                "webhooks": dict(webhook_stats) if webhook_stats else {},
-                "users": dict(user_stats) if user_stats else {},
-                "api_calls": {
-                    "total": 0,  # TODO: Implement API call tracking
-                    "status": "healthy",
-                    "avg_response_time": 0
-                }
-            }
+            "data": result
         }
 
     except Exception as e:
-        logger.error(f"Failed to fetch dashboard stats: {e}")
+        logger.error(f"Failed to rebuild dashboard rollups: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -630,19 +658,19 @@ async def get_recent_activity(
         # Get recent webhook activity
         webhook_activity = await webhook_log_service.get_recent_webhook_activity(limit)
 
-        # Format for activity feed
+        # Format for activity feed (same items as the live stream)
         activities = []
         for wh in webhook_activity:
-            activities.append({
-                "type": "webhook",
-                "event_type": wh["event_type"],
-                "event_source": wh["event_source"],
-                "description": f"Webhook received: {wh['event_type']}",
-                "campaign_name": wh.get("campaign_name"),
-                "contact_email": wh.get("contact_email"),
-                "status": wh["status"],
-                "timestamp": wh["created_at"]
-            })
+            activities.append(activity_feed_service.webhook_activity_event(
+                wh["id"],
+                wh["event_type"],
+                wh["event_source"],
+                wh["status"],
+                wh["created_at"],
+                organization_id=wh["organization_id"],
+                campaign_name=wh.get("campaign_name"),
+                contact_email=wh.get("contact_email")
+            ))
 
         # Sort by timestamp
         activities.sort(key=lambda x: x["timestamp"], reverse=True)
@@ -660,6 +688,47 @@ async def get_recent_activity(
         )
 
 
+@router.get("/dashboard/activity/stream", status_code=status.HTTP_200_OK)
+async def stream_activity(
+    request: Request,
+    organization_id: Optional[UUID] = Query(None, description="Only events of this organization")
+):
+    """
+    Live activity feed as Server-Sent Events.
+
+    Replaces polling /dashboard/recent-activity: load the initial list from
+    there once, then receive every new webhook event as it is ingested.
+
+    **Events:**
+    - event "activity", data: activity item (JSON), id: webhook log id
+    - comment lines every few seconds as keep-alive
+    """
+    # TODO: Add auth check
+    # Non-admins must be limited to their own organization_id
+
+    async def events():
+        async with activity_feed_service.broadcaster.subscribe(organization_id) as queue:
+            yield "retry: 5000\n\n"
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.activity_feed_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield f"id: {event.get('id', '')}\nevent: activity\ndata: {json.dumps(event, default=json_default)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
+
+
 # ========================================
 # Health Check
 # ========================================
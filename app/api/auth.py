@@ -3,17 +3,21 @@ Authentication endpoints
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends
-from datetime import timedelta
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from typing import Optional
+from uuid import UUID
 
-from app.core.config import settings
-from app.core.db import get_tenant_db_conn
-from app.core.security import verify_password, create_access_token
+from app.core.security import PasswordHasherBusy, decode_access_token, verify_password_async
 from app.core.auth import get_current_user
-from app.models.auth import LoginRequest, LoginResponse, TokenData
+from app.models.auth import LoginRequest, LoginResponse, LogoutRequest, RefreshRequest, TokenData, TokenResponse
+from app.services import auth_service, token_service
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Logout also works without (or with an expired) access token
+optional_bearer = HTTPBearer(auto_error=False)
+
 
 @router.post("/login", response_model=LoginResponse)
 async def login(credentials: LoginRequest):
@@ -28,27 +32,10 @@ async def login(credentials: LoginRequest):
 
     Raises:
         401: Invalid credentials
+        503: Too many logins in progress
     """
-    # Query user from database
-    async with get_tenant_db_conn("00000000-0000-0000-0000-000000000000") as conn:
-        # Note: Using dummy org_id for login query (RLS not applicable here)
-        # We'll get the real org_id from the user record
-        user_record = await conn.fetchrow(
-            """
-            SELECT
-                id,
-                organization_id,
-                email,
-                password_hash,
-                role,
-                status,
-                first_name,
-                last_name
-            FROM "user"
-            WHERE email = $1
-            """,
-            credentials.email
-        )
+    # Lookup by lower(email) through auth_lookup_user() (no RLS context needed)
+    user_record = await auth_service.get_login_user(credentials.email)
 
     if not user_record:
         raise HTTPException(
@@ -57,8 +44,17 @@ async def login(credentials: LoginRequest):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verify password
-    if not verify_password(credentials.password, user_record["password_hash"]):
+    # Verify password (bcrypt runs on the password hash pool)
+    try:
+        password_ok = await verify_password_async(credentials.password, user_record["password_hash"])
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -72,22 +68,19 @@ async def login(credentials: LoginRequest):
             detail=f"User account is {user_record['status']}"
         )
 
-    # Create JWT token
-    token_data = {
-        "user_id": str(user_record["id"]),
-        "organization_id": str(user_record["organization_id"]),
+    # Create JWT access token + refresh token (new session)
+    session = await token_service.create_session({
+        "user_id": user_record["id"],
+        "organization_id": user_record["organization_id"],
         "role": user_record["role"],
         "email": user_record["email"]
-    }
-
-    access_token = create_access_token(
-        data=token_data,
-        expires_delta=timedelta(minutes=settings.jwt_access_token_expire_minutes)
-    )
+    })
 
     return LoginResponse(
-        access_token=access_token,
+        access_token=session["access_token"],
         token_type="bearer",
+        refresh_token=session["refresh_token"],
+        expires_in=session["expires_in"],
         user_id=str(user_record["id"]),
         organization_id=str(user_record["organization_id"]),
         role=user_record["role"],
@@ -111,12 +104,56 @@ async def get_current_user_info(user: TokenData = Depends(get_current_user)):
     return user
 
 
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(request: RefreshRequest):
+    """
+    Refresh endpoint (no password check)
+
+    Rotates the refresh token: the one presented becomes invalid, and
+    presenting it again revokes the whole session.
+
+    Args:
+        request: Refresh token from login or the previous refresh
+
+    Returns:
+        New access token and refresh token
+
+    Raises:
+        401: Invalid, expired, revoked or reused refresh token
+    """
+    try:
+        session = await token_service.refresh_session(request.refresh_token)
+    except token_service.InvalidRefreshToken as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return TokenResponse(**session)
+
+
 @router.post("/logout")
-async def logout():
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer)
+):
     """
-    Logout endpoint (client-side token removal)
+    Logout endpoint
 
-    Note: JWT tokens are stateless, so logout is handled client-side
-          by removing the token from storage
+    Revokes the session of the bearer access token and/or of the given
+    refresh token: its refresh tokens stop working and all access tokens
+    issued for it are rejected from now on (on every worker).
     """
+    if credentials:
+        payload = decode_access_token(credentials.credentials)
+        if payload:
+            if payload.get("sid"):
+                await token_service.revoke_session(UUID(payload["sid"]))
+            elif payload.get("jti") and isinstance(payload.get("exp"), (int, float)):
+                await token_service.revoke_access_token(payload["jti"], payload["exp"])
+
+    if request and request.refresh_token:
+        await token_service.revoke_session_by_refresh_token(request.refresh_token)
+
     return {"message": "Logged out successfully"}
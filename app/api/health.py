@@ -1,10 +1,14 @@
 """
 Health check endpoints
+
+Probes are answered from the background health monitor's last results
+(app.core.health), so they never acquire database connections.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-from app.core.db import check_global_kb_health, check_tenant_db_health
+from app.core import db
+from app.core.health import health_monitor
 
 
 router = APIRouter()
@@ -16,38 +20,43 @@ async def health_check():
     Basic health check endpoint
 
     Returns:
-        Health status with database connectivity
+        Health status per database with the last check's latency, error
+        and pool occupancy
     """
-    global_kb_ok = await check_global_kb_health()
-    tenant_db_ok = await check_tenant_db_health()
-
-    all_ok = global_kb_ok and tenant_db_ok
+    checks = health_monitor.snapshot()
+    all_ok = all(check["ok"] and not check["stale"] for check in checks.values())
 
     return {
         "status": "ok" if all_ok else "degraded",
         "databases": {
-            "global_kb": "connected" if global_kb_ok else "disconnected",
-            "tenant": "connected" if tenant_db_ok else "disconnected"
-        }
+            name: _database_status(name, check["ok"] and not check["stale"])
+            for name, check in checks.items()
+        },
+        "checks": checks
     }
 
 
+def _database_status(name: str, ok: bool) -> str:
+    if ok:
+        return "connected"
+    # Pool not created yet (degraded startup, retrying in the background)
+    if db.pool_states.get(name, {}).get("state") == "connecting":
+        return "connecting"
+    return "disconnected"
+
+
 @router.get("/health/ready")
 async def readiness_check():
     """
     Kubernetes readiness probe
 
     Returns:
-        200 if ready, 503 if not ready
+        200 if every database passed its last (recent) check, 503 if not
     """
-    global_kb_ok = await check_global_kb_health()
-    tenant_db_ok = await check_tenant_db_health()
-
-    if global_kb_ok and tenant_db_ok:
+    if health_monitor.ready():
         return {"status": "ready"}
-    else:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=503, detail="Not ready")
+
+    raise HTTPException(status_code=503, detail="Not ready")
 
 
 @router.get("/health/live")
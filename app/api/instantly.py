@@ -8,8 +8,11 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.core.response_cache import cached_response
+from app.core.streaming import to_ndjson_line
 from app.services.campaign_service import CampaignService
 from app.services.email_account_service import EmailAccountService
 from app.services.message_service import MessageService
@@ -46,6 +49,7 @@ class SyncWorkspaceResponse(BaseModel):
 # ========================================
 
 @router.get("/admin/campaigns", status_code=status.HTTP_200_OK)
+@cached_response(tags=["campaigns"])
 async def admin_get_all_campaigns():
     """
     Get ALL campaigns across ALL organizations
@@ -76,6 +80,7 @@ async def admin_get_all_campaigns():
 
 
 @router.get("/admin/email-accounts", status_code=status.HTTP_200_OK)
+@cached_response(tags=["email_accounts"])
 async def admin_get_all_email_accounts():
     """
     Get ALL email accounts across ALL organizations
@@ -245,34 +250,56 @@ async def get_user_email_accounts(
 async def get_campaign_messages(
     campaign_id: UUID,
     limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from previous page (keyset pagination)")
 ):
     """
     Get messages for a campaign
 
+    Pass `cursor` (the `next_cursor` of the previous response) for keyset
+    pagination, which stays fast at any depth. `offset` is kept for
+    backwards compatibility and is ignored when `cursor` is set.
+
     Args:
         campaign_id: Campaign UUID
         limit: Max results (1-500)
-        offset: Pagination offset
+        offset: Pagination offset (legacy)
+        cursor: Keyset cursor
 
     Returns:
-        List of messages
+        List of messages and next_cursor
     """
     try:
-        messages = await MessageService.get_messages_for_campaign(
-            campaign_id,
-            limit=limit,
-            offset=offset
-        )
+        if cursor or offset == 0:
+            page = await MessageService.get_messages_for_campaign_page(
+                campaign_id,
+                limit=limit,
+                cursor=cursor
+            )
+            messages = page["messages"]
+            next_cursor = page["next_cursor"]
+        else:
+            messages = await MessageService.get_messages_for_campaign(
+                campaign_id,
+                limit=limit,
+                offset=offset
+            )
+            next_cursor = None
 
         return {
             "success": True,
             "messages": messages,
             "count": len(messages),
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to fetch campaign messages: {e}")
         raise HTTPException(
@@ -281,6 +308,34 @@ async def get_campaign_messages(
         )
 
 
+@router.get("/campaign/{campaign_id}/messages/stream", status_code=status.HTTP_200_OK)
+async def stream_campaign_messages(
+    campaign_id: UUID,
+    batch_size: int = Query(500, ge=10, le=5000, description="Rows fetched per cursor round trip")
+):
+    """
+    Stream all messages of a campaign as NDJSON
+
+    Reads from a server-side cursor, one JSON object per line, so bulk
+    consumers can pull a whole campaign with constant memory.
+
+    Args:
+        campaign_id: Campaign UUID
+        batch_size: Cursor prefetch size
+
+    Returns:
+        application/x-ndjson stream of messages (newest first)
+    """
+    async def generate():
+        async for message in MessageService.stream_messages_for_campaign(
+            campaign_id,
+            batch_size=batch_size
+        ):
+            yield to_ndjson_line(message)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/stats", status_code=status.HTTP_200_OK)
 async def get_organization_stats(
     organization_id: UUID = Query(..., description="Organization UUID")
@@ -0,0 +1,21 @@
+"""
+Prometheus metrics endpoint
+
+Serves the in-process request and database metrics of app.core.metrics.
+Each worker exposes its own numbers; scrape every worker (or a sidecar
+that aggregates them).
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import render
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Metrics in Prometheus text exposition format"""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -8,7 +8,7 @@ import logging
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status, Body
+from fastapi import APIRouter, HTTPException, Query, status, Body
 from pydantic import BaseModel
 
 from app.services import user_assignment_service
@@ -37,6 +37,33 @@ class AssignContactsRequest(BaseModel):
     assignment_type: str = "manual"
 
 
+class ContactAssignmentPair(BaseModel):
+    """One (user, contact) pair of a bulk assignment"""
+    user_id: UUID
+    contact_id: UUID
+
+
+class BulkAssignContactsRequest(BaseModel):
+    """Request to assign many contacts to many users"""
+    assignments: List[ContactAssignmentPair]
+    assignment_type: str = "manual"
+    assigned_by: UUID
+    organization_id: UUID
+
+
+class DistributeContactsRequest(BaseModel):
+    """Request to distribute contacts round-robin"""
+    contact_ids: List[UUID]
+    assigned_by: UUID
+    organization_id: UUID
+
+
+class RoundRobinWeightRequest(BaseModel):
+    """Request to set a user's round-robin weight"""
+    organization_id: UUID
+    weight: float
+
+
 class AssignmentResponse(BaseModel):
     """Response from assignment operation"""
     success: bool
@@ -92,8 +119,9 @@ async def assign_user_to_campaigns(
     - permissions: can_edit, can_view_stats, can_manage_contacts
 
     **Returns:**
-    - success_count: Number of successful assignments
+    - success_count: Number of successful assignments (created_count + updated_count)
     - failed_count: Number of failed assignments
+    - results: Outcome per id (created, updated, failed)
     """
     try:
         result = await user_assignment_service.assign_user_to_campaigns(
@@ -110,10 +138,18 @@ async def assign_user_to_campaigns(
         return {
             "success": True,
             "success_count": result["success_count"],
+            "created_count": result["created_count"],
+            "updated_count": result["updated_count"],
             "failed_count": result["failed_count"],
-            "failed_items": result["failed_campaigns"]
+            "failed_items": result["failed_campaigns"],
+            "results": result["results"]
         }
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to assign user to campaigns: {e}")
         raise HTTPException(
@@ -138,8 +174,9 @@ async def assign_contacts_to_user(
     - assignment_type: manual, round_robin, lead_score, territory
 
     **Returns:**
-    - success_count: Number of successful assignments
+    - success_count: Number of successful assignments (created_count + updated_count)
     - failed_count: Number of failed assignments
+    - results: Outcome per id (created, updated, failed)
     """
     try:
         result = await user_assignment_service.assign_contacts_to_user(
@@ -153,10 +190,18 @@ async def assign_contacts_to_user(
         return {
             "success": True,
             "success_count": result["success_count"],
+            "created_count": result["created_count"],
+            "updated_count": result["updated_count"],
             "failed_count": result["failed_count"],
-            "failed_items": result["failed_contacts"]
+            "failed_items": result["failed_contacts"],
+            "results": result["results"]
         }
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to assign contacts to user: {e}")
         raise HTTPException(
@@ -165,26 +210,179 @@ async def assign_contacts_to_user(
         )
 
 
+@router.post("/contact-assignments/bulk", status_code=status.HTTP_200_OK)
+async def bulk_assign_contacts(request: BulkAssignContactsRequest):
+    """
+    Assign many contacts to many users in one request.
+
+    **Args:**
+    - assignments: List of {user_id, contact_id} pairs (max 10000)
+    - assignment_type: manual, round_robin, lead_score, territory
+    - assigned_by, organization_id
+
+    **Returns:**
+    - success_count: Number of successful assignments (created_count + updated_count)
+    - failed_count: Number of failed assignments
+    - results: Outcome per pair (created, updated, failed)
+    """
+    try:
+        result = await user_assignment_service.bulk_assign_contacts(
+            assignments=[(item.user_id, item.contact_id) for item in request.assignments],
+            assigned_by=request.assigned_by,
+            organization_id=request.organization_id,
+            assignment_type=request.assignment_type
+        )
+
+        return {
+            "success": True,
+            "success_count": result["success_count"],
+            "created_count": result["created_count"],
+            "updated_count": result["updated_count"],
+            "failed_count": result["failed_count"],
+            "failed_items": result["failed_assignments"],
+            "results": result["results"]
+        }
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Failed to bulk assign contacts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.post("/distribute-contacts", status_code=status.HTTP_200_OK)
+async def distribute_contacts_round_robin(request: DistributeContactsRequest):
+    """
+    Distribute contacts over the organization's active users (round-robin).
+
+    Users with the lowest weighted load get contacts first; contacts that
+    already have an active owner are skipped.
+
+    **Returns:**
+    - assignments: {contact_id, user_id} per assigned contact
+    - skipped: contacts with an existing owner
+    - failed: contacts not found in the organization
+    """
+    try:
+        result = await user_assignment_service.distribute_contacts_round_robin(
+            contact_ids=request.contact_ids,
+            organization_id=request.organization_id,
+            assigned_by=request.assigned_by
+        )
+
+        return {
+            "success": True,
+            "data": result
+        }
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Failed to distribute contacts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.put("/{user_id}/round-robin-weight", status_code=status.HTTP_200_OK)
+async def set_round_robin_weight(user_id: UUID, request: RoundRobinWeightRequest):
+    """
+    Set a user's share of round-robin contacts.
+
+    **Args:**
+    - weight: Relative share (1.0 = default, 2.0 = twice as many contacts)
+
+    Returns 404 if the user doesn't belong to organization_id.
+    """
+    try:
+        success = await user_assignment_service.set_round_robin_weight(
+            user_id, request.organization_id, request.weight
+        )
+
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found in organization"
+            )
+
+        return {
+            "success": True,
+            "message": "Round-robin weight updated"
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Failed to set round-robin weight: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.get("", status_code=status.HTTP_200_OK)
 async def get_organization_users(
-    organization_id: UUID
+    organization_id: UUID,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (omit for all users)"),
+    cursor: Optional[str] = Query(None, description="Cursor from previous page (keyset pagination)"),
+    sort: str = Query("created_at", description="created_at, contacts or campaigns"),
+    order: str = Query("desc", description="asc or desc")
 ):
     """
-    Get all users in an organization with assignment counts.
+    Get users in an organization with assignment counts.
+
+    Without `limit` and `cursor` all users are returned. Otherwise the
+    listing is keyset paginated: pass the `next_cursor` of the previous
+    response as `cursor`. Sort by `contacts` or `campaigns` to order users
+    by workload.
 
     **Returns:**
     - List of users with campaigns_count and contacts_count
+    - next_cursor: Cursor for the next page (None on the last page)
     """
     try:
-        users = await user_assignment_service.get_organization_users_with_assignments(
-            organization_id
-        )
+        if limit is None and not cursor:
+            users = await user_assignment_service.get_organization_users_with_assignments(
+                organization_id, sort=sort, order=order
+            )
+            next_cursor = None
+        else:
+            page = await user_assignment_service.get_organization_users_page(
+                organization_id,
+                limit=limit or 100,
+                cursor=cursor,
+                sort=sort,
+                order=order
+            )
+            users = page["users"]
+            next_cursor = page["next_cursor"]
 
         return {
             "success": True,
-            "data": users
+            "data": users,
+            "next_cursor": next_cursor
         }
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Failed to fetch organization users: {e}")
         raise HTTPException(
@@ -1,11 +1,20 @@
 """
 Authentication dependencies and middleware
+
+Verified tokens are kept in a per-worker LRU until their exp, so a client
+polling with the same token pays for signature verification once. Every
+request (cached or not) is checked against the in-memory revocation list.
 """
 
+import hashlib
+import time
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 
+from app.core.config import settings
+from app.core.revocation import jti_key, revoked_tokens, sid_key
 from app.core.security import decode_access_token
 from app.models.auth import TokenData
 
@@ -14,6 +23,57 @@ from app.models.auth import TokenData
 security = HTTPBearer()
 
 
+class VerifiedTokenCache:
+    """LRU of verified token -> value (e.g. TokenData), entries expire at the token's exp"""
+
+    def __init__(self, max_entries: int = 10000, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[Any, float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        # Fixed-size key; raw tokens are not kept
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=20).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        user, exp = entry
+        if exp <= self.clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return user
+
+    def set(self, token: str, user: Any, exp: float) -> None:
+        if self.max_entries <= 0 or exp <= self.clock():
+            return
+
+        key = self._key(token)
+        self._entries[key] = (user, exp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop one token (or everything if token is None)"""
+        if token is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(token), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = VerifiedTokenCache(max_entries=settings.jwt_cache_max_entries)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> TokenData:
@@ -27,6 +87,12 @@ async def get_current_user(
     """
     token = credentials.credentials
 
+    cached = token_cache.get(token)
+    if cached is not None:
+        user, jti, sid = cached
+        _check_not_revoked(jti, sid)
+        return user
+
     payload = decode_access_token(token)
 
     if payload is None:
@@ -49,12 +115,29 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return TokenData(
+    user = TokenData(
         user_id=user_id,
         organization_id=organization_id,
         role=role,
         email=email
     )
+    jti, sid = payload.get("jti"), payload.get("sid")
+    _check_not_revoked(jti, sid)
+
+    # Only tokens with an expiry are cached
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache.set(token, (user, jti, sid), payload["exp"])
+
+    return user
+
+
+def _check_not_revoked(jti: Optional[str], sid: Optional[str]) -> None:
+    if revoked_tokens.is_revoked(jti_key(jti) if jti else None, sid_key(sid) if sid else None):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 
 async def require_role(required_role: str, user: TokenData = Depends(get_current_user)) -> TokenData:
@@ -0,0 +1,132 @@
+"""
+In-process TTL cache with stale-while-revalidate
+
+Usage:
+    stats_cache = TTLCache(ttl=5, stale_ttl=30)
+    stats = await stats_cache.get_or_load(org_id, lambda: load_stats(org_id))
+
+Within ttl a cached value is returned as is. Within the following
+stale_ttl the cached value is still returned immediately, and one background
+task reloads it. After that (or on a miss) callers wait for a load.
+Concurrent callers for the same key share a single load.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Async TTL cache with stale-while-revalidate and LRU eviction"""
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            ttl: Seconds a value is fresh
+            stale_ttl: Seconds after ttl during which the stale value is served while reloading
+            max_entries: Least recently used entries beyond this are evicted
+            clock: Time source in seconds
+        """
+        self.clock = clock
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        # Bumped by invalidate() so loads started earlier don't store old data
+        self._generation = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached value, loading it with loader() when missing or expired.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value
+
+        Returns:
+            Cached or freshly loaded value (loader exceptions propagate on a miss)
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, loaded_at = entry
+            age = self.clock() - loaded_at
+
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                return value
+
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                if key not in self._loading:
+                    self._start_load(key, loader, background=True)
+                return value
+
+        future = self._loading.get(key) or self._start_load(key, loader)
+        return await asyncio.shield(future)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value if still fresh (within ttl), else default; never loads"""
+        entry = self._entries.get(key)
+        if entry is None or self.clock() - entry[1] >= self.ttl:
+            return default
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Cached value regardless of age (None if missing)"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value as freshly loaded"""
+        self._entries[key] = (value, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one key (or everything if key is None)"""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+            self._loading.clear()
+        else:
+            self._entries.pop(key, None)
+            self._loading.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], background: bool = False) -> asyncio.Future:
+        task = asyncio.ensure_future(self._load(key, loader, background))
+        self._loading[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], background: bool) -> Any:
+        generation = self._generation
+        try:
+            value = await loader()
+            if generation == self._generation:
+                self.set(key, value)
+            return value
+        except Exception as e:
+            if not background:
+                raise
+            # Keep serving the stale value; the next request retries
+            logger.error(f"Background cache refresh failed for {key!r}: {e}")
+        finally:
+            if self._loading.get(key) is asyncio.current_task():
+                del self._loading[key]
@@ -20,10 +20,75 @@ class Settings(BaseSettings):
     database_global_url: str
     database_tenant_url: str
 
+    # Connection pools: both are created concurrently on startup.
+    # warmup = open min_size connections up front (off = connect on first use);
+    # startup_degraded = start even if a database is down and keep retrying
+    db_global_pool_min_size: int = 2
+    db_global_pool_max_size: int = 10
+    db_tenant_pool_min_size: int = 5
+    db_tenant_pool_max_size: int = 20
+    db_pool_warmup: bool = True
+    db_startup_degraded: bool = False
+    db_connect_timeout_seconds: float = 10.0
+
+    # Background health monitor (probes are served from its last results)
+    health_check_interval_seconds: float = 5.0
+    health_check_timeout_seconds: float = 2.0
+
+    # Metrics: request/DB query timings, exposed on /metrics (per worker)
+    metrics_enabled: bool = True
+
+    # Slow query log (opt-in): queries over the threshold are logged with their
+    # service method and parameter shapes; a sample of slow SELECTs gets an
+    # EXPLAIN (ANALYZE, BUFFERS) appended to the plan file
+    slow_query_log_enabled: bool = False
+    slow_query_threshold_ms: float = 200.0
+    slow_query_explain_sample_rate: float = 0.1
+    slow_query_explain_path: str = "logs/slow_query_plans.jsonl"
+
+    # Partition maintenance (webhook_log, message, event_log)
+    partition_months_ahead: int = 3
+    partition_maintenance_interval_seconds: int = 86400
+
+    # Admin dashboard stats cache (per organization, stale-while-revalidate)
+    dashboard_cache_ttl_seconds: float = 5.0
+    dashboard_cache_stale_seconds: float = 30.0
+
+    # Response cache for admin read endpoints (Redis URL optional, empty = in-process)
+    response_cache_ttl_seconds: int = 30
+    response_cache_max_entries: int = 512
+    response_cache_redis_url: str = ""
+
+    # Live activity feed (SSE); notify = fan out across workers via LISTEN/NOTIFY
+    activity_feed_notify: bool = True
+    activity_feed_queue_size: int = 100
+    activity_feed_heartbeat_seconds: int = 15
+
+    # Follow-up scheduler (user_contact_assignment.next_followup_at)
+    followup_scheduler_enabled: bool = True
+    followup_tick_seconds: float = 30.0
+    followup_batch_size: int = 500
+    followup_max_batches_per_tick: int = 20
+
+    # Onboarding links: public token lookup cache, batched access tracking
+    onboarding_link_cache_ttl_seconds: float = 10.0
+    onboarding_access_flush_seconds: float = 5.0
+
     # JWT Authentication
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
+    jwt_refresh_token_expire_days: int = 30
+    jwt_backend: str = "auto"  # auto, jose or pyjwt (optional package, faster)
+    jwt_cache_max_entries: int = 10000
+
+    # Login lookups: unknown emails are cached (absorbs credential stuffing)
+    auth_negative_cache_ttl_seconds: float = 60.0
+    auth_negative_cache_max_entries: int = 10000
+
+    # Password hashing pool (bcrypt runs off the event loop)
+    password_hash_workers: int = 4
+    password_hash_max_waiting: int = 32
 
     # API Configuration
     api_host: str = "0.0.0.0"
@@ -3,42 +3,127 @@ Database connection pools for Global-KB and Tenant-DB
 Uses asyncpg for async PostgreSQL connections
 """
 
+import asyncio
+import logging
 import asyncpg
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.metrics import query_timer
+from app.core.query_log import slow_query_log, traced_connection_class
 
+logger = logging.getLogger(__name__)
 
 # Connection pools (initialized on startup)
 global_kb_pool: asyncpg.Pool = None
 tenant_db_pool: asyncpg.Pool = None
 
+# Pool name -> "connecting" | "connected" | "failed" (+ last error)
+pool_states: Dict[str, Dict[str, Optional[str]]] = {}
+
+# Background connect attempts in degraded mode
+_connect_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _pool_specs() -> Dict[str, Dict]:
+    """Pool name -> DSN and sizes (min_size 0 without warm-up: connect on first use)"""
+    warmup = settings.db_pool_warmup
+    return {
+        "global_kb": {
+            "dsn": settings.database_global_url,
+            "min_size": settings.db_global_pool_min_size if warmup else 0,
+            "max_size": settings.db_global_pool_max_size,
+        },
+        "tenant": {
+            "dsn": settings.database_tenant_url,
+            "min_size": settings.db_tenant_pool_min_size if warmup else 0,
+            "max_size": settings.db_tenant_pool_max_size,
+        },
+    }
+
+
+def _set_pool(name: str, pool: Optional[asyncpg.Pool]) -> None:
+    global global_kb_pool, tenant_db_pool
+
+    if name == "global_kb":
+        global_kb_pool = pool
+    else:
+        tenant_db_pool = pool
+
+
+async def _create_pool(name: str) -> asyncpg.Pool:
+    spec = _pool_specs()[name]
+    pool_states[name] = {"state": "connecting", "error": None}
+
+    try:
+        pool = await asyncpg.create_pool(
+            spec["dsn"],
+            min_size=spec["min_size"],
+            max_size=spec["max_size"],
+            command_timeout=60,
+            timeout=settings.db_connect_timeout_seconds,
+            init=query_timer(name) if settings.metrics_enabled else None,
+            connection_class=traced_connection_class(name) if settings.slow_query_log_enabled else asyncpg.Connection
+        )
+    except Exception as e:
+        pool_states[name] = {"state": "failed", "error": str(e)}
+        raise
+
+    _set_pool(name, pool)
+    pool_states[name] = {"state": "connected", "error": None}
+    return pool
+
+
+async def _connect_in_background(name: str, retry_seconds: float = 5.0, max_retry_seconds: float = 60.0) -> None:
+    """Keep trying to create a pool (degraded mode), with exponential backoff"""
+    delay = retry_seconds
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            await _create_pool(name)
+            logger.info(f"{name} pool connected")
+            return
+        except Exception as e:
+            logger.error(f"{name} pool connect failed, retrying in {delay:.0f}s: {e}")
+            pool_states[name] = {"state": "connecting", "error": str(e)}
+            delay = min(delay * 2, max_retry_seconds)
+
 
 async def init_db_pools():
     """
     Initialize both database connection pools
     Called on application startup
+
+    Both pools are created concurrently. With settings.db_pool_warmup off
+    no connections are opened up front (min_size 0). With
+    settings.db_startup_degraded a pool that can't be created doesn't fail
+    startup: it is retried in the background and readiness reports it as
+    not ready until it connects.
     """
-    global global_kb_pool, tenant_db_pool
+    names = list(_pool_specs())
+    results = await asyncio.gather(*(_create_pool(name) for name in names), return_exceptions=True)
 
-    # Global-KB pool
-    global_kb_pool = await asyncpg.create_pool(
-        settings.database_global_url,
-        min_size=2,
-        max_size=10,
-        command_timeout=60
-    )
+    failures = {name: result for name, result in zip(names, results) if isinstance(result, BaseException)}
 
-    # Tenant-DB pool
-    tenant_db_pool = await asyncpg.create_pool(
-        settings.database_tenant_url,
-        min_size=5,
-        max_size=20,
-        command_timeout=60
-    )
+    if failures and not settings.db_startup_degraded:
+        # Don't leak the pool that did come up
+        for name in names:
+            if name not in failures:
+                pool = global_kb_pool if name == "global_kb" else tenant_db_pool
+                await pool.close()
+                _set_pool(name, None)
+        raise next(iter(failures.values()))
 
-    print("[OK] Database pools initialized")
+    for name, error in failures.items():
+        logger.warning(f"{name} pool unavailable, starting degraded: {error}")
+        pool_states[name] = {"state": "connecting", "error": str(error)}
+        _connect_tasks[name] = asyncio.create_task(_connect_in_background(name))
+
+    if failures:
+        logger.warning("Database pools initialized (degraded)")
+    else:
+        logger.info("Database pools initialized")
 
 
 async def close_db_pools():
@@ -48,13 +133,18 @@ async def close_db_pools():
     """
     global global_kb_pool, tenant_db_pool
 
+    for task in _connect_tasks.values():
+        task.cancel()
+    _connect_tasks.clear()
+    slow_query_log.cancel_pending()
+
     if global_kb_pool:
         await global_kb_pool.close()
-        print("[OK] Global-KB pool closed")
+        logger.info("Global-KB pool closed")
 
     if tenant_db_pool:
         await tenant_db_pool.close()
-        print("[OK] Tenant-DB pool closed")
+        logger.info("Tenant-DB pool closed")
 
 
 @asynccontextmanager
@@ -95,22 +185,28 @@ async def get_tenant_db_conn(org_id: str) -> AsyncGenerator[asyncpg.Connection,
 
 async def check_global_kb_health() -> bool:
     """Check Global-KB connection health"""
+    if global_kb_pool is None:
+        return False
+
     try:
         async with get_global_kb_conn() as conn:
             await conn.fetchval("SELECT 1")
         return True
     except Exception as e:
-        print(f"[ERROR] Global-KB health check failed: {e}")
+        logger.error(f"Global-KB health check failed: {e}")
         return False
 
 
 async def check_tenant_db_health() -> bool:
     """Check Tenant-DB connection health"""
+    if tenant_db_pool is None:
+        return False
+
     try:
         # Use test org ID for health check (no RLS context needed)
         async with tenant_db_pool.acquire() as conn:
             await conn.fetchval("SELECT 1")
         return True
     except Exception as e:
-        print(f"[ERROR] Tenant-DB health check failed: {e}")
+        logger.error(f"Tenant-DB health check failed: {e}")
         return False
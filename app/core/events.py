@@ -0,0 +1,75 @@
+"""
+In-process event fan-out for live feeds
+
+Usage:
+    broadcaster = Broadcaster()
+
+    # producer
+    broadcaster.publish({"organization_id": "...", "event_type": "email_sent"})
+
+    # consumer
+    async with broadcaster.subscribe(organization_id=org_id) as queue:
+        event = await queue.get()
+
+publish() never blocks: every subscriber has a bounded queue and a slow
+subscriber loses its oldest events instead of holding up the others.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+
+class Broadcaster:
+    """Fan out events to subscribers, optionally filtered by organization"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Set[Tuple[Optional[str], asyncio.Queue]] = set()
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """
+        Deliver an event to all matching subscribers.
+
+        Args:
+            event: Event dict; subscribers with an organization filter only get
+                events whose "organization_id" matches
+
+        Returns:
+            Number of subscribers the event was delivered to
+        """
+        organization_id = event.get("organization_id")
+        organization_id = str(organization_id) if organization_id else None
+        delivered = 0
+
+        for org_filter, queue in self._subscribers:
+            if org_filter and org_filter != organization_id:
+                continue
+
+            if queue.full():
+                # Drop the oldest event for this slow subscriber
+                queue.get_nowait()
+            queue.put_nowait(event)
+            delivered += 1
+
+        return delivered
+
+    @asynccontextmanager
+    async def subscribe(self, organization_id: Optional[UUID] = None) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe for the duration of the context.
+
+        Args:
+            organization_id: Only receive events of this organization (None = all)
+        """
+        subscriber = (str(organization_id) if organization_id else None, asyncio.Queue(self.queue_size))
+        self._subscribers.add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
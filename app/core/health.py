@@ -0,0 +1,136 @@
+"""
+Background database health monitor
+
+Usage:
+    task = asyncio.create_task(health_monitor.run())
+    snapshot = health_monitor.snapshot()   # served by /health, no I/O
+
+Every interval each pool runs one SELECT 1 (bounded by a timeout, so a
+saturated pool shows up as a failed check instead of hanging) and the
+result, its latency and the pool's occupancy are kept in memory. Probe
+endpoints read the last results instead of touching the pools.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.core import db
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+POOLS: Dict[str, Callable[[], Any]] = {
+    "global_kb": lambda: db.global_kb_pool,
+    "tenant": lambda: db.tenant_db_pool,
+}
+
+
+def pool_usage(pool) -> Optional[Dict[str, Any]]:
+    """Occupancy of an asyncpg pool (None if it doesn't exist yet)"""
+    if pool is None:
+        return None
+
+    size = pool.get_size()
+    idle = pool.get_idle_size()
+    max_size = pool.get_max_size()
+    in_use = size - idle
+    return {
+        "size": size,
+        "idle": idle,
+        "in_use": in_use,
+        "max_size": max_size,
+        "saturation": round(in_use / max_size, 2) if max_size else 0.0
+    }
+
+
+class HealthMonitor:
+    """Periodic pool checks with results kept in memory"""
+
+    def __init__(self, interval: float, timeout: float, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            interval: Seconds between checks
+            timeout: Seconds a check may take (acquire + query)
+            clock: Time source (epoch seconds)
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.clock = clock
+        self._results: Dict[str, Dict[str, Any]] = {}
+
+    async def check(self, name: str) -> Dict[str, Any]:
+        """Check one pool now and store the result"""
+        pool = POOLS[name]()
+        previous = self._results.get(name, {})
+        started = time.perf_counter()
+        error = None
+
+        if pool is None:
+            error = db.pool_states.get(name, {}).get("error") or "pool not initialized"
+        else:
+            try:
+                async with pool.acquire(timeout=self.timeout) as conn:
+                    await conn.fetchval("SELECT 1", timeout=self.timeout)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+        result = {
+            "ok": error is None,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2) if pool is not None else None,
+            "checked_at": self.clock(),
+            "error": error,
+            "consecutive_failures": 0 if error is None else previous.get("consecutive_failures", 0) + 1,
+            "pool": pool_usage(pool)
+        }
+
+        if error and previous.get("ok", True):
+            logger.error(f"Health check for {name} database failed: {error}")
+        elif not error and previous.get("ok") is False:
+            logger.info(f"{name} database healthy again")
+
+        self._results[name] = result
+        return result
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(name) for name in POOLS))
+
+    async def run(self) -> None:
+        """Background task: check all pools every interval, forever"""
+        while True:
+            try:
+                await self.check_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Health monitor failed: {e}")
+
+            await asyncio.sleep(self.interval)
+
+    def is_fresh(self, result: Dict[str, Any]) -> bool:
+        """Results older than a few intervals mean the monitor is stuck"""
+        return self.clock() - result["checked_at"] <= self.interval * 3 + self.timeout
+
+    def ready(self) -> bool:
+        """All pools passed their last check, and it is recent"""
+        return all(
+            name in self._results and self._results[name]["ok"] and self.is_fresh(self._results[name])
+            for name in POOLS
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Last result per pool, with the pool occupancy as of now"""
+        snapshot = {}
+        for name in POOLS:
+            result = dict(self._results.get(name) or {"ok": False, "checked_at": None, "error": "not checked yet"})
+            result["pool"] = pool_usage(POOLS[name]())
+            result["stale"] = result["checked_at"] is not None and not self.is_fresh(result)
+            snapshot[name] = result
+        return snapshot
+
+
+health_monitor = HealthMonitor(
+    interval=settings.health_check_interval_seconds,
+    timeout=settings.health_check_timeout_seconds
+)
@@ -0,0 +1,302 @@
+"""
+Request and database metrics (Prometheus text format)
+
+Usage:
+    app.add_middleware(MetricsMiddleware)                # per-route HTTP metrics
+    asyncpg.create_pool(..., init=query_timer("tenant"))  # per-query DB timings
+    render()                                             # served by /metrics
+
+Metrics live in process memory, so with several workers each one exposes
+its own numbers (Prometheus sums them per job). Routes are labelled with
+their path template (/api/admin/users/{user_id}), never the raw path, and
+requests that match no route share one label, so the number of series
+stays bounded.
+"""
+
+import bisect
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Probes and scrapes, left out of the dashboard's API call numbers
+INTERNAL_ROUTES = frozenset({"/metrics", "/health", "/health/ready", "/health/live"})
+
+# Leading SQL keyword -> operation label
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "CALL"})
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def items(self) -> Iterable[Tuple[LabelValues, float]]:
+        return self._values.items()
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down per label values"""
+
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: LabelValues, value: float) -> None:
+        self._values[labels] = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label values (sum and count included)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, labels: LabelValues) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def total(self, labels: LabelValues) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def items(self) -> Iterable[Tuple[LabelValues, int, float]]:
+        """(labels, count, sum) per series"""
+        return [(labels, sum(series[0]), series[1]) for labels, series in self._series.items()]
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered set of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code",
+    ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the response is fully sent)",
+    ("method", "route"), HTTP_BUCKETS
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+    ("method",)
+))
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds", "Database query latency by pool and statement type",
+    ("pool", "operation"), DB_BUCKETS
+))
+db_query_errors_total = registry.register(Counter(
+    "db_query_errors_total", "Database queries that raised, by pool and statement type",
+    ("pool", "operation")
+))
+
+
+def render() -> str:
+    return registry.render()
+
+
+def route_label(scope: Dict) -> str:
+    """Path template of the route that handled the request"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and in-flight requests.
+
+    The router stores the matched route in the (shared) scope, so its path
+    template is known once the inner app returns. Streaming responses are
+    timed until the last chunk is sent.
+    """
+
+    def __init__(self, app, clock: Callable[[], float] = time.perf_counter):
+        self.app = app
+        self.clock = clock
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = self.clock()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc((method,))
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec((method,))
+            route = route_label(scope)
+            http_requests_total.inc((method, route, str(status_code)))
+            http_request_duration_seconds.observe((method, route), self.clock() - started)
+
+
+def sql_operation(query: str) -> str:
+    """Statement type label of a query (SELECT, INSERT, ... or OTHER)"""
+    words = query.lstrip(" \t\r\n(").split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in SQL_OPERATIONS else "OTHER"
+
+
+def record_query(pool: str, record) -> None:
+    """asyncpg query logger callback body (record is an asyncpg LoggedQuery)"""
+    operation = sql_operation(record.query)
+    db_query_duration_seconds.observe((pool, operation), record.elapsed)
+    if record.exception is not None:
+        db_query_errors_total.inc((pool, operation))
+
+
+def query_timer(pool: str) -> Callable:
+    """
+    asyncpg pool init callback that times every query of a connection.
+
+    asyncpg measures each query itself and hands the record to its query
+    loggers; ours only updates the histogram.
+    """
+    def log_query(record) -> None:
+        record_query(pool, record)
+
+    async def init(conn) -> None:
+        conn.add_query_logger(log_query)
+
+    return init
+
+
+def api_call_summary(error_rate_threshold: float = 0.05) -> Dict:
+    """
+    Totals for the admin dashboard since this worker started.
+
+    Probe and scrape routes (INTERNAL_ROUTES) are left out.
+
+    Returns:
+        Dict with total, errors, avg_response_time (ms) and status
+        ("healthy" or "degraded" when 5xx responses exceed the threshold)
+    """
+    total = 0
+    errors = 0
+    for (_, route, status), count in http_requests_total.items():
+        if route in INTERNAL_ROUTES:
+            continue
+        total += count
+        if status.startswith("5"):
+            errors += count
+
+    count = 0
+    duration = 0.0
+    for (_, route), series_count, series_sum in http_request_duration_seconds.items():
+        if route in INTERNAL_ROUTES:
+            continue
+        count += series_count
+        duration += series_sum
+
+    return {
+        "total": int(total),
+        "errors": int(errors),
+        "status": "degraded" if total and errors / total > error_rate_threshold else "healthy",
+        "avg_response_time": round(duration / count * 1000, 2) if count else 0
+    }
+
+
+def reset(metrics: Optional[Iterable] = None) -> None:
+    """Clear recorded values (tests)"""
+    for metric in metrics or registry._metrics.values():
+        if isinstance(metric, Histogram):
+            metric._series.clear()
+        else:
+            metric._values.clear()
@@ -0,0 +1,119 @@
+"""
+Keyset (cursor) pagination helpers
+
+Cursors are opaque, URL-safe tokens encoding the sort key of the last row
+of a page, e.g. (created_at, id). Queries continue with
+`WHERE (created_at, id) < ($n, $m)` so the cost of a page does not grow
+with its depth like OFFSET does.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple, Union
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """
+    Encode a (created_at, id) sort key into an opaque cursor
+
+    Args:
+        created_at: Timestamp of the last row on the page
+        row_id: UUID of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor created by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        (created_at, id) tuple
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_sort_cursor(sort: str, sort_value: Union[datetime, int], row_id: UUID) -> str:
+    """
+    Encode a (sort_value, id) key for a listing with a selectable sort
+
+    The sort name is part of the cursor so a cursor from one ordering
+    can't be replayed against another.
+
+    Args:
+        sort: Name of the sort the page was produced with
+        sort_value: Sort column of the last row (timestamp or integer)
+        row_id: UUID of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    value: Any = sort_value.isoformat() if isinstance(sort_value, datetime) else int(sort_value)
+    raw = json.dumps([sort, value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sort_cursor(cursor: str, sort: str) -> Tuple[Union[datetime, int], UUID]:
+    """
+    Decode a cursor created by encode_sort_cursor
+
+    Args:
+        cursor: Cursor string from a previous page
+        sort: Sort of the current request
+
+    Returns:
+        (sort_value, id) tuple; timestamps are returned as datetime
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        row_id = UUID(row_id)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, int):
+            raise TypeError(value)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was created for sort '{cursor_sort}', not '{sort}'")
+
+    return value, row_id
+
+
+def next_cursor_for(rows: list, limit: int) -> Optional[str]:
+    """
+    Build the cursor for the page following `rows`
+
+    Args:
+        rows: Rows of the current page (dicts with created_at and id)
+        limit: Page size that was requested
+
+    Returns:
+        Cursor string, or None if this was the last page
+    """
+    if len(rows) < limit:
+        return None
+
+    last = rows[-1]
+    return encode_cursor(last["created_at"], last["id"])
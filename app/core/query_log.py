@@ -0,0 +1,267 @@
+"""
+Slow query log with sampled EXPLAIN capture (opt-in)
+
+Usage:
+    asyncpg.create_pool(..., connection_class=traced_connection_class("tenant"))
+
+Every query run through a traced connection is tagged with the service
+method that issued it (the first app.services frame on the stack, e.g.
+"dashboard_service.get_dashboard_stats"). Queries slower than the
+threshold are logged with the shapes of their bound parameters (types and
+lengths, never values). A sample of slow read queries is re-run as
+EXPLAIN (ANALYZE, BUFFERS) on another pooled connection, inside a
+transaction that is rolled back, and the plan is appended to a JSON lines
+file for later review.
+
+Plans are captured without the caller's session settings (such as
+app.current_org_id), so row-level security filters may differ from the
+original run.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Type
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.metrics import sql_operation
+
+logger = logging.getLogger(__name__)
+
+SERVICE_PACKAGE = "app.services."
+
+# Captured plans may take this long before they are abandoned
+EXPLAIN_TIMEOUT_SECONDS = 10.0
+
+# At most one plan per caller within this window
+EXPLAIN_MIN_INTERVAL_SECONDS = 300.0
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+MAX_LOGGED_QUERY_CHARS = 500
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def service_caller(depth: int = 2, max_frames: int = 16) -> str:
+    """
+    Tag of the code that issued a query.
+
+    The first app.services frame wins ("module.function"); failing that the
+    first app frame outside app.core, else "unknown".
+    """
+    frame = sys._getframe(depth)
+    fallback = None
+
+    for _ in range(max_frames):
+        if frame is None:
+            break
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(SERVICE_PACKAGE):
+            return f"{module[len(SERVICE_PACKAGE):]}.{frame.f_code.co_name}"
+        if fallback is None and module.startswith("app.") and not module.startswith("app.core."):
+            fallback = f"{module[len('app.'):]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+
+    return fallback or "unknown"
+
+
+def _shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple)):
+        inner = sorted({_shape(item).split("(")[0] for item in value})
+        return f"list[{'|'.join(inner)}]({len(value)})"
+    if isinstance(value, dict):
+        return f"dict({len(value)})"
+    return type(value).__name__
+
+
+def param_shapes(args: Sequence[Any]) -> List[str]:
+    """Types and lengths of bound parameters ($1, $2, ...), without their values"""
+    return [_shape(arg) for arg in args]
+
+
+def compact_query(query: str) -> str:
+    query = _WHITESPACE.sub(" ", query).strip()
+    if len(query) > MAX_LOGGED_QUERY_CHARS:
+        return query[:MAX_LOGGED_QUERY_CHARS] + "..."
+    return query
+
+
+class SlowQueryLog:
+    """Threshold logging and sampled plan capture for traced connections"""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_sample_rate: float,
+        explain_path: str,
+        clock: Callable[[], float] = time.monotonic,
+        sample: Callable[[], float] = random.random
+    ):
+        """
+        Args:
+            threshold_ms: Queries at least this slow are logged
+            explain_sample_rate: Share of slow read queries to EXPLAIN (0 = never)
+            explain_path: JSON lines file the plans are appended to
+            clock: Time source for the per-caller explain interval
+            sample: Random source in [0, 1)
+        """
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_path = explain_path
+        self.clock = clock
+        self.sample = sample
+        self._last_explain: Dict[str, float] = {}
+        self._explaining = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    def observe(
+        self,
+        pool: str,
+        caller: str,
+        query: str,
+        args: Sequence[Any],
+        elapsed: float,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Called after every traced query (elapsed in seconds)"""
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < self.threshold_ms or query.startswith(EXPLAIN_PREFIX):
+            return
+
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f}ms) in {caller} on {pool}: {compact_query(query)} "
+            f"params={param_shapes(args)}" + (f" error={type(error).__name__}" if error else "")
+        )
+
+        if self._should_explain(caller, query):
+            task = asyncio.create_task(self.explain(pool, caller, query, args, elapsed_ms))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _should_explain(self, caller: str, query: str) -> bool:
+        # EXPLAIN ANALYZE executes the statement: plain SELECTs only
+        if self._explaining or self.explain_sample_rate <= 0 or sql_operation(query) != "SELECT":
+            return False
+        if self.clock() - self._last_explain.get(caller, float("-inf")) < EXPLAIN_MIN_INTERVAL_SECONDS:
+            return False
+        if self.sample() >= self.explain_sample_rate:
+            return False
+
+        self._last_explain[caller] = self.clock()
+        return True
+
+    async def explain(self, pool_name: str, caller: str, query: str, args: Sequence[Any], elapsed_ms: float) -> None:
+        """Capture the plan of a slow query and append it to explain_path"""
+        from app.core.health import POOLS
+
+        self._explaining = True
+        try:
+            pool = POOLS[pool_name]()
+            if pool is None:
+                return
+
+            async with pool.acquire(timeout=EXPLAIN_TIMEOUT_SECONDS) as conn:
+                transaction = conn.transaction(readonly=True)
+                await transaction.start()
+                try:
+                    await conn.execute(f"SET LOCAL statement_timeout = {int(EXPLAIN_TIMEOUT_SECONDS * 1000)}")
+                    plan = await conn.fetchval(EXPLAIN_PREFIX + query, *args)
+                finally:
+                    await transaction.rollback()
+
+            entry = {
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "pool": pool_name,
+                "caller": caller,
+                "elapsed_ms": round(elapsed_ms, 1),
+                "query": query,
+                "param_shapes": param_shapes(args),
+                "plan": json.loads(plan) if isinstance(plan, str) else plan
+            }
+            await asyncio.to_thread(self._append, json.dumps(entry, default=str))
+            logger.info(f"Captured plan of slow query in {caller} to {self.explain_path}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to capture plan of slow query in {caller}: {e}")
+
+        finally:
+            self._explaining = False
+
+    def _append(self, line: str) -> None:
+        directory = os.path.dirname(self.explain_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.explain_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def cancel_pending(self) -> None:
+        """Cancel plan captures in progress (shutdown)"""
+        for task in list(self._tasks):
+            task.cancel()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    explain_sample_rate=settings.slow_query_explain_sample_rate,
+    explain_path=settings.slow_query_explain_path
+)
+
+
+class TracedConnection(asyncpg.Connection):
+    """asyncpg connection whose queries are timed and reported to slow_query_log"""
+
+    pool_name = "db"
+
+    async def _traced(self, call, query: str, args: Sequence[Any], **kwargs):
+        caller = service_caller(depth=3)
+        started = time.perf_counter()
+        error = None
+        try:
+            return await call(query, *args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            slow_query_log.observe(self.pool_name, caller, query, args, time.perf_counter() - started, error)
+
+    async def execute(self, query, *args, **kwargs):
+        return await self._traced(super().execute, query, args, **kwargs)
+
+    async def fetch(self, query, *args, **kwargs):
+        return await self._traced(super().fetch, query, args, **kwargs)
+
+    async def fetchval(self, query, *args, **kwargs):
+        return await self._traced(super().fetchval, query, args, **kwargs)
+
+    async def fetchrow(self, query, *args, **kwargs):
+        return await self._traced(super().fetchrow, query, args, **kwargs)
+
+    async def executemany(self, command, args, **kwargs):
+        # One timing for the whole batch; shapes of its first row
+        caller = service_caller()
+        started = time.perf_counter()
+        try:
+            return await super().executemany(command, args, **kwargs)
+        finally:
+            first = next(iter(args), ()) if isinstance(args, (list, tuple)) else ()
+            slow_query_log.observe(self.pool_name, caller, command, first, time.perf_counter() - started)
+
+
+def traced_connection_class(pool_name: str) -> Type[TracedConnection]:
+    """Connection class for one pool (the pool name appears in the log)"""
+    return type(f"TracedConnection[{pool_name}]", (TracedConnection,), {"pool_name": pool_name})
@@ -0,0 +1,253 @@
+"""
+Response cache for read-heavy GET endpoints
+
+Usage:
+    @router.get("/webhooks/stats")
+    @cached_response(tags=["webhooks"])
+    async def get_webhook_stats():
+        ...
+
+    # after writes that change what the endpoint returns
+    await invalidate_tags("webhooks")
+
+Responses are keyed on method, path, query string and tenant (the caller's
+Authorization header, hashed), plus the current version of every tag the
+endpoint depends on. invalidate_tags() bumps tag versions, so stale entries
+are simply never looked up again and expire on their own.
+
+Every cached response carries an ETag; a request whose If-None-Match
+matches gets an empty 304.
+
+The backend is an in-process LRU by default. With RESPONSE_CACHE_REDIS_URL
+set (and the optional redis package installed) entries and tag versions live
+in Redis (or any Redis-compatible server), so invalidation reaches all
+workers.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "sb:response:"
+TAG_PREFIX = "sb:tag:"
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._tags: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_tag_versions(self, tags: List[str]) -> List[int]:
+        return [self._tags.get(tag, 0) for tag in tags]
+
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+
+class RedisBackend:
+    """Redis-compatible backend (requires the optional redis package)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(KEY_PREFIX + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._redis.set(KEY_PREFIX + key, value, ex=ttl)
+
+    async def get_tag_versions(self, tags: List[str]) -> List[int]:
+        if not tags:
+            return []
+        values = await self._redis.mget([TAG_PREFIX + tag for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(TAG_PREFIX + tag)
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=KEY_PREFIX + "*"):
+            await self._redis.delete(key)
+
+
+_backend = None
+
+
+def get_backend():
+    """Backend selected by settings (created on first use)"""
+    global _backend
+
+    if _backend is None:
+        if settings.response_cache_redis_url:
+            try:
+                _backend = RedisBackend(settings.response_cache_redis_url)
+            except ImportError:
+                logger.warning("RESPONSE_CACHE_REDIS_URL is set but redis is not installed, using in-process cache")
+
+        if _backend is None:
+            _backend = MemoryBackend(settings.response_cache_max_entries)
+
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Replace the backend (tests, custom setups)"""
+    global _backend
+    _backend = backend
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """
+    Invalidate all cached responses that depend on any of the tags.
+
+    Never raises: a cache outage must not fail the write that triggered it.
+    """
+    try:
+        await get_backend().bump_tags(tags)
+    except Exception as e:
+        logger.error(f"Failed to invalidate response cache tags {tags}: {e}")
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag in candidates
+
+
+def cache_key(request: Request, tag_versions: List[int]) -> str:
+    """Key for a request: method, path, sorted query, tenant and tag versions"""
+    query = sorted(request.query_params.multi_items())
+    authorization = request.headers.get("authorization", "")
+    tenant = hashlib.blake2b(authorization.encode("utf-8"), digest_size=8).hexdigest() if authorization else "anonymous"
+
+    raw = json.dumps([request.method, request.url.path, query, tenant, tag_versions], separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def _json_response(body: bytes, etag: str, status_code: int = status.HTTP_200_OK) -> Response:
+    return Response(
+        content=body if status_code != status.HTTP_304_NOT_MODIFIED else None,
+        status_code=status_code,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
+
+def cached_response(tags: Iterable[str] = (), ttl: Optional[int] = None) -> Callable:
+    """
+    Cache the JSON response of a GET endpoint.
+
+    Put it below the router decorator. Only successful responses are cached;
+    HTTPExceptions pass through.
+
+    Args:
+        tags: Data the response depends on (see invalidate_tags)
+        ttl: Seconds to keep a response (default: settings.response_cache_ttl_seconds)
+    """
+    tags = list(tags)
+
+    def decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (name for name, param in signature.parameters.items() if param.annotation is Request),
+            None
+        )
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs) -> Any:
+            request: Request = kwargs[request_param] if request_param else kwargs.pop("_cache_request")
+            backend = get_backend()
+
+            try:
+                key = cache_key(request, await backend.get_tag_versions(tags))
+                cached = await backend.get(key)
+            except Exception as e:
+                logger.error(f"Response cache lookup failed: {e}")
+                key, cached = None, None
+
+            if cached is not None:
+                etag = compute_etag(cached)
+                if etag_matches(request.headers.get("if-none-match"), etag):
+                    return _json_response(b"", etag, status.HTTP_304_NOT_MODIFIED)
+                return _json_response(cached, etag)
+
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+
+            body = json.dumps(jsonable_encoder(result), separators=(",", ":")).encode("utf-8")
+            etag = compute_etag(body)
+
+            if key is not None:
+                try:
+                    await backend.set(key, body, ttl or settings.response_cache_ttl_seconds)
+                except Exception as e:
+                    logger.error(f"Response cache store failed: {e}")
+
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return _json_response(b"", etag, status.HTTP_304_NOT_MODIFIED)
+            return _json_response(body, etag)
+
+        if not request_param:
+            # Let FastAPI inject the request without changing the endpoint's signature
+            wrapper.__signature__ = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ])
+
+        return wrapper
+
+    return decorator
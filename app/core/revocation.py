@@ -0,0 +1,81 @@
+"""
+In-memory token revocation list
+
+Usage:
+    revoked_tokens.add(jti_key(jti), exp)
+    if revoked_tokens.is_revoked(jti_key(jti), sid_key(sid)):
+        ...
+
+Entries are kept only until the revoked token would have expired anyway,
+so the list stays as small as the number of tokens revoked within one
+access token lifetime. It is filled and kept in sync across workers by
+app/services/token_service.py.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+def jti_key(jti: str) -> str:
+    """Revocation key of a single access token"""
+    return f"jti:{jti}"
+
+
+def sid_key(sid: str) -> str:
+    """Revocation key of a session (all access tokens of a refresh token family)"""
+    return f"sid:{sid}"
+
+
+class RevocationList:
+    """Set of revoked token keys, each dropped after its expiry"""
+
+    def __init__(self, clock: Callable[[], float] = time.time, prune_every: int = 1000):
+        self.clock = clock
+        self.prune_every = prune_every
+        self._entries: Dict[str, float] = {}
+        self._adds = 0
+
+    def add(self, key: str, expires_at: float) -> None:
+        """Revoke key until expires_at (epoch seconds)"""
+        if expires_at <= self.clock():
+            return
+
+        self._entries[key] = max(expires_at, self._entries.get(key, 0))
+        self._adds += 1
+        if self._adds % self.prune_every == 0:
+            self.prune()
+
+    def is_revoked(self, *keys: Optional[str]) -> bool:
+        """Whether any of the keys (None is ignored) is revoked"""
+        if not self._entries:
+            return False
+
+        now = self.clock()
+        return any(key is not None and self._entries.get(key, 0) > now for key in keys)
+
+    def merge(self, entries: Iterable[Tuple[str, float]]) -> None:
+        """
+        Add entries from a full reload from the database.
+
+        Live entries are kept: revocations added while the reload ran (by
+        notification or locally) are not in its snapshot.
+        """
+        now = self.clock()
+        for key, expires_at in entries:
+            if expires_at > now:
+                self._entries[key] = max(expires_at, self._entries.get(key, 0))
+        self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many were dropped"""
+        now = self.clock()
+        expired = [key for key, expires_at in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+revoked_tokens = RevocationList()
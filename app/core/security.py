@@ -1,27 +1,113 @@
 """
 JWT Authentication and Password Hashing
+
+bcrypt takes ~100-250ms of CPU per hash. Async code must use
+hash_password_async / verify_password_async, which run it on a bounded
+thread pool (bcrypt releases the GIL) instead of blocking the event loop.
+
+Tokens are decoded with python-jose, or with PyJWT (optional, faster) when
+JWT_BACKEND is "pyjwt", or "auto" and PyJWT is installed.
 """
 
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Callable, Optional, TypeVar
 
 from app.core.config import settings
 
+# python-jose and passlib are imported on first use (they are slow to
+# import and most code paths, e.g. webhooks, never need them)
+_pwd_context = None
+
+
+def get_pwd_context():
+    """Password hashing context (created on first use)"""
+    global _pwd_context
+
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+    return _pwd_context
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hash operations are queued"""
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded thread pool"""
+
+    def __init__(self, workers: int, max_waiting: int):
+        """
+        Args:
+            workers: Hashes computed in parallel
+            max_waiting: Hashes allowed to queue for a worker before
+                PasswordHasherBusy is raised
+        """
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run func(*args) on the pool.
+
+        Raises:
+            PasswordHasherBusy: If workers + max_waiting operations are already pending
+        """
+        if self._pending >= self.workers + self.max_waiting:
+            raise PasswordHasherBusy("Too many concurrent password operations")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_waiting=settings.password_hash_max_waiting
+)
 
 
 def hash_password(password: str) -> str:
-    """Hash a plain password"""
-    return pwd_context.hash(password)
+    """Hash a plain password (blocking)"""
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a plain password against hashed password (blocking)"""
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a plain password on the password hash pool"""
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hash pool"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -29,13 +115,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Create JWT access token
 
     Args:
-        data: Payload to encode (should include user_id, organization_id, role)
+        data: Payload to encode (should include user_id, organization_id, role;
+            sid = refresh token family the token was issued for)
         expires_delta: Token expiration time (default: from settings)
 
     Returns:
-        Encoded JWT token string
+        Encoded JWT token string (with a unique jti for revocation)
     """
     to_encode = data.copy()
+    to_encode.setdefault("jti", uuid.uuid4().hex)
 
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -46,7 +134,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
     to_encode.update({"exp": expire})
 
-    encoded_jwt = jwt.encode(
+    encoded_jwt = _jwt_backend().encode(
         to_encode,
         settings.jwt_secret_key,
         algorithm=settings.jwt_algorithm
@@ -65,12 +153,58 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded payload or None if invalid
     """
+    backend = _jwt_backend()
     try:
-        payload = jwt.decode(
+        payload = backend.decode(
             token,
             settings.jwt_secret_key,
             algorithms=[settings.jwt_algorithm]
         )
         return payload
-    except JWTError:
+    except backend.error:
         return None
+
+
+class _JoseBackend:
+    name = "jose"
+
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self.error = JWTError
+        self.encode = jwt.encode
+        self.decode = jwt.decode
+
+
+class _PyJWTBackend:
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt as pyjwt
+
+        self.error = pyjwt.PyJWTError
+        self.encode = pyjwt.encode
+        self.decode = pyjwt.decode
+
+
+_backend = None
+
+
+def _jwt_backend():
+    """JWT implementation selected by settings.jwt_backend (resolved once)"""
+    global _backend
+
+    if _backend is None:
+        if settings.jwt_backend not in ("auto", "jose", "pyjwt"):
+            raise ValueError(f"Invalid JWT_BACKEND: {settings.jwt_backend}. Must be auto, jose or pyjwt")
+
+        if settings.jwt_backend != "jose":
+            try:
+                _backend = _PyJWTBackend()
+            except ImportError:
+                if settings.jwt_backend == "pyjwt":
+                    raise
+        if _backend is None:
+            _backend = _JoseBackend()
+
+    return _backend
@@ -0,0 +1,106 @@
+"""
+Helpers for streaming query results to HTTP clients
+"""
+
+import csv
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from typing import Any, AsyncIterator, Dict, List
+from uuid import UUID
+
+# Encoders buffer output up to this many characters per yielded chunk
+CHUNK_SIZE = 64 * 1024
+
+
+def json_default(value: Any) -> Any:
+    """
+    JSON encoder fallback for asyncpg result types
+
+    Usage:
+        json.dumps(dict(row), default=json_default)
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_ndjson_line(record: Dict[str, Any]) -> str:
+    """Serialize one record as a newline-delimited JSON line"""
+    return json.dumps(record, default=json_default, separators=(",", ":")) + "\n"
+
+
+async def iter_ndjson(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Encode records as NDJSON, yielding chunks of about CHUNK_SIZE"""
+    buffer = []
+    size = 0
+    async for record in records:
+        line = to_ndjson_line(record)
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+async def iter_json_array(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Encode records as one JSON array, yielding chunks of about CHUNK_SIZE"""
+    buffer = ["["]
+    size = 1
+    first = True
+    async for record in records:
+        item = ("" if first else ",") + json.dumps(record, default=json_default)
+        first = False
+        buffer.append(item)
+        size += len(item)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    buffer.append("]")
+    yield "".join(buffer)
+
+
+async def iter_csv(
+    records: AsyncIterator[Dict[str, Any]],
+    fieldnames: List[str]
+) -> AsyncIterator[str]:
+    """
+    Encode records as CSV with a header row, yielding chunks of about CHUNK_SIZE
+
+    Keys not in fieldnames are ignored.
+    """
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+
+    async for record in records:
+        writer.writerow(record)
+        if output.tell() >= CHUNK_SIZE:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+    if output.tell():
+        yield output.getvalue()
+
+
+async def gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip-compress a stream of text chunks (UTF-8) on the fly"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
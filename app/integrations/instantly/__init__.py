@@ -1,22 +1,34 @@
 """
 Instantly.ai Integration
 API Client, Webhooks, and Data Synchronization
+
+Exports are loaded on first access, so importing a submodule (e.g. the
+schemas used by services) doesn't pull in the HTTP client stack
+(httpx, tenacity).
 """
 
-from .client import InstantlyClient
-from .schemas import (
-    InstantlyEventType,
-    InstantlyWebhookPayload,
-    InstantlyCampaign,
-    InstantlyEmailAccount,
-    InstantlyWorkspace
-)
-
-__all__ = [
-    "InstantlyClient",
-    "InstantlyEventType",
-    "InstantlyWebhookPayload",
-    "InstantlyCampaign",
-    "InstantlyEmailAccount",
-    "InstantlyWorkspace",
-]
+import importlib
+
+_EXPORTS = {
+    "InstantlyClient": ".client",
+    "InstantlyEventType": ".schemas",
+    "InstantlyWebhookPayload": ".schemas",
+    "InstantlyCampaign": ".schemas",
+    "InstantlyEmailAccount": ".schemas",
+    "InstantlyWorkspace": ".schemas",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,13 +3,26 @@ Salesbrain Backend API - Main Application
 Multi-Tenant B2B Sales Orchestrator
 """
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.db import init_db_pools, close_db_pools
+from app.core.health import health_monitor
+from app.core.metrics import MetricsMiddleware
+from app.core.security import password_hasher
+from app.services import (
+    partition_service,
+    activity_feed_service,
+    followup_service,
+    onboarding_link_service,
+    token_service,
+)
 from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
 from app.api.auth import router as auth_router
 from app.api.instantly import router as instantly_router
 from app.api.admin import router as admin_router
@@ -17,15 +30,38 @@ from app.api.user_assignments import router as user_assignments_router
 from app.api.onboarding_links import router as onboarding_links_router
 from app.integrations.instantly.webhooks import router as instantly_webhooks_router
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     await init_db_pools()
+    health_task = asyncio.create_task(health_monitor.run())
+    partition_task = asyncio.create_task(partition_service.run_partition_maintenance())
+    activity_task = asyncio.create_task(activity_feed_service.run_activity_listener())
+    followup_task = asyncio.create_task(followup_service.run_followup_scheduler())
+    access_flush_task = asyncio.create_task(onboarding_link_service.run_access_flusher())
+    link_invalidation_task = asyncio.create_task(onboarding_link_service.run_link_invalidation_listener())
+    revocation_task = asyncio.create_task(token_service.run_revocation_listener())
     yield
     # Shutdown
+    health_task.cancel()
+    partition_task.cancel()
+    activity_task.cancel()
+    followup_task.cancel()
+    access_flush_task.cancel()
+    link_invalidation_task.cancel()
+    revocation_task.cancel()
+    # A flush in progress finishes before the final one
+    await asyncio.gather(access_flush_task, return_exceptions=True)
+    try:
+        await onboarding_link_service.flush_link_access()
+    except Exception as e:
+        logger.error(f"Failed to flush onboarding link accesses on shutdown: {e}")
     await close_db_pools()
+    password_hasher.shutdown()
 
 
 # Create FastAPI application
@@ -45,8 +81,14 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+# Request metrics (outermost, so CORS preflights are counted too)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(health_router, tags=["Health"])
+if settings.metrics_enabled:
+    app.include_router(metrics_router, tags=["Metrics"])
 # app.include_router(auth_router)  # Temporarily disabled for testing
 
 # Admin Dashboard routers
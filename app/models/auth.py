@@ -16,6 +16,8 @@ class LoginResponse(BaseModel):
     """Login response with JWT token"""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
     user_id: str
     organization_id: str
     role: str
@@ -30,3 +32,21 @@ class TokenData(BaseModel):
     organization_id: str
     role: str
     email: str
+
+
+class RefreshRequest(BaseModel):
+    """Refresh token payload"""
+    refresh_token: str
+
+
+class TokenResponse(BaseModel):
+    """New access and refresh token pair"""
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class LogoutRequest(BaseModel):
+    """Logout payload (the refresh token's session is revoked)"""
+    refresh_token: Optional[str] = None
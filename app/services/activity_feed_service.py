@@ -0,0 +1,155 @@
+"""
+Activity Feed Service
+
+Live webhook activity for the Admin Dashboard.
+
+The ingest path publishes every new webhook log. With
+settings.activity_feed_notify (default) it is sent with pg_notify on the
+webhook_activity channel, and every worker's listener connection feeds it
+into its local broadcaster, so dashboards connected to any worker see all
+events. Without it, events are only fanned out in-process (single worker).
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.events import Broadcaster
+from app.core.streaming import json_default
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "webhook_activity"
+
+# pg_notify payloads are limited to 8000 bytes
+MAX_NOTIFY_BYTES = 7900
+
+broadcaster = Broadcaster(queue_size=settings.activity_feed_queue_size)
+
+
+def webhook_activity_event(
+    log_id: UUID,
+    event_type: str,
+    event_source: str,
+    status: str,
+    created_at: datetime,
+    organization_id: Optional[UUID] = None,
+    campaign_name: Optional[str] = None,
+    contact_email: Optional[str] = None
+) -> Dict[str, Any]:
+    """Activity feed item for a webhook log (same shape as /dashboard/recent-activity)"""
+    return {
+        "id": str(log_id),
+        "type": "webhook",
+        "event_type": event_type,
+        "event_source": event_source,
+        "description": f"Webhook received: {event_type}",
+        "campaign_name": campaign_name,
+        "contact_email": contact_email,
+        "status": status,
+        "organization_id": str(organization_id) if organization_id else None,
+        "timestamp": created_at.isoformat()
+    }
+
+
+def encode_activity(event: Dict[str, Any]) -> str:
+    """pg_notify payload of an activity event"""
+    return json.dumps(event, default=json_default, separators=(",", ":"))
+
+
+def fits_notify(event: Dict[str, Any]) -> bool:
+    """Whether the event fits in one pg_notify payload"""
+    return len(encode_activity(event).encode("utf-8")) <= MAX_NOTIFY_BYTES
+
+
+async def send_activity(conn: asyncpg.Connection, event: Dict[str, Any]) -> None:
+    """
+    Publish an activity event to all connected dashboards, raising on failure.
+
+    For callers whose transaction must not commit without its events (a
+    failed pg_notify aborts the transaction). Oversized events are sent
+    without campaign_name and contact_email.
+
+    Args:
+        conn: Connection the event's row was written on (used for pg_notify)
+        event: Feed event (e.g. from webhook_activity_event())
+    """
+    if not settings.activity_feed_notify:
+        broadcaster.publish(event)
+        return
+
+    if not fits_notify(event):
+        # Oversized descriptive fields are dropped, the event itself is kept
+        event = {**event, "campaign_name": None, "contact_email": None}
+
+    await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, encode_activity(event))
+
+
+async def publish_activity(conn: asyncpg.Connection, event: Dict[str, Any]) -> None:
+    """
+    Publish an activity event to all connected dashboards.
+
+    Never raises: the feed is best effort and must not fail ingest. Inside
+    a transaction the notify runs in a savepoint, so a failure doesn't
+    abort the caller's transaction.
+
+    Args:
+        conn: Connection the event's row was written on (used for pg_notify)
+        event: Feed event (e.g. from webhook_activity_event())
+    """
+    try:
+        if conn.is_in_transaction():
+            async with conn.transaction():
+                await send_activity(conn, event)
+        else:
+            await send_activity(conn, event)
+
+    except Exception as e:
+        logger.error(f"Failed to publish activity event: {e}")
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    try:
+        broadcaster.publish(json.loads(payload))
+    except ValueError as e:
+        logger.error(f"Invalid activity notification: {e}")
+
+
+async def run_activity_listener(retry_seconds: float = 5.0) -> None:
+    """
+    Background task: LISTEN on the activity channel and feed the broadcaster.
+
+    Uses a dedicated connection (not from the pool) and reconnects after
+    connection loss. Does nothing if settings.activity_feed_notify is off.
+    """
+    if not settings.activity_feed_notify:
+        return
+
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(settings.database_tenant_url)
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _: closed.set())
+            await conn.add_listener(CHANNEL, _on_notification)
+
+            logger.info(f"Listening for activity on channel {CHANNEL}")
+            await closed.wait()
+            logger.warning("Activity listener connection lost, reconnecting")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Activity listener failed: {e}")
+
+        finally:
+            if conn and not conn.is_closed():
+                await conn.close()
+
+        await asyncio.sleep(retry_seconds)
@@ -0,0 +1,68 @@
+"""
+Auth Service
+
+Login lookups by email.
+
+Lookups go through auth_lookup_user() (see
+sql/migration_phase4_auth_lookup.sql): a SECURITY DEFINER function
+matching lower(email) on a unique index. It needs no RLS context, so no
+SET/RESET round trips around the query. Emails that don't exist are
+remembered for settings.auth_negative_cache_ttl_seconds, so
+credential-stuffing bursts of unknown emails are answered without
+touching the database.
+
+Users are created and renamed outside this application, so nothing
+invalidates that cache: a user whose email failed a login shortly before
+it was created (or corrected) can log in once the TTL has passed, on
+each worker. Set AUTH_NEGATIVE_CACHE_TTL_SECONDS=0 to disable it.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.core import db
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_unknown_emails = TTLCache(
+    ttl=settings.auth_negative_cache_ttl_seconds,
+    max_entries=settings.auth_negative_cache_max_entries
+)
+
+
+def normalize_email(email: str) -> str:
+    """Case-insensitive lookup key for an email address"""
+    return email.strip().lower()
+
+
+async def get_login_user(email: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the user record needed for login.
+
+    Args:
+        email: Email address (case-insensitive)
+
+    Returns:
+        Dict with id, organization_id, email, password_hash, role, status,
+        first_name, last_name, or None if there is no such user
+    """
+    key = normalize_email(email)
+    if _unknown_emails.get(key):
+        return None
+
+    user = await _fetch_login_user(key)
+    if user is None:
+        _unknown_emails.set(key, True)
+
+    return user
+
+
+async def _fetch_login_user(email: str) -> Optional[Dict[str, Any]]:
+    async with db.tenant_db_pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT * FROM auth_lookup_user($1)
+            """,
+            email
+        )
+
+    return dict(row) if row else None
@@ -8,7 +8,8 @@ from uuid import UUID
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from app.core.db import tenant_db_pool
+from app.core import db
+from app.core.response_cache import invalidate_tags
 from app.integrations.instantly.schemas import InstantlyCampaign
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,7 @@ class CampaignService:
         updated_count = 0
         skipped_count = 0
 
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             for campaign in campaigns:
                 try:
                     # Check if campaign already exists
@@ -97,6 +98,9 @@ class CampaignService:
                     logger.error(f"Failed to import campaign {campaign.id}: {e}")
                     skipped_count += 1
 
+        if imported_count or updated_count:
+            await invalidate_tags("campaigns")
+
         return {
             "imported": imported_count,
             "updated": updated_count,
@@ -113,7 +117,7 @@ class CampaignService:
         Returns:
             List of campaign dicts with organization info
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Set admin role to bypass RLS
             await conn.execute("SET LOCAL app.user_role = 'sb_admin'")
 
@@ -152,7 +156,7 @@ class CampaignService:
         Returns:
             List of campaign dicts
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Set organization context for RLS
             await conn.execute("SET LOCAL app.current_org_id = $1", str(organization_id))
 
@@ -187,7 +191,7 @@ class CampaignService:
         Returns:
             Campaign dict or None
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT
                     c.id,
@@ -216,14 +220,15 @@ class CampaignService:
         Returns:
             True if updated, False otherwise
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             result = await conn.execute("""
                 UPDATE campaign
                 SET status = $1, updated_at = NOW()
                 WHERE id = $2
             """, status, campaign_id)
 
-            return result == "UPDATE 1"
+        await invalidate_tags("campaigns")
+        return result == "UPDATE 1"
 
     @staticmethod
     async def assign_email_account(campaign_id: UUID, email_account_id: UUID) -> bool:
@@ -237,14 +242,15 @@ class CampaignService:
         Returns:
             True if assigned, False otherwise
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             result = await conn.execute("""
                 UPDATE campaign
                 SET email_account_id = $1, updated_at = NOW()
                 WHERE id = $2
             """, email_account_id, campaign_id)
 
-            return result == "UPDATE 1"
+        await invalidate_tags("campaigns")
+        return result == "UPDATE 1"
 
     @staticmethod
     async def get_campaign_stats(campaign_id: UUID) -> Dict[str, int]:
@@ -257,7 +263,7 @@ class CampaignService:
         Returns:
             Dict with sent, opened, replied counts
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT
                     COUNT(*) FILTER (WHERE event_type = 'email_sent') as sent,
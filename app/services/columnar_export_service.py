@@ -0,0 +1,345 @@
+"""
+Columnar Export Service
+
+Parquet / Arrow IPC exports of message, event_log and webhook_log for
+analytics pulls.
+
+Rows are read through a server-side cursor in chunks; every chunk becomes
+one Parquet row group (or one Arrow record batch) and is written out before
+the next chunk is fetched, so memory is bounded by the chunk size.
+
+pyarrow is an optional dependency: it is imported on first use and the
+rest of the application works without it.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.core import db
+
+# Tables that can be exported (all partitioned by created_at)
+EXPORT_TABLES = ("message", "event_log", "webhook_log")
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+# Media type and file extension per format
+EXPORT_CONTENT_TYPES = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+# Column types that are not exported (search helpers)
+SKIPPED_TYPES = ("tsvector",)
+
+# PostgreSQL type name -> Arrow type name; everything else is exported as string
+ARROW_TYPE_NAMES = {
+    "bool": "bool",
+    "int2": "int16",
+    "int4": "int32",
+    "int8": "int64",
+    "float4": "float32",
+    "float8": "float64",
+    "numeric": "float64",
+    "date": "date32",
+    "timestamp": "timestamp",
+    "timestamptz": "timestamptz",
+}
+
+
+def _pyarrow():
+    """Import pyarrow lazily (optional dependency)"""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Columnar export requires pyarrow (pip install -r requirements-optional.txt)") from e
+    return pyarrow
+
+
+def pyarrow_available() -> bool:
+    """Whether the optional pyarrow dependency is installed"""
+    try:
+        _pyarrow()
+    except RuntimeError:
+        return False
+    return True
+
+
+def build_export_query(
+    table: str,
+    columns: List[Tuple[str, str]],
+    campaign_id: Optional[UUID] = None,
+    organization_id: Optional[UUID] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Tuple[str, List[Any]]:
+    """
+    Build the export SELECT for a table.
+
+    Args:
+        table: One of EXPORT_TABLES
+        columns: (name, type name) pairs to select
+        campaign_id: Filter by campaign
+        organization_id: Filter by organization
+        date_from: created_at >= date_from
+        date_to: created_at <= date_to
+
+    Returns:
+        Tuple of (sql, params)
+
+    Raises:
+        ValueError: If table is not exportable
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Table {table} cannot be exported")
+
+    where_clauses = []
+    params = []
+
+    if campaign_id:
+        if table == "event_log":
+            # event_log references campaigns through subject_refs (GIN indexed);
+            # the id is bound as text there
+            params.append(str(campaign_id))
+            where_clauses.append(f"subject_refs @> jsonb_build_object('campaign_id', ${len(params)}::text)")
+        else:
+            params.append(campaign_id)
+            where_clauses.append(f"campaign_id = ${len(params)}")
+
+    if organization_id:
+        params.append(organization_id)
+        where_clauses.append(f"organization_id = ${len(params)}")
+
+    # created_at is the partition key, so date filters prune partitions
+    if date_from:
+        params.append(date_from)
+        where_clauses.append(f"created_at >= ${len(params)}")
+
+    if date_to:
+        params.append(date_to)
+        where_clauses.append(f"created_at <= ${len(params)}")
+
+    select_list = ", ".join(f'"{name}"' for name, _ in columns)
+    where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+
+    return f"SELECT {select_list} FROM {table} {where_sql} ORDER BY created_at", params
+
+
+def arrow_schema(columns: List[Tuple[str, str]]):
+    """Arrow schema for (name, PostgreSQL type name) pairs"""
+    pa = _pyarrow()
+    types = {
+        "bool": pa.bool_(),
+        "int16": pa.int16(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float32": pa.float32(),
+        "float64": pa.float64(),
+        "date32": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+        "timestamptz": pa.timestamp("us", tz="UTC"),
+    }
+
+    return pa.schema([
+        pa.field(name, types.get(ARROW_TYPE_NAMES.get(type_name), pa.string()))
+        for name, type_name in columns
+    ])
+
+
+def _string_value(value: Any) -> Optional[str]:
+    """UUID, inet, json (already text) etc. as string"""
+    return None if value is None else str(value)
+
+
+def _float_value(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def rows_to_record_batch(rows: List[Any], schema):
+    """
+    Convert asyncpg records to an Arrow RecordBatch, column by column.
+
+    Args:
+        rows: Records in schema column order
+        schema: Schema from arrow_schema()
+    """
+    pa = _pyarrow()
+    arrays = []
+
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+
+        if pa.types.is_string(field.type):
+            values = [_string_value(v) for v in values]
+        elif pa.types.is_floating(field.type):
+            values = [_float_value(v) if isinstance(v, Decimal) else v for v in values]
+
+        arrays.append(pa.array(values, type=field.type))
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object that collects bytes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _open_writer(format: str, sink: _ChunkSink, schema):
+    pa = _pyarrow()
+    if format == "parquet":
+        return pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+
+async def get_export_columns(conn, table: str) -> List[Tuple[str, str]]:
+    """
+    Exportable columns of a table in table order.
+
+    Generated columns (search_vector, payload_text) and tsvector columns
+    are skipped; they are derived from other columns.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT a.attname as name, t.typname as type_name
+        FROM pg_attribute a
+        JOIN pg_type t ON t.oid = a.atttypid
+        WHERE a.attrelid = $1::text::regclass
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+          AND a.attgenerated = ''
+        ORDER BY a.attnum
+        """,
+        table
+    )
+
+    return [
+        (row["name"], row["type_name"])
+        for row in rows
+        if row["type_name"] not in SKIPPED_TYPES
+    ]
+
+
+async def stream_export(
+    table: str,
+    format: str = "parquet",
+    campaign_id: Optional[UUID] = None,
+    organization_id: Optional[UUID] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    row_group_size: int = 50000
+) -> AsyncIterator[bytes]:
+    """
+    Export a table as Parquet or Arrow IPC, yielding the file in chunks.
+
+    Each chunk of row_group_size rows fetched from the cursor is written as
+    one row group / record batch and yielded before the next fetch.
+
+    Args:
+        table: One of EXPORT_TABLES
+        format: "parquet" or "arrow"
+        campaign_id: Filter by campaign
+        organization_id: Filter by organization
+        date_from: Start of created_at range
+        date_to: End of created_at range
+        row_group_size: Rows per row group / cursor fetch
+
+    Yields:
+        Bytes of the export file, in order
+
+    Raises:
+        ValueError: If table or format is invalid
+        RuntimeError: If pyarrow is not installed
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Table {table} cannot be exported")
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+    _pyarrow()
+
+    async with db.tenant_db_pool.acquire() as conn:
+        columns = await get_export_columns(conn, table)
+        sql, params = build_export_query(
+            table,
+            columns,
+            campaign_id=campaign_id,
+            organization_id=organization_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+        schema = arrow_schema(columns)
+
+        sink = _ChunkSink()
+        writer = _open_writer(format, sink, schema)
+
+        try:
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction(readonly=True):
+                cursor = await conn.cursor(sql, *params)
+                while True:
+                    rows = await cursor.fetch(row_group_size)
+                    if not rows:
+                        break
+
+                    writer.write_batch(rows_to_record_batch(rows, schema))
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+        finally:
+            writer.close()
+
+        yield sink.drain()
+
+
+async def export_to_file(path: str, table: str, format: str = "parquet", **filters) -> Dict[str, Any]:
+    """
+    Write an export to a local file.
+
+    Args:
+        path: Output file path
+        table: One of EXPORT_TABLES
+        format: "parquet" or "arrow"
+        **filters: campaign_id, organization_id, date_from, date_to, row_group_size
+
+    Returns:
+        Dict with path and bytes written
+    """
+    written = 0
+    with open(path, "wb") as f:
+        async for chunk in stream_export(table, format, **filters):
+            f.write(chunk)
+            written += len(chunk)
+
+    return {"path": path, "bytes": written}
@@ -0,0 +1,208 @@
+"""
+Dashboard Service
+
+Aggregated statistics for the Admin Dashboard.
+
+Message and webhook counters are read from the hourly rollup tables
+(org_hourly_message_stats, org_hourly_webhook_stats) that triggers on
+message/webhook_log keep up to date, so the cost of a dashboard request
+depends on organizations x hours, not on table size. All sections are
+computed in one statement and cached per organization for a few seconds.
+"""
+
+from typing import Optional, Dict, Any
+from datetime import datetime
+from uuid import UUID
+
+from app.core import db
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Sections of the dashboard stats row; columns are named "<section>__<stat>"
+DASHBOARD_SECTIONS = ("campaigns", "contacts", "messages", "webhooks", "users")
+
+# Per-organization cache (key None = all organizations)
+_stats_cache = TTLCache(
+    ttl=settings.dashboard_cache_ttl_seconds,
+    stale_ttl=settings.dashboard_cache_stale_seconds
+)
+
+
+def _dashboard_stats_query(organization_id: Optional[UUID]) -> str:
+    """
+    One statement for all dashboard sections.
+
+    Each CTE is evaluated once and all of them share one snapshot and one
+    NOW(), so the sections are consistent with each other.
+    """
+    org_filter = "WHERE {0}.organization_id = $1" if organization_id else "WHERE TRUE"
+
+    return f"""
+        WITH campaign_stats AS (
+            SELECT
+                COUNT(*) as total,
+                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') as today,
+                COUNT(*) FILTER (WHERE status = 'active') as active
+            FROM campaign c
+            {org_filter.format("c")}
+        ),
+        contact_stats AS (
+            SELECT
+                COUNT(*) as total,
+                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') as today,
+                ROUND(AVG(lead_score), 1) as lead_score_avg
+            FROM contact ct
+            {org_filter.format("ct")}
+        ),
+        -- "today" is hour-granular: the current hour plus the previous 24
+        message_totals AS (
+            SELECT
+                COALESCE(SUM(message_count), 0) as total,
+                COALESCE(SUM(message_count) FILTER (
+                    WHERE bucket >= date_trunc('hour', NOW() - INTERVAL '24 hours')
+                ), 0) as today,
+                COALESCE(SUM(message_count) FILTER (WHERE event_type = 'email_sent'), 0) as sent,
+                COALESCE(SUM(message_count) FILTER (WHERE event_type = 'email_opened'), 0) as opened,
+                COALESCE(SUM(message_count) FILTER (WHERE event_type = 'reply_received'), 0) as replied,
+                COALESCE(SUM(message_count) FILTER (WHERE event_type = 'email_bounced'), 0) as bounced
+            FROM org_hourly_message_stats ms
+            {org_filter.format("ms")}
+        ),
+        webhook_totals AS (
+            SELECT
+                COALESCE(SUM(log_count), 0) as total,
+                COALESCE(SUM(log_count) FILTER (WHERE status = 'success'), 0) as success,
+                COALESCE(SUM(log_count) FILTER (WHERE status = 'failed'), 0) as failed
+            FROM org_hourly_webhook_stats ws
+            {org_filter.format("ws")}
+        ),
+        -- Last-hour figures are an index range scan on webhook_log
+        webhook_recent AS (
+            SELECT
+                COUNT(*) as last_hour,
+                COUNT(*) FILTER (WHERE status = 'failed') as failed_last_hour,
+                ROUND(COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '1 minute')::numeric / 60, 1) as avg_per_second
+            FROM webhook_log wl
+            WHERE wl.created_at >= NOW() - INTERVAL '1 hour'
+            {"AND wl.organization_id = $1" if organization_id else ""}
+        ),
+        -- User count (admin only, no org filter for now)
+        user_stats AS (
+            SELECT
+                COUNT(*) as total,
+                COUNT(*) FILTER (WHERE status = 'active') as active_now
+            FROM "user"
+        )
+        SELECT
+            cs.total as campaigns__total,
+            cs.today as campaigns__today,
+            cs.active as campaigns__active,
+            ctc.total as contacts__total,
+            ctc.today as contacts__today,
+            ctc.lead_score_avg as contacts__lead_score_avg,
+            mt.total as messages__total,
+            mt.today as messages__today,
+            mt.sent as messages__sent,
+            mt.opened as messages__opened,
+            mt.replied as messages__replied,
+            mt.bounced as messages__bounced,
+            ROUND(mt.opened::numeric * 100 / NULLIF(mt.sent, 0), 1) as messages__open_rate,
+            ROUND(mt.replied::numeric * 100 / NULLIF(mt.sent, 0), 1) as messages__reply_rate,
+            wt.total as webhooks__total,
+            wt.success as webhooks__success,
+            wt.failed as webhooks__failed,
+            wr.last_hour as webhooks__last_hour,
+            wr.failed_last_hour as webhooks__failed_last_hour,
+            wr.avg_per_second as webhooks__avg_per_second,
+            us.total as users__total,
+            us.active_now as users__active_now
+        FROM campaign_stats cs, contact_stats ctc, message_totals mt,
+             webhook_totals wt, webhook_recent wr, user_stats us
+    """
+
+
+def split_sections(row: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Split a "<section>__<stat>" row into one dict per section"""
+    stats = {section: {} for section in DASHBOARD_SECTIONS}
+    for column, value in row.items():
+        section, _, stat = column.partition("__")
+        stats[section][stat] = value
+    return stats
+
+
+async def fetch_dashboard_stats(organization_id: Optional[UUID] = None) -> Dict[str, Any]:
+    """
+    Query dashboard statistics (uncached, one round trip).
+
+    Args:
+        organization_id: Limit stats to one organization (None = all organizations)
+
+    Returns:
+        Dict with campaigns, contacts, messages, webhooks and users stats
+    """
+    params = [organization_id] if organization_id else []
+
+    async with db.tenant_db_pool.acquire() as conn:
+        row = await conn.fetchrow(_dashboard_stats_query(organization_id), *params)
+
+    return split_sections(dict(row))
+
+
+async def get_dashboard_stats(organization_id: Optional[UUID] = None) -> Dict[str, Any]:
+    """
+    Get overall dashboard statistics.
+
+    Served from a short per-organization cache: fresh for
+    settings.dashboard_cache_ttl_seconds, then served stale for up to
+    settings.dashboard_cache_stale_seconds while one background query
+    refreshes it. Concurrent misses share one query.
+
+    Args:
+        organization_id: Limit stats to one organization (None = all organizations)
+
+    Returns:
+        Dict with campaigns, contacts, messages, webhooks and users stats
+    """
+    return await _stats_cache.get_or_load(
+        organization_id,
+        lambda: fetch_dashboard_stats(organization_id)
+    )
+
+
+async def rebuild_dashboard_rollups(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Dict[str, int]:
+    """
+    Recompute rollup buckets from message/webhook_log.
+
+    Triggers keep the rollups current; this is the reconciliation job for
+    backfills or after bulk operations that bypassed the triggers
+    (e.g. TRUNCATE). Writers are blocked while it runs, so keep the range small.
+
+    Args:
+        date_from: Start of range (None = beginning)
+        date_to: End of range, exclusive (None = now and future)
+
+    Returns:
+        Dict with number of rebuilt message and webhook buckets
+    """
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                SELECT * FROM rebuild_dashboard_rollups(
+                    COALESCE($1::timestamptz, '-infinity'),
+                    COALESCE($2::timestamptz, 'infinity')
+                )
+                """,
+                date_from,
+                date_to
+            )
+
+    _stats_cache.invalidate()
+
+    return {
+        "message_buckets": row["message_buckets"],
+        "webhook_buckets": row["webhook_buckets"]
+    }
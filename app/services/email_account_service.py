@@ -7,7 +7,8 @@ import logging
 from uuid import UUID
 from typing import List, Optional, Dict, Any
 
-from app.core.db import tenant_db_pool
+from app.core import db
+from app.core.response_cache import invalidate_tags
 from app.integrations.instantly.schemas import InstantlyEmailAccount
 
 logger = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ class EmailAccountService:
         updated_count = 0
         skipped_count = 0
 
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             for account in accounts:
                 try:
                     # Check if account already exists
@@ -117,6 +118,9 @@ class EmailAccountService:
                     logger.error(f"Failed to import email account {account.email}: {e}")
                     skipped_count += 1
 
+        if imported_count or updated_count:
+            await invalidate_tags("email_accounts")
+
         return {
             "imported": imported_count,
             "updated": updated_count,
@@ -133,7 +137,7 @@ class EmailAccountService:
         Returns:
             List of email account dicts with organization info
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Set admin role to bypass RLS
             await conn.execute("SET LOCAL app.user_role = 'sb_admin'")
 
@@ -172,7 +176,7 @@ class EmailAccountService:
         Returns:
             List of email account dicts
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Set organization context for RLS
             await conn.execute("SET LOCAL app.current_org_id = $1", str(organization_id))
 
@@ -207,7 +211,7 @@ class EmailAccountService:
         Returns:
             Email account dict or None
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT
                     ea.id,
@@ -235,14 +239,15 @@ class EmailAccountService:
         Returns:
             True if updated, False otherwise
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             result = await conn.execute("""
                 UPDATE email_account
                 SET status = $1, updated_at = NOW()
                 WHERE id = $2
             """, status, account_id)
 
-            return result == "UPDATE 1"
+        await invalidate_tags("email_accounts")
+        return result == "UPDATE 1"
 
     @staticmethod
     async def increment_sent_count(account_id: UUID) -> bool:
@@ -255,7 +260,7 @@ class EmailAccountService:
         Returns:
             True if updated, False otherwise
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             result = await conn.execute("""
                 UPDATE email_account
                 SET
@@ -266,7 +271,8 @@ class EmailAccountService:
                 WHERE id = $1
             """, account_id)
 
-            return result == "UPDATE 1"
+        await invalidate_tags("email_accounts")
+        return result == "UPDATE 1"
 
     @staticmethod
     async def reset_daily_counters() -> int:
@@ -277,17 +283,19 @@ class EmailAccountService:
         Returns:
             Number of accounts reset
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             result = await conn.execute("""
                 UPDATE email_account
                 SET emails_sent_today = 0, updated_at = NOW()
                 WHERE emails_sent_today > 0
             """)
 
-            # Extract count from "UPDATE N" result
-            count = int(result.split()[-1]) if result.startswith("UPDATE") else 0
-            logger.info(f"Reset daily counters for {count} email accounts")
-            return count
+        # Extract count from "UPDATE N" result
+        count = int(result.split()[-1]) if result.startswith("UPDATE") else 0
+        logger.info(f"Reset daily counters for {count} email accounts")
+
+        await invalidate_tags("email_accounts")
+        return count
 
     @staticmethod
     async def handle_error(email_address: str, error_message: str) -> bool:
@@ -301,7 +309,7 @@ class EmailAccountService:
         Returns:
             True if handled, False otherwise
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Update account status to 'error'
             result = await conn.execute("""
                 UPDATE email_account
@@ -316,11 +324,12 @@ class EmailAccountService:
                 WHERE email_address = $2
             """, error_message, email_address)
 
-            if result == "UPDATE 1":
-                logger.warning(f"Email account {email_address} suspended due to error: {error_message}")
-                return True
+        if result == "UPDATE 1":
+            logger.warning(f"Email account {email_address} suspended due to error: {error_message}")
+            await invalidate_tags("email_accounts")
+            return True
 
-            return False
+        return False
 
     @staticmethod
     async def get_account_stats(account_id: UUID) -> Dict[str, Any]:
@@ -333,7 +342,7 @@ class EmailAccountService:
         Returns:
             Dict with usage stats
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Get account info
             account = await conn.fetchrow("""
                 SELECT
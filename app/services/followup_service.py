@@ -0,0 +1,201 @@
+"""
+Follow-up Service
+
+Scheduler for user_contact_assignment.next_followup_at.
+
+Every tick claims due follow-ups in batches (FOR UPDATE SKIP LOCKED, so
+any number of workers can run the scheduler without double-dispatching),
+clears next_followup_at and records followup_reminded_at, writes one
+followup.due event_log row per follow-up and publishes one reminder event
+per assigned user to the activity feed. Claim, event rows and notifications
+commit together: a failed notification rolls the batch back and it is
+claimed again on the next tick.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core import db
+from app.core.config import settings
+from app.services.activity_feed_service import fits_notify, send_activity
+
+logger = logging.getLogger(__name__)
+
+# Follow-ups per reminder event (keeps pg_notify payloads small)
+MAX_FOLLOWUPS_PER_EVENT = 25
+
+
+CLAIM_DUE_FOLLOWUPS_SQL = """
+    WITH due AS (
+        SELECT id, next_followup_at AS due_at
+        FROM user_contact_assignment
+        WHERE status = 'active'
+          AND next_followup_at <= $2
+        ORDER BY next_followup_at
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    ),
+    claimed AS (
+        UPDATE user_contact_assignment uca
+        SET next_followup_at = NULL,
+            followup_reminded_at = $2,
+            updated_at = NOW()
+        FROM due
+        WHERE uca.id = due.id
+        RETURNING uca.id, uca.user_id, uca.contact_id, uca.organization_id, due.due_at
+    ),
+    events AS (
+        INSERT INTO event_log (organization_id, event_type, occurred_at, source, subject_refs)
+        SELECT
+            organization_id,
+            'followup.due',
+            due_at,
+            'system',
+            jsonb_build_object(
+                'assignment_id', id,
+                'user_id', user_id,
+                'contact_id', contact_id
+            )
+        FROM claimed
+    )
+    SELECT
+        cl.id as assignment_id,
+        cl.user_id,
+        cl.contact_id,
+        cl.organization_id,
+        cl.due_at,
+        ct.email as contact_email,
+        ct.first_name,
+        ct.last_name
+    FROM claimed cl
+    JOIN contact ct ON ct.id = cl.contact_id
+    ORDER BY cl.user_id, cl.due_at
+"""
+
+
+def _reminder_event(user_id: Any, organization_id: Any, followups: List[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+    return {
+        "type": "followup_reminder",
+        "user_id": str(user_id),
+        "organization_id": str(organization_id),
+        "description": f"{len(followups)} follow-up(s) due",
+        "followups": followups,
+        "timestamp": now.isoformat()
+    }
+
+
+def followup_reminder_events(rows: List[Any], now: datetime) -> List[Dict[str, Any]]:
+    """
+    Group claimed follow-ups into reminder events, one per assigned user.
+
+    Users with more than MAX_FOLLOWUPS_PER_EVENT due follow-ups, or whose
+    follow-ups don't fit in one pg_notify payload, get several events. A
+    follow-up that doesn't fit on its own is sent without contact email
+    and name.
+
+    Args:
+        rows: Claimed follow-ups (assignment_id, user_id, contact_id,
+            organization_id, due_at, contact_email, first_name, last_name)
+        now: Dispatch time
+
+    Returns:
+        Activity feed events
+    """
+    by_user: Dict[Any, List[Any]] = {}
+    for row in rows:
+        by_user.setdefault(row["user_id"], []).append(row)
+
+    events = []
+    for user_id, user_rows in by_user.items():
+        organization_id = user_rows[0]["organization_id"]
+        chunk: List[Dict[str, Any]] = []
+
+        for row in user_rows:
+            followup = {
+                "assignment_id": str(row["assignment_id"]),
+                "contact_id": str(row["contact_id"]),
+                "contact_email": row["contact_email"],
+                "contact_name": " ".join(filter(None, [row["first_name"], row["last_name"]])) or None,
+                "due_at": row["due_at"].isoformat()
+            }
+            if not fits_notify(_reminder_event(user_id, organization_id, [followup], now)):
+                followup = {**followup, "contact_email": None, "contact_name": None}
+
+            if chunk and (
+                len(chunk) >= MAX_FOLLOWUPS_PER_EVENT
+                or not fits_notify(_reminder_event(user_id, organization_id, chunk + [followup], now))
+            ):
+                events.append(_reminder_event(user_id, organization_id, chunk, now))
+                chunk = []
+            chunk.append(followup)
+
+        events.append(_reminder_event(user_id, organization_id, chunk, now))
+
+    return events
+
+
+async def dispatch_due_followups(
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Claim and dispatch one batch of due follow-ups.
+
+    Args:
+        batch_size: Max follow-ups to claim (default: settings.followup_batch_size)
+        now: Follow-ups due at or before this time are claimed (default: now)
+
+    Returns:
+        Number of follow-ups dispatched
+    """
+    batch_size = batch_size or settings.followup_batch_size
+    now = now or datetime.now(timezone.utc)
+
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            rows = await conn.fetch(CLAIM_DUE_FOLLOWUPS_SQL, batch_size, now)
+
+            # pg_notify is transactional: reminders go out only if the claim
+            # commits, and a failed notify must roll the claim back
+            for event in followup_reminder_events(rows, now):
+                await send_activity(conn, event)
+
+    return len(rows)
+
+
+async def run_followup_scheduler(tick_seconds: Optional[float] = None) -> None:
+    """
+    Background task: dispatch due follow-ups, forever.
+
+    Each tick drains due follow-ups batch by batch, up to
+    settings.followup_max_batches_per_tick batches, so a large backlog is
+    worked off over several ticks with bounded load. Errors are logged and
+    retried on the next tick.
+
+    Args:
+        tick_seconds: Seconds between ticks (default: settings.followup_tick_seconds)
+    """
+    if not settings.followup_scheduler_enabled:
+        return
+
+    tick_seconds = tick_seconds or settings.followup_tick_seconds
+
+    while True:
+        try:
+            dispatched = 0
+            for _ in range(settings.followup_max_batches_per_tick):
+                count = await dispatch_due_followups()
+                dispatched += count
+                if count < settings.followup_batch_size:
+                    break
+
+            if dispatched:
+                logger.info(f"Dispatched {dispatched} follow-up reminders")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Follow-up scheduler failed: {e}")
+
+        await asyncio.sleep(tick_seconds)
@@ -4,15 +4,33 @@ Business logic for message tracking and webhook event processing
 """
 
 import logging
+import re
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from datetime import datetime
 
-from app.core.db import tenant_db_pool
+from app.core import db
+from app.core.pagination import decode_cursor, next_cursor_for
 from app.integrations.instantly.schemas import InstantlyWebhookPayload, InstantlyEventType
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by campaign message listings (offset, keyset and stream)
+MESSAGE_LIST_COLUMNS = """
+                    m.id,
+                    m.from_email,
+                    m.to_email,
+                    m.direction,
+                    m.status,
+                    m.event_type,
+                    m.subject,
+                    m.body,
+                    m.created_at,
+                    c.email as contact_email,
+                    c.first_name,
+                    c.last_name
+"""
+
 
 class MessageService:
     """Message Tracking and Event Processing"""
@@ -31,7 +49,7 @@ class MessageService:
         Raises:
             ValueError: If campaign not found or invalid data
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             # Find campaign by external_id
             campaign = await conn.fetchrow("""
                 SELECT
@@ -189,7 +207,9 @@ class MessageService:
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """
-        Get messages for a campaign
+        Get messages for a campaign (OFFSET pagination)
+
+        Prefer get_messages_for_campaign_page for deep pagination.
 
         Args:
             campaign_id: Campaign UUID
@@ -199,30 +219,102 @@ class MessageService:
         Returns:
             List of message dicts
         """
-        async with tenant_db_pool.acquire() as conn:
-            rows = await conn.fetch("""
+        async with db.tenant_db_pool.acquire() as conn:
+            rows = await conn.fetch(f"""
                 SELECT
-                    m.id,
-                    m.from_email,
-                    m.to_email,
-                    m.direction,
-                    m.status,
-                    m.event_type,
-                    m.subject,
-                    m.body,
-                    m.created_at,
-                    c.email as contact_email,
-                    c.first_name,
-                    c.last_name
+                    {MESSAGE_LIST_COLUMNS}
                 FROM message m
                 LEFT JOIN contact c ON m.contact_id = c.id
                 WHERE m.campaign_id = $1
-                ORDER BY m.created_at DESC
+                ORDER BY m.created_at DESC, m.id DESC
                 LIMIT $2 OFFSET $3
             """, campaign_id, limit, offset)
 
             return [dict(row) for row in rows]
 
+    @staticmethod
+    async def get_messages_for_campaign_page(
+        campaign_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of campaign messages using keyset pagination
+
+        Pages are ordered by (created_at, id) DESC and served from
+        idx_message_campaign_created, so deep pages cost the same as the first.
+
+        Args:
+            campaign_id: Campaign UUID
+            limit: Max results
+            cursor: Cursor from the previous page (None for the first page)
+
+        Returns:
+            Dict with messages and next_cursor (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        params: List[Any] = [campaign_id]
+        keyset_sql = ""
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            params.extend([cursor_created_at, cursor_id])
+            keyset_sql = "AND (m.created_at, m.id) < ($2, $3)"
+
+        params.append(limit)
+
+        async with db.tenant_db_pool.acquire() as conn:
+            rows = await conn.fetch(f"""
+                SELECT
+                    {MESSAGE_LIST_COLUMNS}
+                FROM message m
+                LEFT JOIN contact c ON m.contact_id = c.id
+                WHERE m.campaign_id = $1
+                {keyset_sql}
+                ORDER BY m.created_at DESC, m.id DESC
+                LIMIT ${len(params)}
+            """, *params)
+
+        messages = [dict(row) for row in rows]
+
+        return {
+            "messages": messages,
+            "next_cursor": next_cursor_for(messages, limit)
+        }
+
+    @staticmethod
+    async def stream_messages_for_campaign(
+        campaign_id: UUID,
+        batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all messages of a campaign through a server-side cursor
+
+        Rows are fetched in batches of `batch_size`, so memory stays bounded
+        regardless of campaign size. The connection is held until the
+        generator is exhausted or closed.
+
+        Args:
+            campaign_id: Campaign UUID
+            batch_size: Rows prefetched per cursor round trip
+
+        Yields:
+            Message dicts, newest first
+        """
+        async with db.tenant_db_pool.acquire() as conn:
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction(readonly=True):
+                async for row in conn.cursor(f"""
+                    SELECT
+                        {MESSAGE_LIST_COLUMNS}
+                    FROM message m
+                    LEFT JOIN contact c ON m.contact_id = c.id
+                    WHERE m.campaign_id = $1
+                    ORDER BY m.created_at DESC, m.id DESC
+                """, campaign_id, prefetch=batch_size):
+                    yield dict(row)
+
     @staticmethod
     async def get_messages_for_contact(
         contact_id: UUID,
@@ -238,7 +330,7 @@ class MessageService:
         Returns:
             List of message dicts (conversation thread)
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
             rows = await conn.fetch("""
                 SELECT
                     m.id,
@@ -272,15 +364,16 @@ class MessageService:
         Returns:
             Dict with sent, opened, replied, bounced counts
         """
-        async with tenant_db_pool.acquire() as conn:
+        async with db.tenant_db_pool.acquire() as conn:
+            # Hourly rollup maintained by triggers on message
             row = await conn.fetchrow("""
                 SELECT
-                    COUNT(*) FILTER (WHERE event_type = 'email_sent') as sent,
-                    COUNT(*) FILTER (WHERE event_type = 'email_opened') as opened,
-                    COUNT(*) FILTER (WHERE event_type = 'reply_received') as replied,
-                    COUNT(*) FILTER (WHERE event_type = 'email_bounced') as bounced,
-                    COUNT(*) FILTER (WHERE event_type = 'link_clicked') as clicked
-                FROM message
+                    COALESCE(SUM(message_count) FILTER (WHERE event_type = 'email_sent'), 0) as sent,
+                    COALESCE(SUM(message_count) FILTER (WHERE event_type = 'email_opened'), 0) as opened,
+                    COALESCE(SUM(message_count) FILTER (WHERE event_type = 'reply_received'), 0) as replied,
+                    COALESCE(SUM(message_count) FILTER (WHERE event_type = 'email_bounced'), 0) as bounced,
+                    COALESCE(SUM(message_count) FILTER (WHERE event_type = 'link_clicked'), 0) as clicked
+                FROM org_hourly_message_stats
                 WHERE organization_id = $1
             """, organization_id)
 
@@ -303,16 +396,34 @@ class MessageService:
         """
         Search messages by email, subject, or body
 
+        Subject/body are matched through the message.search_vector GIN index
+        with prefix matching on every term ("meet dem" finds "meeting demo").
+        Sender/recipient addresses are matched as substrings through trigram
+        indexes. Results are ranked (subject hits above body hits), newest first
+        within the same rank.
+
         Args:
             organization_id: Organization UUID
             query: Search query
             limit: Max results
 
         Returns:
-            List of matching message dicts
+            List of matching message dicts with rank
         """
-        async with tenant_db_pool.acquire() as conn:
-            rows = await conn.fetch("""
+        params: List[Any] = [organization_id, f"%{_escape_like(query)}%"]
+        match_clauses = ["m.from_email ILIKE $2", "m.to_email ILIKE $2"]
+        rank_sql = "0::real"
+
+        tsquery = build_prefix_tsquery(query)
+        if tsquery:
+            params.append(tsquery)
+            match_clauses.insert(0, "m.search_vector @@ to_tsquery('simple', $3)")
+            rank_sql = "ts_rank_cd(m.search_vector, to_tsquery('simple', $3))"
+
+        params.append(limit)
+
+        async with db.tenant_db_pool.acquire() as conn:
+            rows = await conn.fetch(f"""
                 SELECT
                     m.id,
                     m.from_email,
@@ -321,19 +432,41 @@ class MessageService:
                     m.event_type,
                     m.created_at,
                     c.email as contact_email,
-                    ca.name as campaign_name
+                    ca.name as campaign_name,
+                    {rank_sql} as rank
                 FROM message m
                 LEFT JOIN contact c ON m.contact_id = c.id
                 LEFT JOIN campaign ca ON m.campaign_id = ca.id
                 WHERE m.organization_id = $1
-                AND (
-                    m.from_email ILIKE $2
-                    OR m.to_email ILIKE $2
-                    OR m.subject ILIKE $2
-                    OR m.body ILIKE $2
-                )
-                ORDER BY m.created_at DESC
-                LIMIT $3
-            """, organization_id, f"%{query}%", limit)
+                AND ({" OR ".join(match_clauses)})
+                ORDER BY rank DESC, m.created_at DESC
+                LIMIT ${len(params)}
+            """, *params)
 
             return [dict(row) for row in rows]
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """
+    Turn free text into a prefix tsquery for to_tsquery('simple', ...)
+
+    Every word becomes a prefix term and all terms must match:
+    "Meet demo" -> "meet:* & demo:*". Operators and punctuation typed by
+    the user are dropped, so the result is always a valid tsquery.
+
+    Args:
+        query: User search input
+
+    Returns:
+        tsquery string, or None if the query contains no words
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so user input matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -2,13 +2,157 @@
 Onboarding Link Service
 
 Handles creation and management of onboarding links.
+
+Public token lookups are served from a short-lived per-worker cache. Revoke,
+extend, progress and completion invalidate the entry in every worker:
+locally right away and in the others through pg_notify on the
+onboarding_link_invalidated channel (run_link_invalidation_listener). A
+worker whose listener is disconnected drops its whole cache when it
+reconnects, so at worst it serves a changed link until the cache TTL runs
+out (never beyond: stale entries are not served). Link accesses are
+buffered in memory and flushed in one statement per interval (see
+LinkAccessBuffer), so a popular link doesn't update its row on every page
+load.
 """
 
+import asyncio
+import json
+import logging
+import asyncpg
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from app.core import db
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Distinct IPs / user agents recorded per link and flush
+MAX_TRACKED_CLIENTS_PER_FLUSH = 20
+
+CHANNEL = "onboarding_link_invalidated"
+
+# pg_notify payload that drops every cached link
+INVALIDATE_ALL = "*"
+
+# No stale-while-revalidate: a revoked link must not be served past the TTL
+_link_cache = TTLCache(
+    ttl=settings.onboarding_link_cache_ttl_seconds,
+    stale_ttl=0,
+    max_entries=4096
+)
+
+
+async def _invalidate_link(conn: asyncpg.Connection, link_token: str = INVALIDATE_ALL) -> None:
+    """Drop a cached link here and, through pg_notify, in every other worker"""
+    _link_cache.invalidate(None if link_token == INVALIDATE_ALL else link_token)
+    await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, link_token)
+
+
+def _on_invalidation(connection, pid, channel, payload) -> None:
+    _link_cache.invalidate(None if payload == INVALIDATE_ALL else payload)
+
+
+async def run_link_invalidation_listener(retry_seconds: float = 5.0) -> None:
+    """
+    Background task: apply link cache invalidations from other workers, forever.
+
+    Uses a dedicated connection (not from the pool). The whole cache is
+    dropped after every (re)connect, since notifications sent while
+    disconnected are lost.
+    """
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(settings.database_tenant_url)
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _: closed.set())
+            await conn.add_listener(CHANNEL, _on_invalidation)
+            _link_cache.invalidate()
+
+            await closed.wait()
+            logger.warning("Onboarding link invalidation listener connection lost, reconnecting")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Onboarding link invalidation listener failed: {e}")
+
+        finally:
+            if conn and not conn.is_closed():
+                await conn.close()
+
+        await asyncio.sleep(retry_seconds)
+
+
+class LinkAccessBuffer:
+    """Coalesces onboarding link accesses until the next flush"""
+
+    def __init__(self, max_clients: int = MAX_TRACKED_CLIENTS_PER_FLUSH):
+        self.max_clients = max_clients
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, link_token: str, ip_address: str, user_agent: str, at: datetime) -> None:
+        """Count one access; repeated IPs / user agents keep their latest timestamp"""
+        entry = self._pending.get(link_token)
+        if entry is None:
+            entry = self._pending[link_token] = {
+                "hits": 0, "first_at": at, "last_at": at, "ips": {}, "agents": {}
+            }
+
+        entry["hits"] += 1
+        entry["last_at"] = at
+        for clients, value in ((entry["ips"], ip_address), (entry["agents"], user_agent)):
+            if value in clients or len(clients) < self.max_clients:
+                clients[value] = at
+
+    def merge(self, pending: Dict[str, Dict[str, Any]]) -> None:
+        """Put drained accesses back (after a failed flush)"""
+        for link_token, old in pending.items():
+            entry = self._pending.get(link_token)
+            if entry is None:
+                self._pending[link_token] = old
+                continue
+
+            entry["hits"] += old["hits"]
+            entry["first_at"] = min(entry["first_at"], old["first_at"])
+            for key in ("ips", "agents"):
+                for value, at in old[key].items():
+                    if value not in entry[key] and len(entry[key]) < self.max_clients:
+                        entry[key][value] = at
+
+    def drain(self) -> Dict[str, Dict[str, Any]]:
+        """Take all pending accesses"""
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+def access_updates(pending: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rows for the batched access update, in token order (stable lock order).
+
+    ips / user_agents have the same shape the per-access SQL function
+    appended to onboarding_link.ip_addresses / user_agents.
+    """
+    return [
+        {
+            "link_token": link_token,
+            "hits": entry["hits"],
+            "first_at": entry["first_at"].isoformat(),
+            "last_at": entry["last_at"].isoformat(),
+            "ips": [{"ip": ip, "timestamp": at.isoformat()} for ip, at in entry["ips"].items()],
+            "agents": [{"user_agent": agent, "timestamp": at.isoformat()} for agent, at in entry["agents"].items()]
+        }
+        for link_token, entry in sorted(pending.items())
+    ]
+
+
+access_buffer = LinkAccessBuffer()
 
 
 async def create_onboarding_link(
@@ -193,12 +337,21 @@ async def get_onboarding_link_by_token(link_token: str) -> Optional[Dict[str, An
     """
     Get an onboarding link by its token (for public access).
 
+    Served from a cache for settings.onboarding_link_cache_ttl_seconds
+    (unknown tokens included). Access counters in the result lag behind by
+    up to that plus the access flush interval.
+
     Args:
         link_token: Link token
 
     Returns:
         Link dict or None
     """
+    link = await _link_cache.get_or_load(link_token, lambda: _fetch_link_by_token(link_token))
+    return dict(link) if link else None
+
+
+async def _fetch_link_by_token(link_token: str) -> Optional[Dict[str, Any]]:
     async with db.tenant_db_pool.acquire() as conn:
         row = await conn.fetchrow(
             """
@@ -223,6 +376,8 @@ async def track_link_access(
     """
     Track an access to an onboarding link.
 
+    The access is buffered and written by the next flush_link_access().
+
     Args:
         link_token: Link token
         ip_address: IP address of accessor
@@ -231,17 +386,80 @@ async def track_link_access(
     Returns:
         True if tracked successfully
     """
-    async with db.tenant_db_pool.acquire() as conn:
-        await conn.execute(
-            """
-            SELECT track_onboarding_link_access($1, $2, $3)
-            """,
-            link_token, ip_address, user_agent
-        )
-
+    access_buffer.record(link_token, ip_address, user_agent, datetime.now(timezone.utc))
     return True
 
 
+async def flush_link_access() -> int:
+    """
+    Write buffered link accesses in one statement.
+
+    On failure or cancellation the accesses are put back and retried on
+    the next flush.
+
+    Returns:
+        Number of links updated
+    """
+    pending = access_buffer.drain()
+    if not pending:
+        return 0
+
+    try:
+        async with db.tenant_db_pool.acquire() as conn:
+            result = await conn.execute(
+                """
+                UPDATE onboarding_link ol
+                SET
+                    clicks_count = ol.clicks_count + v.hits,
+                    first_accessed_at = COALESCE(ol.first_accessed_at, v.first_at),
+                    last_accessed_at = GREATEST(ol.last_accessed_at, v.last_at),
+                    ip_addresses = COALESCE(ol.ip_addresses, '[]'::JSONB) || v.ips,
+                    user_agents = COALESCE(ol.user_agents, '[]'::JSONB) || v.agents,
+                    updated_at = NOW()
+                FROM jsonb_to_recordset($1::jsonb) AS v(
+                    link_token TEXT,
+                    hits INT,
+                    first_at TIMESTAMPTZ,
+                    last_at TIMESTAMPTZ,
+                    ips JSONB,
+                    agents JSONB
+                )
+                WHERE ol.link_token = v.link_token
+                """,
+                json.dumps(access_updates(pending))
+            )
+    except BaseException:
+        access_buffer.merge(pending)
+        raise
+
+    return int(result.split()[-1])
+
+
+async def run_access_flusher(interval_seconds: Optional[float] = None) -> None:
+    """
+    Background task: flush buffered link accesses, forever.
+
+    Cancelling the task lets a flush in progress finish first (the UPDATE
+    may already be applied, so putting its accesses back could count them
+    twice); await the cancelled task before the shutdown flush.
+
+    Args:
+        interval_seconds: Seconds between flushes (default: settings.onboarding_access_flush_seconds)
+    """
+    interval_seconds = interval_seconds or settings.onboarding_access_flush_seconds
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        flush = asyncio.ensure_future(flush_link_access())
+        try:
+            await asyncio.shield(flush)
+        except asyncio.CancelledError:
+            await asyncio.wait([flush])
+            raise
+        except Exception as e:
+            logger.error(f"Failed to flush onboarding link accesses: {e}")
+
+
 async def update_link_progress(
     link_token: str,
     current_step: int,
@@ -270,6 +488,7 @@ async def update_link_progress(
             """,
             link_token, current_step, progress_percentage
         )
+        await _invalidate_link(conn, link_token)
 
     return result != "UPDATE 0"
 
@@ -297,6 +516,7 @@ async def complete_onboarding(link_token: str) -> bool:
             """,
             link_token
         )
+        await _invalidate_link(conn, link_token)
 
     return result != "UPDATE 0"
 
@@ -318,7 +538,7 @@ async def revoke_onboarding_link(
         True if revoked successfully
     """
     async with db.tenant_db_pool.acquire() as conn:
-        result = await conn.execute(
+        link_token = await conn.fetchval(
             """
             UPDATE onboarding_link
             SET
@@ -328,11 +548,14 @@ async def revoke_onboarding_link(
                 revoked_reason = $3,
                 updated_at = NOW()
             WHERE id = $1 AND status IN ('active', 'expired')
+            RETURNING link_token
             """,
             link_id, revoked_by, reason
         )
+        if link_token is not None:
+            await _invalidate_link(conn, link_token)
 
-    return result != "UPDATE 0"
+    return link_token is not None
 
 
 async def extend_onboarding_link(
@@ -350,7 +573,7 @@ async def extend_onboarding_link(
         True if extended successfully
     """
     async with db.tenant_db_pool.acquire() as conn:
-        result = await conn.execute(
+        link_token = await conn.fetchval(
             """
             UPDATE onboarding_link
             SET
@@ -361,11 +584,14 @@ async def extend_onboarding_link(
                 END,
                 updated_at = NOW()
             WHERE id = $1
+            RETURNING link_token
             """,
             link_id, additional_days
         )
+        if link_token is not None:
+            await _invalidate_link(conn, link_token)
 
-    return result != "UPDATE 0"
+    return link_token is not None
 
 
 async def expire_old_links() -> int:
@@ -381,5 +607,7 @@ async def expire_old_links() -> int:
             SELECT expire_old_onboarding_links()
             """
         )
+        if expired_count:
+            await _invalidate_link(conn)
 
     return expired_count
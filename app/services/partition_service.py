@@ -0,0 +1,108 @@
+"""
+Partition Service
+
+Maintenance of the monthly range partitions of webhook_log, message and
+event_log (see sql/migration_phase4_partitioning.sql).
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List
+
+from app.core import db
+from app.core.config import settings
+from app.core.response_cache import invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+# Tables partitioned by created_at
+PARTITIONED_TABLES = ("webhook_log", "message", "event_log")
+
+
+async def ensure_partitions(months_ahead: int = None) -> Dict[str, int]:
+    """
+    Create missing future monthly partitions for all partitioned tables.
+
+    Args:
+        months_ahead: Months to create ahead (default: settings.partition_months_ahead)
+
+    Returns:
+        Dict of table name -> number of partitions created
+    """
+    months_ahead = months_ahead if months_ahead is not None else settings.partition_months_ahead
+    created = {}
+
+    async with db.tenant_db_pool.acquire() as conn:
+        for table in PARTITIONED_TABLES:
+            created[table] = await conn.fetchval(
+                """
+                SELECT ensure_monthly_partitions($1, $2)
+                """,
+                table,
+                months_ahead
+            )
+
+    return created
+
+
+async def drop_expired_partitions(
+    table: str,
+    keep_days: int,
+    detach_only: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Detach (and drop) partitions that are entirely older than keep_days.
+
+    Args:
+        table: One of PARTITIONED_TABLES
+        keep_days: Keep at least this many days of data
+        detach_only: Detach but keep the partition tables (e.g. for archiving)
+
+    Returns:
+        List of dicts with partition_name and estimated_rows
+
+    Raises:
+        ValueError: If table is not partitioned
+    """
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"Table {table} is not partitioned")
+
+    async with db.tenant_db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT * FROM drop_expired_partitions($1, $2, $3)
+            """,
+            table,
+            keep_days,
+            detach_only
+        )
+
+    if rows and table == "webhook_log":
+        await invalidate_tags("webhooks")
+
+    return [dict(row) for row in rows]
+
+
+async def run_partition_maintenance(interval_seconds: int = None) -> None:
+    """
+    Background task: ensure future partitions exist, forever.
+
+    Runs once immediately and then every interval_seconds. Errors are logged
+    and retried on the next tick, so a missing migration never stops startup.
+
+    Args:
+        interval_seconds: Seconds between runs (default: settings.partition_maintenance_interval_seconds)
+    """
+    interval_seconds = interval_seconds or settings.partition_maintenance_interval_seconds
+
+    while True:
+        try:
+            created = await ensure_partitions()
+            if any(created.values()):
+                logger.info(f"Created partitions: {created}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}")
+
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,349 @@
+"""
+Token Service
+
+Refresh tokens with rotation, and the token revocation list.
+
+A login starts a session: a refresh token family (sid) with one active
+refresh token. Refreshing costs one indexed row lock, no bcrypt: the
+refresh token is marked rotated, a new one of the same family is issued
+along with a new access token. Presenting an already rotated refresh token
+means it leaked, so the whole family is revoked.
+
+Revocations (logout, reuse, inactive users) are stored in revoked_token
+and mirrored in the in-memory list of app.core.revocation, which
+get_current_user checks on every request. Revoking a session revokes all
+of its access tokens through their sid claim. Other workers learn about
+revocations through pg_notify on the token_revoked channel and reload the
+full list whenever their listener (re)connects.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+
+import asyncpg
+
+from app.core import db
+from app.core.config import settings
+from app.core.revocation import jti_key, revoked_tokens, sid_key
+from app.core.security import create_access_token
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "token_revoked"
+
+# Expired revocations / refresh tokens are deleted this often
+CLEANUP_INTERVAL_SECONDS = 3600
+
+
+class InvalidRefreshToken(Exception):
+    """Refresh token is unknown, expired, revoked or was reused"""
+
+
+def hash_refresh_token(refresh_token: str) -> bytes:
+    """Refresh tokens are stored as SHA-256 digests only"""
+    return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
+
+def access_token_claims(user: Dict[str, Any], family_id: UUID) -> Dict[str, Any]:
+    """Access token payload for a user record and session"""
+    return {
+        "user_id": str(user["user_id"]),
+        "organization_id": str(user["organization_id"]),
+        "role": user["role"],
+        "email": user["email"],
+        "sid": str(family_id)
+    }
+
+
+def _session_revocation_ttl() -> timedelta:
+    # After this, every access token of the session has expired on its own
+    return timedelta(minutes=settings.jwt_access_token_expire_minutes)
+
+
+async def _insert_refresh_token(
+    conn: asyncpg.Connection,
+    user_id: UUID,
+    organization_id: UUID,
+    family_id: UUID
+) -> str:
+    refresh_token = secrets.token_urlsafe(32)
+    await conn.execute(
+        """
+        INSERT INTO refresh_token (family_id, user_id, organization_id, token_hash, expires_at)
+        VALUES ($1, $2, $3, $4, NOW() + make_interval(days => $5))
+        """,
+        family_id, user_id, organization_id, hash_refresh_token(refresh_token),
+        settings.jwt_refresh_token_expire_days
+    )
+    return refresh_token
+
+
+def _session_response(user: Dict[str, Any], family_id: UUID, refresh_token: str) -> Dict[str, Any]:
+    return {
+        "access_token": create_access_token(access_token_claims(user, family_id)),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.jwt_access_token_expire_minutes * 60
+    }
+
+
+async def create_session(user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Start a session after a successful login.
+
+    Args:
+        user: Dict with user_id, organization_id, role, email
+
+    Returns:
+        Dict with access_token, refresh_token, token_type, expires_in
+    """
+    family_id = uuid4()
+
+    async with db.tenant_db_pool.acquire() as conn:
+        refresh_token = await _insert_refresh_token(
+            conn, UUID(str(user["user_id"])), UUID(str(user["organization_id"])), family_id
+        )
+
+    return _session_response(user, family_id, refresh_token)
+
+
+async def refresh_session(refresh_token: str) -> Dict[str, Any]:
+    """
+    Rotate a refresh token and issue a new access token.
+
+    Args:
+        refresh_token: Refresh token from login or the previous refresh
+
+    Returns:
+        Dict with access_token, refresh_token, token_type, expires_in
+
+    Raises:
+        InvalidRefreshToken: If the token can't be used (reuse revokes its session)
+    """
+    revoke_family: Optional[UUID] = None
+
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    id,
+                    family_id,
+                    user_id,
+                    organization_id,
+                    expires_at <= NOW() as expired,
+                    rotated_at,
+                    revoked_at
+                FROM refresh_token
+                WHERE token_hash = $1
+                FOR UPDATE
+                """,
+                hash_refresh_token(refresh_token)
+            )
+
+            if row is None or row["revoked_at"] is not None or row["expired"]:
+                raise InvalidRefreshToken("Invalid or expired refresh token")
+
+            # "user" is under the user_isolation RLS policy: read it in the
+            # token's organization (transaction-local, not left on the pooled connection)
+            await conn.execute(
+                "SELECT set_config('app.current_org_id', $1, true)",
+                str(row["organization_id"])
+            )
+            user = await conn.fetchrow(
+                """
+                SELECT role, email, status FROM "user" WHERE id = $1
+                """,
+                row["user_id"]
+            )
+
+            if row["rotated_at"] is not None or user is None or user["status"] != "active":
+                revoke_family = row["family_id"]
+                await _revoke_family(conn, revoke_family)
+            else:
+                await conn.execute(
+                    """
+                    UPDATE refresh_token SET rotated_at = NOW() WHERE id = $1
+                    """,
+                    row["id"]
+                )
+                new_refresh_token = await _insert_refresh_token(
+                    conn, row["user_id"], row["organization_id"], row["family_id"]
+                )
+
+    if revoke_family is not None:
+        logger.warning(f"Refresh token reuse or inactive user, revoked session {revoke_family}")
+        raise InvalidRefreshToken("Refresh token is no longer valid")
+
+    return _session_response({**dict(row), **dict(user)}, row["family_id"], new_refresh_token)
+
+
+async def revoke_session(family_id: UUID) -> None:
+    """Revoke a session: its refresh tokens and all access tokens issued for it"""
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            await _revoke_family(conn, family_id)
+
+
+async def revoke_session_by_refresh_token(refresh_token: str) -> bool:
+    """
+    Revoke the session a refresh token belongs to.
+
+    Returns:
+        True if the token was known
+    """
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            family_id = await conn.fetchval(
+                """
+                SELECT family_id FROM refresh_token WHERE token_hash = $1
+                """,
+                hash_refresh_token(refresh_token)
+            )
+            if family_id is None:
+                return False
+            await _revoke_family(conn, family_id)
+
+    return True
+
+
+async def revoke_access_token(jti: str, expires_at: float) -> None:
+    """
+    Revoke a single access token until its expiry.
+
+    Args:
+        jti: Token id claim
+        expires_at: Token exp claim (epoch seconds)
+    """
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            await _add_revocation(conn, jti_key(jti), datetime.fromtimestamp(expires_at, timezone.utc))
+
+
+async def _revoke_family(conn: asyncpg.Connection, family_id: UUID) -> None:
+    await conn.execute(
+        """
+        UPDATE refresh_token
+        SET revoked_at = NOW()
+        WHERE family_id = $1 AND revoked_at IS NULL
+        """,
+        family_id
+    )
+    await _add_revocation(conn, sid_key(str(family_id)), datetime.now(timezone.utc) + _session_revocation_ttl())
+
+
+async def _add_revocation(conn: asyncpg.Connection, key: str, expires_at: datetime) -> None:
+    """Store a revocation and announce it (pg_notify is delivered on commit)"""
+    await conn.execute(
+        """
+        INSERT INTO revoked_token (token_key, expires_at)
+        VALUES ($1, $2)
+        ON CONFLICT (token_key) DO UPDATE SET expires_at = GREATEST(revoked_token.expires_at, EXCLUDED.expires_at)
+        """,
+        key, expires_at
+    )
+    await conn.execute(
+        "SELECT pg_notify($1, $2)",
+        CHANNEL,
+        json.dumps({"key": key, "exp": expires_at.timestamp()})
+    )
+    # This worker doesn't wait for its own notification
+    revoked_tokens.add(key, expires_at.timestamp())
+
+
+async def load_revocations() -> int:
+    """
+    Merge all unexpired revocations into the in-memory list.
+
+    Revocations are never withdrawn, only expire, so merging is enough and
+    keeps those announced while the SELECT ran.
+
+    Returns:
+        Number of active revocations
+    """
+    async with db.tenant_db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT token_key, expires_at FROM revoked_token WHERE expires_at > NOW()
+            """
+        )
+
+    revoked_tokens.merge((row["token_key"], row["expires_at"].timestamp()) for row in rows)
+    return len(revoked_tokens)
+
+
+async def cleanup_expired_tokens() -> Dict[str, int]:
+    """
+    Delete expired revocations and refresh tokens.
+
+    Returns:
+        Dict with deleted revoked_tokens and refresh_tokens counts
+    """
+    async with db.tenant_db_pool.acquire() as conn:
+        revoked = await conn.execute("DELETE FROM revoked_token WHERE expires_at <= NOW()")
+        refresh = await conn.execute("DELETE FROM refresh_token WHERE expires_at <= NOW()")
+
+    revoked_tokens.prune()
+    return {
+        "revoked_tokens": int(revoked.split()[-1]),
+        "refresh_tokens": int(refresh.split()[-1])
+    }
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    try:
+        event = json.loads(payload)
+        revoked_tokens.add(event["key"], float(event["exp"]))
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Invalid token revocation notification: {e}")
+
+
+async def run_revocation_listener(retry_seconds: float = 5.0) -> None:
+    """
+    Background task: keep the revocation list in sync, forever.
+
+    Uses a dedicated connection (not from the pool). After every (re)connect
+    the full list is reloaded, so revocations missed while disconnected are
+    picked up. Expired tokens are cleaned up every CLEANUP_INTERVAL_SECONDS.
+    """
+    last_cleanup = 0.0
+
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(settings.database_tenant_url)
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _: closed.set())
+            await conn.add_listener(CHANNEL, _on_notification)
+            logger.info(f"Loaded {await load_revocations()} token revocations")
+
+            while not closed.is_set():
+                if time.monotonic() - last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+                    last_cleanup = time.monotonic()
+                    deleted = await cleanup_expired_tokens()
+                    if any(deleted.values()):
+                        logger.info(f"Deleted expired tokens: {deleted}")
+                try:
+                    await asyncio.wait_for(closed.wait(), timeout=CLEANUP_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+            logger.warning("Token revocation listener connection lost, reconnecting")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Token revocation listener failed: {e}")
+
+        finally:
+            if conn and not conn.is_closed():
+                await conn.close()
+
+        await asyncio.sleep(retry_seconds)
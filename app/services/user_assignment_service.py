@@ -4,11 +4,64 @@ User Assignment Service
 Handles user-campaign and user-contact assignments.
 """
 
-from typing import Optional, Dict, Any, List
+import heapq
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from uuid import UUID
 
+import asyncpg
+
 from app.core import db
+from app.core.pagination import decode_sort_cursor, encode_sort_cursor
+
+
+# Upper bound for ids / pairs per assignment call
+MAX_BATCH_SIZE = 10000
+
+
+def _summary(results: List[Dict[str, Any]], failed: List[Dict[str, Any]]) -> Dict[str, Any]:
+    created_count = sum(1 for item in results if item["outcome"] == "created")
+
+    return {
+        "success_count": len(results) - len(failed),
+        "created_count": created_count,
+        "updated_count": len(results) - len(failed) - created_count,
+        "failed_count": len(failed),
+        "results": results,
+        "failed": failed
+    }
+
+
+def _outcomes(rows: List[Any], id_fields: Tuple[str, ...], not_found: str) -> Dict[str, Any]:
+    """
+    Summarize per-item upsert rows into an assignment result.
+
+    Each row has the id_fields and "inserted": True for new rows, False for
+    updated rows and NULL for items that were not upserted.
+    """
+    results = []
+    failed = []
+
+    for row in rows:
+        item = {field: str(row[field]) for field in id_fields}
+        if row["inserted"] is None:
+            failed.append({**item, "error": not_found})
+            results.append({**item, "outcome": "failed", "error": not_found})
+        else:
+            results.append({**item, "outcome": "created" if row["inserted"] else "updated"})
+
+    return _summary(results, failed)
+
+
+def _all_failed(items: List[Dict[str, str]], error: str) -> Dict[str, Any]:
+    """Assignment result when the whole statement failed"""
+    failed = [{**item, "error": error} for item in items]
+    return _summary([{**item, "outcome": "failed"} for item in failed], failed)
+
+
+def _check_batch_size(count: int) -> None:
+    if count > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} assignments per request (got {count})")
 
 
 async def assign_user_to_campaigns(
@@ -24,6 +77,9 @@ async def assign_user_to_campaigns(
     """
     Assign a user to multiple campaigns.
 
+    One INSERT ... SELECT FROM unnest() for all campaigns. Campaigns that do
+    not exist in the organization are reported as failed.
+
     Args:
         user_id: User UUID to assign
         campaign_ids: List of campaign UUIDs
@@ -35,21 +91,32 @@ async def assign_user_to_campaigns(
         can_manage_contacts: Permission to manage contacts
 
     Returns:
-        Dict with success count and failed campaigns
-    """
-    success_count = 0
-    failed_campaigns = []
+        Dict with success/created/updated/failed counts, per-campaign results
+        and failed campaigns
 
-    async with db.tenant_db_pool.acquire() as conn:
-        for campaign_id in campaign_ids:
-            try:
-                await conn.execute(
-                    """
+    Raises:
+        ValueError: If more than MAX_BATCH_SIZE campaigns are given
+    """
+    _check_batch_size(len(campaign_ids))
+
+    try:
+        async with db.tenant_db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                WITH requested AS (
+                    SELECT DISTINCT ON (campaign_id) campaign_id, ord
+                    FROM unnest($2::uuid[]) WITH ORDINALITY AS t(campaign_id, ord)
+                    ORDER BY campaign_id, ord
+                ),
+                upserted AS (
                     INSERT INTO user_campaign_assignment (
                         user_id, campaign_id, organization_id, assigned_by,
                         role, can_edit, can_view_stats, can_manage_contacts,
                         status
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, 'active')
+                    )
+                    SELECT $1, r.campaign_id, $3, $4, $5, $6, $7, $8, 'active'
+                    FROM requested r
+                    JOIN campaign c ON c.id = r.campaign_id AND c.organization_id = $3
                     ON CONFLICT (user_id, campaign_id)
                     DO UPDATE SET
                         role = EXCLUDED.role,
@@ -58,22 +125,23 @@ async def assign_user_to_campaigns(
                         can_manage_contacts = EXCLUDED.can_manage_contacts,
                         status = 'active',
                         updated_at = NOW()
-                    """,
-                    user_id, campaign_id, organization_id, assigned_by,
-                    role, can_edit, can_view_stats, can_manage_contacts
+                    RETURNING campaign_id, (xmax = 0) as inserted
                 )
-                success_count += 1
-            except Exception as e:
-                failed_campaigns.append({
-                    "campaign_id": str(campaign_id),
-                    "error": str(e)
-                })
-
-    return {
-        "success_count": success_count,
-        "failed_count": len(failed_campaigns),
-        "failed_campaigns": failed_campaigns
-    }
+                SELECT r.campaign_id, u.inserted
+                FROM requested r
+                LEFT JOIN upserted u ON u.campaign_id = r.campaign_id
+                ORDER BY r.ord
+                """,
+                user_id, campaign_ids, organization_id, assigned_by,
+                role, can_edit, can_view_stats, can_manage_contacts
+            )
+    except asyncpg.PostgresError as e:
+        result = _all_failed([{"campaign_id": str(i)} for i in dict.fromkeys(campaign_ids)], str(e))
+    else:
+        result = _outcomes(rows, ("campaign_id",), "Campaign not found in organization")
+
+    result["failed_campaigns"] = result.pop("failed")
+    return result
 
 
 async def assign_contacts_to_user(
@@ -86,6 +154,9 @@ async def assign_contacts_to_user(
     """
     Assign multiple contacts to a user.
 
+    One INSERT ... SELECT FROM unnest() for all contacts. Contacts that do
+    not exist in the organization are reported as failed.
+
     Args:
         user_id: User UUID to assign contacts to
         contact_ids: List of contact UUIDs
@@ -94,41 +165,127 @@ async def assign_contacts_to_user(
         assignment_type: Type of assignment (manual, round_robin, lead_score, territory)
 
     Returns:
-        Dict with success count and failed contacts
-    """
-    success_count = 0
-    failed_contacts = []
+        Dict with success/created/updated/failed counts, per-contact results
+        and failed contacts
 
-    async with db.tenant_db_pool.acquire() as conn:
-        for contact_id in contact_ids:
-            try:
-                await conn.execute(
-                    """
+    Raises:
+        ValueError: If more than MAX_BATCH_SIZE contacts are given
+    """
+    _check_batch_size(len(contact_ids))
+
+    try:
+        async with db.tenant_db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                WITH requested AS (
+                    SELECT DISTINCT ON (contact_id) contact_id, ord
+                    FROM unnest($2::uuid[]) WITH ORDINALITY AS t(contact_id, ord)
+                    ORDER BY contact_id, ord
+                ),
+                upserted AS (
                     INSERT INTO user_contact_assignment (
                         user_id, contact_id, organization_id, assigned_by,
                         assignment_type, is_primary_owner, status
-                    ) VALUES ($1, $2, $3, $4, $5, true, 'active')
+                    )
+                    SELECT $1, r.contact_id, $3, $4, $5, true, 'active'
+                    FROM requested r
+                    JOIN contact ct ON ct.id = r.contact_id AND ct.organization_id = $3
                     ON CONFLICT (user_id, contact_id)
                     DO UPDATE SET
                         assignment_type = EXCLUDED.assignment_type,
                         status = 'active',
                         updated_at = NOW()
-                    """,
-                    user_id, contact_id, organization_id, assigned_by,
-                    assignment_type
+                    RETURNING contact_id, (xmax = 0) as inserted
                 )
-                success_count += 1
-            except Exception as e:
-                failed_contacts.append({
-                    "contact_id": str(contact_id),
-                    "error": str(e)
-                })
+                SELECT r.contact_id, u.inserted
+                FROM requested r
+                LEFT JOIN upserted u ON u.contact_id = r.contact_id
+                ORDER BY r.ord
+                """,
+                user_id, contact_ids, organization_id, assigned_by,
+                assignment_type
+            )
+    except asyncpg.PostgresError as e:
+        result = _all_failed([{"contact_id": str(i)} for i in dict.fromkeys(contact_ids)], str(e))
+    else:
+        result = _outcomes(rows, ("contact_id",), "Contact not found in organization")
+
+    result["failed_contacts"] = result.pop("failed")
+    return result
+
+
+async def bulk_assign_contacts(
+    assignments: List[Tuple[UUID, UUID]],
+    assigned_by: UUID,
+    organization_id: UUID,
+    assignment_type: str = "manual"
+) -> Dict[str, Any]:
+    """
+    Assign many (user, contact) pairs at once.
 
-    return {
-        "success_count": success_count,
-        "failed_count": len(failed_contacts),
-        "failed_contacts": failed_contacts
-    }
+    One INSERT ... SELECT FROM unnest(users, contacts). Pairs whose user or
+    contact does not belong to the organization are reported as failed.
+
+    Args:
+        assignments: List of (user_id, contact_id) pairs
+        assigned_by: User UUID who is making the assignment
+        organization_id: Organization UUID
+        assignment_type: Type of assignment (manual, round_robin, lead_score, territory)
+
+    Returns:
+        Dict with success/created/updated/failed counts, per-pair results
+        (in request order, duplicates removed) and failed pairs
+
+    Raises:
+        ValueError: If more than MAX_BATCH_SIZE pairs are given
+    """
+    _check_batch_size(len(assignments))
+
+    user_ids = [user_id for user_id, _ in assignments]
+    contact_ids = [contact_id for _, contact_id in assignments]
+
+    try:
+        async with db.tenant_db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                WITH requested AS (
+                    SELECT DISTINCT ON (user_id, contact_id) user_id, contact_id, ord
+                    FROM unnest($1::uuid[], $2::uuid[]) WITH ORDINALITY AS t(user_id, contact_id, ord)
+                    ORDER BY user_id, contact_id, ord
+                ),
+                upserted AS (
+                    INSERT INTO user_contact_assignment (
+                        user_id, contact_id, organization_id, assigned_by,
+                        assignment_type, is_primary_owner, status
+                    )
+                    SELECT r.user_id, r.contact_id, $3, $4, $5, true, 'active'
+                    FROM requested r
+                    JOIN "user" u ON u.id = r.user_id AND u.organization_id = $3
+                    JOIN contact ct ON ct.id = r.contact_id AND ct.organization_id = $3
+                    ON CONFLICT (user_id, contact_id)
+                    DO UPDATE SET
+                        assignment_type = EXCLUDED.assignment_type,
+                        status = 'active',
+                        updated_at = NOW()
+                    RETURNING user_id, contact_id, (xmax = 0) as inserted
+                )
+                SELECT r.user_id, r.contact_id, up.inserted
+                FROM requested r
+                LEFT JOIN upserted up ON up.user_id = r.user_id AND up.contact_id = r.contact_id
+                ORDER BY r.ord
+                """,
+                user_ids, contact_ids, organization_id, assigned_by, assignment_type
+            )
+    except asyncpg.PostgresError as e:
+        result = _all_failed([
+            {"user_id": str(user_id), "contact_id": str(contact_id)}
+            for user_id, contact_id in dict.fromkeys(assignments)
+        ], str(e))
+    else:
+        result = _outcomes(rows, ("user_id", "contact_id"), "User or contact not found in organization")
+
+    result["failed_assignments"] = result.pop("failed")
+    return result
 
 
 async def get_user_assignments(user_id: UUID) -> Dict[str, Any]:
@@ -196,41 +353,291 @@ async def get_user_assignments(user_id: UUID) -> Dict[str, Any]:
     }
 
 
+# Sort options for organization user listings: sort key expression and
+# the column it is returned as
+ORG_USER_SORTS = {
+    "created_at": ("u.created_at", "created_at"),
+    "contacts": ("COALESCE(l.active_contacts, 0)", "contacts_count"),
+    "campaigns": ("COALESCE(l.active_campaigns, 0)", "campaigns_count"),
+}
+
+
+def _org_users_query(sort: str, order: str, keyset: bool, limit: bool) -> str:
+    """
+    Listing query for organization users with assignment counts.
+
+    Counts come from the trigger-maintained user_assignment_load row (one
+    join per user) instead of counting assignments per user. Params: $1
+    organization_id, then ($2, $3) keyset sort value and id if keyset, then
+    the limit if limit.
+    """
+    if sort not in ORG_USER_SORTS:
+        raise ValueError(f"Invalid sort: {sort}. Must be one of {', '.join(ORG_USER_SORTS)}")
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Invalid order: {order}. Must be 'asc' or 'desc'")
+
+    sort_sql = ORG_USER_SORTS[sort][0]
+    keyset_sql = f"AND ({sort_sql}, u.id) {'<' if order == 'desc' else '>'} ($2, $3)" if keyset else ""
+    limit_sql = f"LIMIT ${4 if keyset else 2}" if limit else ""
+
+    return f"""
+        SELECT
+            u.id,
+            u.email,
+            u.first_name,
+            u.last_name,
+            u.role,
+            u.status,
+            u.created_at,
+            COALESCE(l.active_campaigns, 0) as campaigns_count,
+            COALESCE(l.active_contacts, 0) as contacts_count
+        FROM "user" u
+        LEFT JOIN user_assignment_load l ON l.user_id = u.id
+        WHERE u.organization_id = $1
+        {keyset_sql}
+        ORDER BY {sort_sql} {order.upper()}, u.id {order.upper()}
+        {limit_sql}
+    """
+
+
 async def get_organization_users_with_assignments(
-    organization_id: UUID
+    organization_id: UUID,
+    sort: str = "created_at",
+    order: str = "desc"
 ) -> List[Dict[str, Any]]:
     """
     Get all users in an organization with their assignment counts.
 
     Args:
         organization_id: Organization UUID
+        sort: created_at, contacts or campaigns
+        order: asc or desc
 
     Returns:
         List of users with assignment statistics
+
+    Raises:
+        ValueError: If sort or order is invalid
     """
+    sql = _org_users_query(sort, order, keyset=False, limit=False)
+
     async with db.tenant_db_pool.acquire() as conn:
         users = await conn.fetch(
-            """
-            SELECT
-                u.id,
-                u.email,
-                u.first_name,
-                u.last_name,
-                u.role,
-                u.status,
-                u.created_at,
-                get_user_campaign_count(u.id) as campaigns_count,
-                get_user_contact_count(u.id) as contacts_count
-            FROM "user" u
-            WHERE u.organization_id = $1
-            ORDER BY u.created_at DESC
-            """,
+            sql,
             organization_id
         )
 
     return [dict(row) for row in users]
 
 
+async def get_organization_users_page(
+    organization_id: UUID,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc"
+) -> Dict[str, Any]:
+    """
+    Get one page of organization users with assignment counts.
+
+    Keyset paginated on (sort key, id), so deep pages cost the same as the
+    first. Sort by "contacts" or "campaigns" to list users by workload.
+
+    Args:
+        organization_id: Organization UUID
+        limit: Max users per page
+        cursor: Cursor from the previous page (None for the first page)
+        sort: created_at, contacts or campaigns
+        order: asc or desc
+
+    Returns:
+        Dict with users and next_cursor (None on the last page)
+
+    Raises:
+        ValueError: If sort, order or cursor is invalid
+    """
+    params: List[Any] = [organization_id]
+    if cursor:
+        params.extend(decode_sort_cursor(cursor, sort))
+    params.append(limit)
+
+    sql = _org_users_query(sort, order, keyset=bool(cursor), limit=True)
+
+    async with db.tenant_db_pool.acquire() as conn:
+        rows = await conn.fetch(sql, *params)
+
+    users = [dict(row) for row in rows]
+    next_cursor = None
+    if len(users) == limit:
+        last = users[-1]
+        next_cursor = encode_sort_cursor(sort, last[ORG_USER_SORTS[sort][1]], last["id"])
+
+    return {
+        "users": users,
+        "next_cursor": next_cursor
+    }
+
+
+def plan_round_robin(
+    loads: List[Tuple[UUID, int, float]],
+    count: int
+) -> List[UUID]:
+    """
+    Pick users for `count` new contacts, weighted least-loaded first.
+
+    Each pick goes to the user with the lowest (active_contacts + 1) / weight,
+    ties broken by user id: under-loaded users catch up first and loads then
+    grow in proportion to the weights. The result is deterministic.
+
+    Args:
+        loads: (user_id, active_contacts, weight) per eligible user
+        count: Number of contacts to distribute
+
+    Returns:
+        User id per contact, in pick order (empty if there are no users)
+    """
+    heap = [((active + 1) / weight, str(user_id), user_id, active, weight) for user_id, active, weight in loads]
+    heapq.heapify(heap)
+
+    picks = []
+    for _ in range(count if heap else 0):
+        _, key, user_id, active, weight = heapq.heappop(heap)
+        picks.append(user_id)
+        active += 1
+        heapq.heappush(heap, ((active + 1) / weight, key, user_id, active, weight))
+
+    return picks
+
+
+async def distribute_contacts_round_robin(
+    contact_ids: List[UUID],
+    organization_id: UUID,
+    assigned_by: UUID
+) -> Dict[str, Any]:
+    """
+    Distribute contacts over the organization's active users (round-robin).
+
+    Runs in one transaction holding a per-organization advisory lock, so
+    concurrent distributions see each other's assignments. Loads come from
+    user_assignment_load (one row per user, maintained by triggers) and all
+    assignments are written with one INSERT ... SELECT FROM unnest().
+    Contacts that already have an active owner are skipped; contacts that
+    do not exist in the organization are reported as failed.
+
+    Args:
+        contact_ids: Contacts to assign
+        organization_id: Organization UUID
+        assigned_by: User UUID who triggered the assignment
+
+    Returns:
+        Dict with assignments ({contact_id, user_id}), skipped contacts
+        ({contact_id, user_id} of the existing owner), failed contacts
+        ({contact_id, error}) and counts
+
+    Raises:
+        ValueError: If more than MAX_BATCH_SIZE contacts are given
+    """
+    _check_batch_size(len(contact_ids))
+    contact_ids = list(dict.fromkeys(contact_ids))
+
+    async with db.tenant_db_pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "SELECT pg_advisory_xact_lock(hashtext('round_robin:' || $1::text))",
+                organization_id
+            )
+
+            # Key share lock: the contacts can't be deleted before the INSERT
+            found = await conn.fetch(
+                """
+                SELECT id
+                FROM contact
+                WHERE id = ANY($1::uuid[])
+                  AND organization_id = $2
+                FOR KEY SHARE
+                """,
+                contact_ids, organization_id
+            )
+            known = {row["id"] for row in found}
+            failed = [contact_id for contact_id in contact_ids if contact_id not in known]
+            contact_ids = [contact_id for contact_id in contact_ids if contact_id in known]
+
+            owned = await conn.fetch(
+                """
+                SELECT DISTINCT ON (uca.contact_id) uca.contact_id, uca.user_id
+                FROM user_contact_assignment uca
+                WHERE uca.contact_id = ANY($1::uuid[])
+                  AND uca.organization_id = $2
+                  AND uca.status = 'active'
+                ORDER BY uca.contact_id, uca.is_primary_owner DESC, uca.assigned_at
+                """,
+                contact_ids, organization_id
+            )
+            owners = {row["contact_id"]: row["user_id"] for row in owned}
+            unassigned = [contact_id for contact_id in contact_ids if contact_id not in owners]
+
+            loads = await conn.fetch(
+                """
+                SELECT
+                    u.id as user_id,
+                    COALESCE(l.active_contacts, 0) as active_contacts,
+                    COALESCE(l.round_robin_weight, 1) as weight
+                FROM "user" u
+                LEFT JOIN user_assignment_load l ON l.user_id = u.id
+                WHERE u.organization_id = $1
+                  AND u.status = 'active'
+                  AND u.role IN ('member', 'admin', 'owner')
+                """,
+                organization_id
+            )
+
+            picks = plan_round_robin(
+                [(row["user_id"], row["active_contacts"], float(row["weight"])) for row in loads],
+                len(unassigned)
+            )
+            assigned = list(zip(unassigned, picks))
+
+            if assigned:
+                await conn.execute(
+                    """
+                    INSERT INTO user_contact_assignment (
+                        user_id, contact_id, organization_id, assigned_by,
+                        assignment_type, is_primary_owner, status
+                    )
+                    SELECT t.user_id, t.contact_id, $3, $4, 'round_robin', true, 'active'
+                    FROM unnest($1::uuid[], $2::uuid[]) AS t(user_id, contact_id)
+                    ON CONFLICT (user_id, contact_id)
+                    DO UPDATE SET
+                        assignment_type = 'round_robin',
+                        status = 'active',
+                        updated_at = NOW()
+                    """,
+                    [user_id for _, user_id in assigned],
+                    [contact_id for contact_id, _ in assigned],
+                    organization_id,
+                    assigned_by
+                )
+
+    return {
+        "assigned_count": len(assigned),
+        "skipped_count": len(owners),
+        "unassigned_count": len(unassigned) - len(assigned),
+        "failed_count": len(failed),
+        "assignments": [
+            {"contact_id": str(contact_id), "user_id": str(user_id)}
+            for contact_id, user_id in assigned
+        ],
+        "skipped": [
+            {"contact_id": str(contact_id), "user_id": str(user_id)}
+            for contact_id, user_id in owners.items()
+        ],
+        "failed": [
+            {"contact_id": str(contact_id), "error": "Contact not found in organization"}
+            for contact_id in failed
+        ]
+    }
+
+
 async def auto_assign_contact_round_robin(
     contact_id: UUID,
     organization_id: UUID,
@@ -245,38 +652,72 @@ async def auto_assign_contact_round_robin(
         assigned_by: User UUID who triggered the assignment
 
     Returns:
-        User UUID who was assigned the contact, or None if no users available
+        User UUID who owns the contact (existing owner if already assigned),
+        or None if no users are available or the contact is not in the
+        organization
+    """
+    result = await distribute_contacts_round_robin([contact_id], organization_id, assigned_by)
+
+    owners = result["assignments"] or result["skipped"]
+    return UUID(owners[0]["user_id"]) if owners else None
+
+
+async def set_round_robin_weight(
+    user_id: UUID,
+    organization_id: UUID,
+    weight: float
+) -> bool:
     """
+    Set a user's round-robin weight (2.0 = twice the share of a 1.0 user).
+
+    Args:
+        user_id: User UUID
+        organization_id: Organization UUID of the user
+        weight: Positive weight
+
+    Returns:
+        True if set, False if the user doesn't belong to the organization
+
+    Raises:
+        ValueError: If weight is not positive
+    """
+    if weight <= 0:
+        raise ValueError("Weight must be positive")
+
     async with db.tenant_db_pool.acquire() as conn:
-        # Get next user via round-robin function
-        user_id = await conn.fetchval(
+        result = await conn.execute(
             """
-            SELECT get_next_user_round_robin($1)
+            INSERT INTO user_assignment_load (user_id, organization_id, round_robin_weight)
+            SELECT $1, $2, $3
+            WHERE EXISTS (SELECT 1 FROM "user" WHERE id = $1 AND organization_id = $2)
+            ON CONFLICT (user_id)
+            DO UPDATE SET round_robin_weight = EXCLUDED.round_robin_weight, updated_at = NOW()
+            WHERE user_assignment_load.organization_id = EXCLUDED.organization_id
             """,
-            organization_id
+            user_id, organization_id, weight
         )
 
-        if not user_id:
-            return None
+    return result != "INSERT 0 0"
 
-        # Assign contact to user
-        await conn.execute(
+
+async def rebuild_assignment_load(organization_id: Optional[UUID] = None) -> int:
+    """
+    Recount active contacts per user from user_contact_assignment.
+
+    Args:
+        organization_id: Limit to one organization (None = all)
+
+    Returns:
+        Number of users recounted
+    """
+    async with db.tenant_db_pool.acquire() as conn:
+        return await conn.fetchval(
             """
-            INSERT INTO user_contact_assignment (
-                user_id, contact_id, organization_id, assigned_by,
-                assignment_type, is_primary_owner, status
-            ) VALUES ($1, $2, $3, $4, 'round_robin', true, 'active')
-            ON CONFLICT (user_id, contact_id)
-            DO UPDATE SET
-                assignment_type = 'round_robin',
-                status = 'active',
-                updated_at = NOW()
+            SELECT rebuild_user_assignment_load($1)
             """,
-            user_id, contact_id, organization_id, assigned_by
+            organization_id
         )
 
-    return user_id
-
 
 async def remove_user_campaign_assignment(
     user_id: UUID,
@@ -4,12 +4,152 @@ Webhook Log Service
 Handles database operations for webhook logging and monitoring.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from datetime import datetime, timedelta
 import asyncpg
+import json
+import re
 from uuid import UUID
 
 from app.core import db
+from app.core.response_cache import invalidate_tags
+from app.integrations.instantly.schemas import InstantlyWebhookPayload
+from app.services import activity_feed_service
+
+
+# field:value, field:"quoted value", field:prefix*, field:* (dotted paths allowed)
+PAYLOAD_FIELD_TERM = re.compile(r'(?<!\S)([A-Za-z_][\w]*(?:\.[A-Za-z_][\w]*)*):("([^"]*)"|\S+)')
+
+# Accepted values for search_mode
+PAYLOAD_SEARCH_MODES = ("auto", "structured", "text")
+
+# Top-level payload fields auto mode recognizes in field:value terms
+PAYLOAD_FIELDS = frozenset(InstantlyWebhookPayload.model_fields)
+
+
+def _is_auto_field_term(path: str, value: str) -> bool:
+    # Plain searches like "https://acme.ch/x" or "note:call back" stay free text
+    return path.split(".")[0] in PAYLOAD_FIELDS and not value.startswith("//")
+
+
+def parse_payload_search(search: str, mode: str = "auto") -> Tuple[List[Tuple[str, str]], str]:
+    """
+    Split a webhook payload search into field terms and free text.
+
+    Args:
+        search: Search string, e.g. 'lead_email:max@beispiel.ch bounce_type:hard timeout'
+        mode: auto (terms on known payload fields, the rest is free text),
+            structured (field terms on any path only) or text
+
+    Returns:
+        ([(path, value), ...], remaining free text)
+
+    Raises:
+        ValueError: If mode is unknown or a structured search has no field terms
+    """
+    if mode not in PAYLOAD_SEARCH_MODES:
+        raise ValueError(f"Invalid search mode: {mode}")
+
+    if mode == "text":
+        return [], search.strip()
+
+    terms = []
+    free_parts = []
+    position = 0
+    for match in PAYLOAD_FIELD_TERM.finditer(search):
+        path, value = match.group(1), match.group(3) if match.group(3) is not None else match.group(2)
+        if mode == "auto" and not _is_auto_field_term(path, value):
+            continue
+        terms.append((path, value))
+        free_parts.append(search[position:match.start()])
+        position = match.end()
+    free_parts.append(search[position:])
+    free_text = " ".join(" ".join(free_parts).split())
+
+    if mode == "structured":
+        if not terms:
+            raise ValueError("Structured search needs at least one field:value term")
+        if free_text:
+            raise ValueError(f"Unexpected text in structured search: {free_text}")
+
+    return terms, free_text
+
+
+def build_payload_search_clauses(search: str, mode: str = "auto") -> List[Tuple[str, List[Any]]]:
+    """
+    Translate a payload search into SQL predicates on webhook_log.
+
+    Field terms are served by idx_webhook_log_payload_gin:
+    - field:value      -> payload @> {"field": "value"} (numbers/booleans also match typed)
+    - a.b:value        -> payload @> {"a": {"b": "value"}}
+    - field:*          -> payload @? '$.field' (field present)
+    - field:prefix*    -> payload @? '$.field ? (@ starts with "prefix")'
+    Remaining free text uses the trigram index on payload_text.
+
+    Args:
+        search: Search string
+        mode: auto, structured or text
+
+    Returns:
+        List of (clause, values); clauses use {0}, {1}... for their placeholders
+    """
+    terms, free_text = parse_payload_search(search, mode)
+    clauses = []
+
+    for path, value in terms:
+        keys = path.split(".")
+        jsonpath = "$" + "".join(f".{json.dumps(key)}" for key in keys)
+
+        if value == "*":
+            clauses.append(("wl.payload @? {0}::jsonpath", [jsonpath]))
+            continue
+
+        if value.endswith("*"):
+            prefix = json.dumps(value[:-1])
+            clauses.append((
+                "wl.payload @? {0}::jsonpath",
+                [f"{jsonpath} ? (@ starts with {prefix})"]
+            ))
+            continue
+
+        candidates = [_nest(keys, value)]
+        try:
+            typed = json.loads(value, parse_constant=_reject_constant)
+            is_scalar = not isinstance(typed, (str, dict, list))
+        except ValueError:
+            is_scalar = False
+        if is_scalar:
+            candidates.append(_nest(keys, typed))
+
+        if len(candidates) == 1:
+            clauses.append(("wl.payload @> {0}::jsonb", [json.dumps(candidates[0])]))
+        else:
+            clauses.append((
+                "(wl.payload @> {0}::jsonb OR wl.payload @> {1}::jsonb)",
+                [json.dumps(candidate) for candidate in candidates]
+            ))
+
+    if free_text:
+        clauses.append(("wl.payload_text ILIKE {0}", [f"%{_escape_like(free_text)}%"]))
+
+    return clauses
+
+
+def _nest(keys: List[str], value: Any) -> Dict[str, Any]:
+    """Build {"a": {"b": value}} from ["a", "b"]"""
+    for key in reversed(keys):
+        value = {key: value}
+    return value
+
+
+def _reject_constant(value: str) -> None:
+    """Refuse NaN/Infinity, which are not valid JSONB"""
+    raise ValueError(value)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so user input matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 async def create_webhook_log(
@@ -43,14 +183,14 @@ async def create_webhook_log(
         UUID of created webhook log
     """
     async with db.tenant_db_pool.acquire() as conn:
-        log_id = await conn.fetchval(
+        row = await conn.fetchrow(
             """
             INSERT INTO webhook_log (
                 event_type, event_source, campaign_id, contact_id,
                 organization_id, status, payload, error_message,
                 ip_address, user_agent, processed_at
             ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-            RETURNING id
+            RETURNING id, created_at
             """,
             event_type,
             event_source,
@@ -65,38 +205,41 @@ async def create_webhook_log(
             datetime.utcnow() if status == "success" else None
         )
 
-    return log_id
+        # Live dashboard feed; names come from the payload to avoid lookups
+        await activity_feed_service.publish_activity(
+            conn,
+            activity_feed_service.webhook_activity_event(
+                row["id"],
+                event_type,
+                event_source,
+                status,
+                row["created_at"],
+                organization_id=organization_id,
+                campaign_name=payload.get("campaign_name"),
+                contact_email=payload.get("lead_email")
+            )
+        )
 
+    await invalidate_tags("webhooks")
+    return row["id"]
 
-async def get_webhook_logs(
-    limit: int = 100,
-    offset: int = 0,
+
+def _build_webhook_log_where(
     event_type: Optional[str] = None,
     campaign_id: Optional[UUID] = None,
     status: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
     search: Optional[str] = None,
+    search_mode: str = "auto",
     organization_id: Optional[UUID] = None,
     user_role: str = "member"
-) -> Dict[str, Any]:
+) -> Tuple[str, List[Any]]:
     """
-    Get webhook logs with filters and pagination.
-
-    Args:
-        limit: Number of records to return
-        offset: Pagination offset
-        event_type: Filter by event type
-        campaign_id: Filter by campaign
-        status: Filter by status (success, failed, retrying)
-        date_from: Filter logs from this date
-        date_to: Filter logs until this date
-        search: Full-text search in payload
-        organization_id: Organization ID for RLS (customers)
-        user_role: User role (sb_admin, sb_operator, owner, admin, member)
+    Build the WHERE clause shared by webhook log listing and export.
 
     Returns:
-        Dict with logs and pagination info
+        (where_sql, params) with params numbered from $1
     """
     # Build WHERE clause dynamically
     where_clauses = []
@@ -135,12 +278,64 @@ async def get_webhook_logs(
         params.append(date_to)
 
     if search:
-        param_count += 1
-        where_clauses.append(f"wl.payload::text ILIKE ${param_count}")
-        params.append(f"%{search}%")
+        for clause, values in build_payload_search_clauses(search, search_mode):
+            placeholders = []
+            for value in values:
+                param_count += 1
+                placeholders.append(f"${param_count}")
+                params.append(value)
+            where_clauses.append(clause.format(*placeholders))
 
     where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
+    return where_sql, params
+
+
+async def get_webhook_logs(
+    limit: int = 100,
+    offset: int = 0,
+    event_type: Optional[str] = None,
+    campaign_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    search: Optional[str] = None,
+    organization_id: Optional[UUID] = None,
+    user_role: str = "member",
+    search_mode: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Get webhook logs with filters and pagination.
+
+    Args:
+        limit: Number of records to return
+        offset: Pagination offset
+        event_type: Filter by event type
+        campaign_id: Filter by campaign
+        status: Filter by status (success, failed, retrying)
+        date_from: Filter logs from this date
+        date_to: Filter logs until this date
+        search: Payload search, see build_payload_search_clauses
+        organization_id: Organization ID for RLS (customers)
+        user_role: User role (sb_admin, sb_operator, owner, admin, member)
+        search_mode: auto, structured or text
+
+    Returns:
+        Dict with logs and pagination info
+    """
+    where_sql, params = _build_webhook_log_where(
+        event_type=event_type,
+        campaign_id=campaign_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        search=search,
+        search_mode=search_mode,
+        organization_id=organization_id,
+        user_role=user_role
+    )
+    param_count = len(params)
+
     # Add limit and offset
     param_count += 1
     limit_param = param_count
@@ -198,6 +393,73 @@ async def get_webhook_logs(
     }
 
 
+async def stream_webhook_logs(
+    event_type: Optional[str] = None,
+    campaign_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    search: Optional[str] = None,
+    search_mode: str = "auto",
+    organization_id: Optional[UUID] = None,
+    user_role: str = "member",
+    batch_size: int = 1000
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream all webhook logs matching the filters, newest first.
+
+    Reads through a server-side cursor in batches of batch_size, so memory
+    stays constant however many rows match. Filters are the same as
+    get_webhook_logs. The connection is held until the generator finishes.
+
+    Yields:
+        Webhook log dicts with campaign and contact info
+    """
+    where_sql, params = _build_webhook_log_where(
+        event_type=event_type,
+        campaign_id=campaign_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        search=search,
+        search_mode=search_mode,
+        organization_id=organization_id,
+        user_role=user_role
+    )
+
+    async with db.tenant_db_pool.acquire() as conn:
+        # Server-side cursors only live inside a transaction
+        async with conn.transaction(readonly=True):
+            async for row in conn.cursor(
+                f"""
+                SELECT
+                    wl.id,
+                    wl.event_type,
+                    wl.event_source,
+                    wl.campaign_id,
+                    c.name as campaign_name,
+                    wl.contact_id,
+                    ct.email as contact_email,
+                    wl.organization_id,
+                    wl.status,
+                    wl.payload,
+                    wl.error_message,
+                    wl.retry_count,
+                    wl.last_retry_at,
+                    wl.created_at,
+                    wl.processed_at
+                FROM webhook_log wl
+                LEFT JOIN campaign c ON wl.campaign_id = c.id
+                LEFT JOIN contact ct ON wl.contact_id = ct.id
+                {where_sql}
+                ORDER BY wl.created_at DESC
+                """,
+                *params,
+                prefetch=batch_size
+            ):
+                yield dict(row)
+
+
 async def get_webhook_log_by_id(log_id: UUID) -> Optional[Dict[str, Any]]:
     """
     Get a single webhook log by ID.
@@ -249,19 +511,25 @@ async def retry_webhook_log(log_id: UUID) -> bool:
             log_id
         )
 
-    # Check if any row was updated
-    return result != "UPDATE 0"
+    if result == "UPDATE 0":
+        return False
+
+    await invalidate_tags("webhooks")
+    return True
 
 
 async def cleanup_old_webhook_logs(days_to_keep: int = 90) -> int:
     """
     Delete webhook logs older than specified days.
 
+    Drops monthly webhook_log partitions that lie entirely before the cutoff
+    (see partition_service), so retention is month-granular.
+
     Args:
         days_to_keep: Number of days to keep logs (default: 90)
 
     Returns:
-        Number of deleted logs
+        Estimated number of deleted logs
     """
     async with db.tenant_db_pool.acquire() as conn:
         deleted_count = await conn.fetchval(
@@ -271,6 +539,7 @@ async def cleanup_old_webhook_logs(days_to_keep: int = 90) -> int:
             days_to_keep
         )
 
+    await invalidate_tags("webhooks")
     return deleted_count
 
 
@@ -282,7 +551,7 @@ async def get_webhook_stats() -> Dict[str, Any]:
         Dict with webhook statistics
     """
     async with db.tenant_db_pool.acquire() as conn:
-        # Get stats from materialized view
+        # Get stats from view over org_hourly_webhook_stats
         stats = await conn.fetch(
             """
             SELECT * FROM webhook_log_stats
@@ -303,17 +572,30 @@ async def get_webhook_stats() -> Dict[str, Any]:
             """
         )
 
-        # Get overall stats
+        # Get overall stats (rollup totals, last hour via created_at index range)
         overall = await conn.fetchrow(
             """
             SELECT
-                COUNT(*) as total_logs,
-                COUNT(*) FILTER (WHERE status = 'success') as success_count,
-                COUNT(*) FILTER (WHERE status = 'failed') as failed_count,
-                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '1 hour') as last_hour,
-                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '24 hours') as last_24h,
-                ROUND(AVG(retry_count), 2) as avg_retry_count
-            FROM webhook_log
+                totals.total_logs,
+                totals.success_count,
+                totals.failed_count,
+                (
+                    SELECT COUNT(*) FROM webhook_log
+                    WHERE created_at >= NOW() - INTERVAL '1 hour'
+                ) as last_hour,
+                totals.last_24h,
+                totals.avg_retry_count
+            FROM (
+                SELECT
+                    COALESCE(SUM(log_count), 0) as total_logs,
+                    COALESCE(SUM(log_count) FILTER (WHERE status = 'success'), 0) as success_count,
+                    COALESCE(SUM(log_count) FILTER (WHERE status = 'failed'), 0) as failed_count,
+                    COALESCE(SUM(log_count) FILTER (
+                        WHERE bucket >= date_trunc('hour', NOW() - INTERVAL '24 hours')
+                    ), 0) as last_24h,
+                    ROUND(SUM(retry_count_sum)::numeric / NULLIF(SUM(log_count), 0), 2) as avg_retry_count
+                FROM org_hourly_webhook_stats
+            ) totals
             """
         )
 
@@ -342,6 +624,7 @@ async def get_recent_webhook_activity(limit: int = 50) -> List[Dict[str, Any]]:
                 wl.event_type,
                 wl.event_source,
                 wl.status,
+                wl.organization_id,
                 c.name as campaign_name,
                 ct.email as contact_email,
                 wl.created_at
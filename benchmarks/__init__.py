@@ -0,0 +1 @@
+# Benchmarks (require a running PostgreSQL)
@@ -0,0 +1,154 @@
+"""
+Benchmark: columnar (Parquet / Arrow) vs CSV export of webhook_log
+
+Seeds a scratch schema with synthetic webhook logs and compares output
+size and wall time of the streaming CSV export path
+(webhook_log_service.stream_webhook_logs + iter_csv, plain and gzip) with
+columnar_export_service.stream_export (Parquet and Arrow IPC).
+
+Usage:
+    python -m benchmarks.bench_columnar_export --rows 1000000
+
+Requires pyarrow.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+import asyncpg
+
+from app.core import db
+from app.core.config import settings
+from app.core.streaming import gzip_chunks, iter_csv
+from app.services import columnar_export_service, webhook_log_service
+from benchmarks.common import create_bench_pool, reset_schema, timed
+
+SCHEMA = "bench_columnar_export"
+
+CSV_FIELDS = [
+    "id", "event_type", "event_source", "campaign_id", "campaign_name",
+    "contact_id", "contact_email", "organization_id", "status", "payload",
+    "error_message", "retry_count", "last_retry_at", "created_at", "processed_at"
+]
+
+
+async def create_tables(conn: asyncpg.Connection) -> None:
+    """Minimal copies of the tables the exports read"""
+    await conn.execute("""
+        CREATE TABLE contact (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), email TEXT);
+        CREATE TABLE campaign (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), name TEXT);
+        CREATE TABLE webhook_log (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            event_type VARCHAR(100) NOT NULL,
+            event_source VARCHAR(50) DEFAULT 'instantly',
+            campaign_id UUID,
+            contact_id UUID,
+            organization_id UUID,
+            status VARCHAR(20) NOT NULL DEFAULT 'success',
+            retry_count INT DEFAULT 0,
+            last_retry_at TIMESTAMPTZ,
+            payload JSONB NOT NULL,
+            error_message TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            processed_at TIMESTAMPTZ,
+            ip_address INET,
+            user_agent TEXT
+        );
+    """)
+
+
+async def seed_webhook_logs(conn: asyncpg.Connection, rows: int, org_ids: list) -> None:
+    """Insert `rows` synthetic webhook logs spread over org_ids"""
+    batch = 100_000
+    for start in range(0, rows, batch):
+        await conn.execute("""
+            INSERT INTO webhook_log (
+                event_type, organization_id, status, retry_count, payload,
+                error_message, created_at, processed_at, ip_address, user_agent
+            )
+            SELECT
+                (ARRAY['email_sent', 'email_opened', 'reply_received', 'email_bounced'])[1 + g % 4],
+                ($3::uuid[])[1 + g % array_length($3::uuid[], 1)],
+                CASE WHEN g % 50 = 0 THEN 'failed' ELSE 'success' END,
+                CASE WHEN g % 50 = 0 THEN 1 + g % 3 ELSE 0 END,
+                jsonb_build_object(
+                    'event_type', 'email_sent',
+                    'lead_email', 'lead' || g || '@example.com',
+                    'campaign_id', 'camp-' || (g % 200),
+                    'timestamp', NOW() - (g % 525600) * INTERVAL '1 minute'
+                ),
+                CASE WHEN g % 50 = 0 THEN 'Campaign not found' END,
+                NOW() - (g % 525600) * INTERVAL '1 minute',
+                NOW() - (g % 525600) * INTERVAL '1 minute' + INTERVAL '40 milliseconds',
+                ('10.0.' || (g % 250) || '.' || (g % 200))::inet,
+                'Instantly-Webhooks/1.0'
+            FROM generate_series($1::int, $2::int) g
+        """, start + 1, min(start + batch, rows), org_ids)
+
+
+async def measure(label: str, chunks) -> None:
+    """Drain an export stream and print its size and duration"""
+    started = time.perf_counter()
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<16} {size / 1024 / 1024:>9.1f} MB  {elapsed:>7.2f}s")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=settings.database_tenant_url)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--orgs", type=int, default=10)
+    parser.add_argument("--row-group-size", type=int, default=50_000)
+    parser.add_argument("--reuse", action="store_true", help="Reuse previously seeded data")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    if not columnar_export_service.pyarrow_available():
+        print("[FAIL] pyarrow is not installed")
+        return 1
+
+    conn = await asyncpg.connect(args.dsn, server_settings={"search_path": f"{SCHEMA},public"})
+    org_ids = [uuid.uuid5(uuid.NAMESPACE_DNS, f"bench-org-{i}") for i in range(args.orgs)]
+
+    try:
+        if not args.reuse:
+            await reset_schema(conn, SCHEMA)
+            await create_tables(conn)
+            with timed(f"seed {args.rows:,} webhook logs"):
+                await seed_webhook_logs(conn, args.rows, org_ids)
+            with timed("analyze"):
+                await conn.execute("ANALYZE webhook_log")
+
+        db.tenant_db_pool = await create_bench_pool(args.dsn, SCHEMA, min_size=1, max_size=1)
+
+        print(f"{'format':<16} {'size':>12}  {'time':>8}")
+
+        await measure("csv", iter_csv(
+            webhook_log_service.stream_webhook_logs(user_role="sb_admin"), CSV_FIELDS
+        ))
+        await measure("csv.gz", gzip_chunks(iter_csv(
+            webhook_log_service.stream_webhook_logs(user_role="sb_admin"), CSV_FIELDS
+        )))
+        for format in columnar_export_service.EXPORT_FORMATS:
+            await measure(format, columnar_export_service.stream_export(
+                "webhook_log", format, row_group_size=args.row_group_size
+            ))
+
+        return 0
+
+    finally:
+        if db.tenant_db_pool:
+            await db.tenant_db_pool.close()
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,68 @@
+"""
+Benchmark: dashboard stats latency under concurrent admin users
+
+Read-only; runs against an existing, migrated tenant database. Simulates
+--users admins polling /api/admin/dashboard/stats and compares the
+uncached single-statement query (dashboard_service.fetch_dashboard_stats)
+with the cached path (dashboard_service.get_dashboard_stats).
+
+Usage:
+    python -m benchmarks.bench_dashboard_stats --users 50 --requests 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import asyncpg
+
+from app.core import db
+from app.core.config import settings
+from app.services import dashboard_service
+from benchmarks.common import print_summary, summarize_ms
+
+
+async def run_users(fetch, users: int, requests: int, interval: float) -> list:
+    """Run `users` concurrent pollers, each issuing `requests` calls"""
+    samples = []
+
+    async def user():
+        for _ in range(requests):
+            started = time.perf_counter()
+            await fetch()
+            samples.append(time.perf_counter() - started)
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(*(user() for _ in range(users)))
+    return samples
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=settings.database_tenant_url)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between polls per user")
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+
+    db.tenant_db_pool = await asyncpg.create_pool(args.dsn, min_size=args.pool_size, max_size=args.pool_size)
+
+    try:
+        await dashboard_service.fetch_dashboard_stats()
+
+        uncached = await run_users(dashboard_service.fetch_dashboard_stats, args.users, args.requests, args.interval)
+        print_summary("uncached (one statement)", summarize_ms(uncached))
+
+        cached = await run_users(dashboard_service.get_dashboard_stats, args.users, args.requests, args.interval)
+        print_summary("cached (ttl + swr)", summarize_ms(cached))
+
+        return 0
+
+    finally:
+        await db.tenant_db_pool.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
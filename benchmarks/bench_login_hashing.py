@@ -0,0 +1,92 @@
+"""
+Benchmark: event-loop latency under concurrent logins
+
+No database needed. Runs --logins concurrent bcrypt verifications, once
+inline on the event loop (the old /auth/login behaviour) and once on the
+password hash pool (verify_password_async). Meanwhile a probe task
+sleeps for --probe-ms in a loop and records how late it wakes up. That
+delay is what every other request on the worker (e.g. webhooks) waits
+on top of its own work.
+
+Usage:
+    python -m benchmarks.bench_login_hashing --logins 50 --workers 4
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.core.security import PasswordHasher, PasswordHasherBusy, hash_password, password_hasher, verify_password
+from benchmarks.common import print_summary, summarize_ms
+
+
+async def probe_loop_lag(stop: asyncio.Event, interval: float) -> list:
+    """Sample how much later than requested the event loop wakes a sleeper"""
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run_logins(verify, logins: int, password: str, hashed: str, interval: float):
+    """Run `logins` concurrent verifications while probing loop lag"""
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(stop, interval))
+    samples = []
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        started = time.perf_counter()
+        try:
+            assert await verify(password, hashed)
+        except PasswordHasherBusy:
+            rejected += 1
+            return
+        samples.append(time.perf_counter() - started)
+
+    # Let the probe take a baseline sample first
+    await asyncio.sleep(interval * 2)
+    await asyncio.gather(*(login() for _ in range(logins)))
+    stop.set()
+    return samples, await probe, rejected
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=password_hasher.workers)
+    parser.add_argument("--max-waiting", type=int, default=password_hasher.max_waiting)
+    parser.add_argument("--probe-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    password = "correct horse battery staple"
+    hashed = hash_password(password)
+    interval = args.probe_ms / 1000
+
+    async def inline(plain, hashed_password):
+        return verify_password(plain, hashed_password)
+
+    hasher = PasswordHasher(workers=args.workers, max_waiting=args.max_waiting)
+
+    async def pooled(plain, hashed_password):
+        return await hasher.run(verify_password, plain, hashed_password)
+
+    try:
+        for label, verify in (("inline (blocking)", inline), (f"pool ({args.workers} workers)", pooled)):
+            samples, lags, rejected = await run_logins(verify, args.logins, password, hashed, interval)
+            print_summary(f"{label} login", summarize_ms(samples))
+            print_summary(f"{label} loop lag", summarize_ms(lags))
+            if rejected:
+                print(f"{label}: {rejected} logins rejected (busy)")
+    finally:
+        hasher.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,169 @@
+"""
+Benchmark: MessageService.search_messages at 1M+ messages
+
+Seeds a scratch schema with synthetic messages, applies
+sql/migration_phase4_message_search.sql to it and times the real
+MessageService.search_messages code path.
+
+Usage:
+    python -m benchmarks.bench_message_search --rows 1000000 --budget-ms 100
+
+Exits with status 1 if p95 latency exceeds --budget-ms.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import asyncpg
+
+from app.core import db
+from app.core.config import settings
+from app.services.message_service import MessageService
+from benchmarks.common import (
+    create_bench_pool,
+    print_summary,
+    reset_schema,
+    summarize_ms,
+    timed,
+)
+
+SCHEMA = "bench_message_search"
+MIGRATION = Path(__file__).resolve().parent.parent / "sql" / "migration_phase4_message_search.sql"
+
+VOCABULARY = [
+    "meeting", "demo", "pricing", "follow", "proposal", "contract", "angebot",
+    "termin", "rückfrage", "webinar", "integration", "onboarding", "budget",
+    "quarter", "renewal", "security", "invoice", "partnership", "feedback",
+    "introduction", "schedule", "interested", "unsubscribe", "vertrag",
+    "salesbrain", "pipeline", "campaign", "outreach", "workshop", "kickoff",
+]
+DOMAINS = ["acme.ch", "beispiel.ch", "example.com", "test-gmbh.ch", "startup.io"]
+
+
+async def create_tables(conn: asyncpg.Connection) -> None:
+    """Minimal copies of the tables search_messages reads"""
+    await conn.execute("""
+        CREATE TABLE contact (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), email TEXT);
+        CREATE TABLE campaign (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), name TEXT);
+        CREATE TABLE message (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            organization_id UUID NOT NULL,
+            contact_id UUID,
+            campaign_id UUID,
+            from_email TEXT,
+            to_email TEXT,
+            subject TEXT,
+            body TEXT,
+            event_type TEXT,
+            created_at TIMESTAMPTZ DEFAULT NOW()
+        );
+    """)
+
+
+async def seed_messages(conn: asyncpg.Connection, rows: int, org_ids: list) -> None:
+    """Insert `rows` synthetic messages spread over org_ids"""
+    batch = 100_000
+    for start in range(0, rows, batch):
+        await conn.execute("""
+            INSERT INTO message (
+                organization_id, from_email, to_email, subject, body,
+                event_type, created_at
+            )
+            SELECT
+                ($3::uuid[])[1 + g % array_length($3::uuid[], 1)],
+                'sender' || (g % 5000) || '@' || ($4::text[])[1 + g % array_length($4::text[], 1)],
+                'lead' || g || '@' || ($4::text[])[1 + (g / 7) % array_length($4::text[], 1)],
+                (SELECT string_agg(($5::text[])[1 + floor(random() * array_length($5::text[], 1))::int], ' ')
+                 FROM generate_series(1, 4) WHERE g > 0),
+                (SELECT string_agg(($5::text[])[1 + floor(random() * array_length($5::text[], 1))::int], ' ')
+                 FROM generate_series(1, 60) WHERE g > 0),
+                (ARRAY['email_sent', 'email_opened', 'reply_received', 'email_bounced'])[1 + g % 4],
+                NOW() - (g % 525600) * INTERVAL '1 minute'
+            FROM generate_series($1::int, $2::int) g
+        """, start + 1, min(start + batch, rows), org_ids, DOMAINS, VOCABULARY)
+
+
+def sample_queries(count: int) -> list:
+    """Mix of prefix, multi-word and email-fragment queries"""
+    rng = random.Random(42)
+    queries = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            word = rng.choice(VOCABULARY)
+            queries.append(word[:max(3, len(word) - 2)])
+        elif kind == 1:
+            queries.append(" ".join(rng.sample(VOCABULARY, 2)))
+        else:
+            queries.append(f"lead{rng.randint(1, 999_999)}")
+    return queries
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=settings.database_tenant_url)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--orgs", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--reuse", action="store_true", help="Reuse previously seeded data")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(args.dsn, server_settings={"search_path": f"{SCHEMA},public"})
+    org_ids = [uuid.uuid5(uuid.NAMESPACE_DNS, f"bench-org-{i}") for i in range(args.orgs)]
+
+    try:
+        if not args.reuse:
+            await reset_schema(conn, SCHEMA)
+            await create_tables(conn)
+            with timed(f"seed {args.rows:,} messages"):
+                await seed_messages(conn, args.rows, org_ids)
+            with timed("apply search migration"):
+                await conn.execute(MIGRATION.read_text(encoding="utf-8"))
+            with timed("analyze"):
+                await conn.execute("ANALYZE message")
+
+        db.tenant_db_pool = await create_bench_pool(args.dsn, SCHEMA, min_size=1, max_size=1)
+
+        # Warm-up so the first samples don't measure cold buffers
+        for query in sample_queries(20):
+            await MessageService.search_messages(org_ids[0], query, limit=args.limit)
+
+        samples = []
+        hits = 0
+        for i, query in enumerate(sample_queries(args.queries)):
+            started = time.perf_counter()
+            rows = await MessageService.search_messages(
+                org_ids[i % len(org_ids)], query, limit=args.limit
+            )
+            samples.append(time.perf_counter() - started)
+            hits += len(rows)
+
+        summary = summarize_ms(samples)
+        print_summary(f"search_messages ({args.rows:,} rows)", summary)
+        print(f"[bench] avg results per query: {hits / max(1, len(samples)):.1f}")
+
+        if summary["p95_ms"] > args.budget_ms:
+            print(f"[FAIL] p95 {summary['p95_ms']}ms exceeds budget {args.budget_ms}ms")
+            return 1
+
+        print(f"[OK] p95 within {args.budget_ms}ms budget")
+        return 0
+
+    finally:
+        if db.tenant_db_pool:
+            await db.tenant_db_pool.close()
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,75 @@
+"""
+Benchmark: cold start (import + lifespan) of the API
+
+Starts --runs fresh interpreters. Each one imports app.main, enters the
+application lifespan (database pools, background tasks) and exits it,
+timing both phases. Exits with status 1 if the median import + lifespan
+time exceeds --threshold-ms, so it can gate deploys of autoscaled workers.
+
+The lifespan needs a reachable database; use --no-lifespan to time the
+import alone.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5 --threshold-ms 2500
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.common import print_summary, summarize_ms
+
+CHILD = """
+import asyncio, json, sys, time
+
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def lifespan():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(lifespan()) if sys.argv[1] == "1" else imported
+print(json.dumps({"import": imported - started, "lifespan": ready - imported}))
+"""
+
+
+def run_child(with_lifespan: bool) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, "1" if with_lifespan else "0"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--threshold-ms", type=float, default=2500)
+    parser.add_argument("--no-lifespan", action="store_true", help="Only time the import")
+    args = parser.parse_args()
+
+    runs = [run_child(not args.no_lifespan) for _ in range(args.runs)]
+    imports = [run["import"] for run in runs]
+    lifespans = [run["lifespan"] for run in runs]
+    totals = summarize_ms([run["import"] + run["lifespan"] for run in runs])
+
+    print_summary("import app.main", summarize_ms(imports))
+    if not args.no_lifespan:
+        print_summary("lifespan startup", summarize_ms(lifespans))
+    print_summary("total", totals)
+
+    if totals["p50_ms"] > args.threshold_ms:
+        print(f"[bench] FAIL: median startup {totals['p50_ms']}ms exceeds {args.threshold_ms}ms")
+        return 1
+
+    print(f"[bench] OK: median startup within {args.threshold_ms}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Benchmark: per-request bearer token authentication overhead
+
+No database needed. Calls the get_current_user dependency --requests times
+with one token (a dashboard client polling), with the verified-token cache
+disabled and enabled, for every JWT backend that is installed.
+
+Usage:
+    python -m benchmarks.bench_token_auth --requests 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth, security
+from app.core.security import create_access_token
+from benchmarks.common import print_summary, summarize_ms
+
+
+async def run_requests(credentials: HTTPAuthorizationCredentials, requests: int) -> list:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await auth.get_current_user(credentials)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def available_backends() -> list:
+    backends = [security._JoseBackend()]
+    try:
+        backends.append(security._PyJWTBackend())
+    except ImportError:
+        print("[bench] PyJWT not installed, skipping the pyjwt backend")
+    return backends
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token({
+        "user_id": "00000000-0000-0000-0000-000000000001",
+        "organization_id": "00000000-0000-0000-0000-000000000002",
+        "role": "admin",
+        "email": "bench@example.com"
+    })
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    original_backend, original_cache = security._backend, auth.token_cache
+
+    try:
+        for backend in available_backends():
+            security._backend = backend
+
+            auth.token_cache = auth.VerifiedTokenCache(max_entries=0)
+            print_summary(f"{backend.name} uncached", summarize_ms(await run_requests(credentials, args.requests)))
+
+            auth.token_cache = auth.VerifiedTokenCache()
+            print_summary(f"{backend.name} cached", summarize_ms(await run_requests(credentials, args.requests)))
+    finally:
+        security._backend, auth.token_cache = original_backend, original_cache
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
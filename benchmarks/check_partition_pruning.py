@@ -0,0 +1,107 @@
+"""
+Check: time-window queries prune partitions
+
+Runs EXPLAIN (FORMAT JSON) for the time-filtered queries the API issues
+against webhook_log, message and event_log and counts the monthly
+partitions each plan still scans. The <table>_default partition is always
+scanned for open-ended ranges; it stays empty in normal operation.
+
+Usage:
+    python -m benchmarks.check_partition_pruning [--dsn postgresql://...]
+
+Exits with status 1 if a query scans more monthly partitions than allowed.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+
+import asyncpg
+
+from app.core.config import settings
+
+# (name, table, query, max monthly partitions scanned)
+CHECKS = [
+    (
+        "dashboard webhooks last hour",
+        "webhook_log",
+        "SELECT COUNT(*) FROM webhook_log wl WHERE wl.created_at >= NOW() - INTERVAL '1 hour'",
+        2,
+    ),
+    (
+        "webhook stats recent failed",
+        "webhook_log",
+        """
+        SELECT id FROM webhook_log
+        WHERE status = 'failed' AND created_at >= NOW() - INTERVAL '24 hours'
+        ORDER BY created_at DESC LIMIT 10
+        """,
+        2,
+    ),
+    (
+        "webhook logs date range",
+        "webhook_log",
+        """
+        SELECT id FROM webhook_log wl
+        WHERE wl.created_at >= date_trunc('month', NOW()) AND wl.created_at <= NOW()
+        ORDER BY wl.created_at DESC LIMIT 100
+        """,
+        1,
+    ),
+    (
+        "messages last 24h",
+        "message",
+        "SELECT COUNT(*) FROM message WHERE created_at >= NOW() - INTERVAL '24 hours'",
+        2,
+    ),
+    (
+        "event log last 7 days",
+        "event_log",
+        "SELECT COUNT(*) FROM event_log WHERE created_at >= NOW() - INTERVAL '7 days'",
+        2,
+    ),
+]
+
+
+def scanned_relations(plan: dict) -> list:
+    """All relation names scanned anywhere in an EXPLAIN JSON plan"""
+    relations = []
+    if "Relation Name" in plan:
+        relations.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        relations.extend(scanned_relations(child))
+    return relations
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=settings.database_tenant_url)
+    args = parser.parse_args()
+
+    conn = await asyncpg.connect(args.dsn)
+    failures = 0
+
+    try:
+        for name, table, query, max_partitions in CHECKS:
+            raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {query}")
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+            monthly = re.compile(rf"^{table}_p\d{{6}}$")
+            partitions = sorted({rel for rel in scanned_relations(plan) if monthly.match(rel)})
+            ok = len(partitions) <= max_partitions
+            failures += 0 if ok else 1
+
+            status = "OK  " if ok else "FAIL"
+            print(f"[{status}] {name:<32} scans {len(partitions)} partition(s) (max {max_partitions}): "
+                  f"{', '.join(partitions) or '-'}")
+
+    finally:
+        await conn.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
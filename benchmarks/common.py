@@ -0,0 +1,66 @@
+"""
+Shared helpers for benchmark scripts
+
+Benchmarks run against a real PostgreSQL instance (DATABASE_TENANT_URL by
+default) and create their data in a dedicated schema, so they never touch
+application tables.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+import asyncpg
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (pct in 0-100)"""
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_ms(samples: List[float]) -> Dict[str, float]:
+    """Latency summary (milliseconds) for a list of samples in seconds"""
+    ms = [s * 1000 for s in samples]
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 2) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2) if ms else 0.0,
+    }
+
+
+def print_summary(title: str, summary: Dict[str, float]) -> None:
+    """Print a latency summary as one aligned line"""
+    fields = "  ".join(f"{key}={value}" for key, value in summary.items())
+    print(f"{title:<32} {fields}")
+
+
+@contextmanager
+def timed(label: str) -> Iterator[None]:
+    """Print how long a setup step took"""
+    started = time.perf_counter()
+    yield
+    print(f"[bench] {label}: {time.perf_counter() - started:.1f}s")
+
+
+async def reset_schema(conn: asyncpg.Connection, schema: str) -> None:
+    """Drop and recreate a scratch schema"""
+    await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {schema}")
+
+
+async def create_bench_pool(dsn: str, schema: str, **kwargs) -> asyncpg.Pool:
+    """Create a pool whose connections resolve tables in `schema` first"""
+    return await asyncpg.create_pool(
+        dsn,
+        server_settings={"search_path": f"{schema},public"},
+        **kwargs
+    )
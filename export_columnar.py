@@ -0,0 +1,65 @@
+"""
+Export message, event_log or webhook_log to Parquet / Arrow IPC
+
+Usage:
+    python export_columnar.py webhook_log webhook_log.parquet
+    python export_columnar.py message messages.arrow --format arrow --organization-id <uuid>
+    python export_columnar.py event_log events.parquet --date-from 2025-10-01 --date-to 2025-11-01
+
+Requires pyarrow.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from uuid import UUID
+
+import asyncpg
+
+from app.core import db
+from app.core.config import settings
+from app.services import columnar_export_service
+
+
+async def run_export(args):
+    """Export one table to a file"""
+    db.tenant_db_pool = await asyncpg.create_pool(settings.database_tenant_url, min_size=1, max_size=1)
+
+    try:
+        started = time.perf_counter()
+        result = await columnar_export_service.export_to_file(
+            args.output,
+            args.table,
+            args.format,
+            campaign_id=args.campaign_id,
+            organization_id=args.organization_id,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            row_group_size=args.row_group_size
+        )
+        elapsed = time.perf_counter() - started
+
+        print(f"Exported {args.table} to {result['path']} "
+              f"({result['bytes'] / 1024 / 1024:.1f} MB in {elapsed:.1f}s)")
+
+    finally:
+        await db.tenant_db_pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar export of message, event_log or webhook_log")
+    parser.add_argument("table", choices=columnar_export_service.EXPORT_TABLES)
+    parser.add_argument("output", help="Output file path")
+    parser.add_argument("--format", choices=columnar_export_service.EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--campaign-id", type=UUID)
+    parser.add_argument("--organization-id", type=UUID)
+    parser.add_argument("--date-from", type=datetime.fromisoformat)
+    parser.add_argument("--date-to", type=datetime.fromisoformat)
+    parser.add_argument("--row-group-size", type=int, default=50000)
+
+    asyncio.run(run_export(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+-- ============================================
+-- PHASE 4: ROUND-ROBIN DISTRIBUTION COUNTERS
+-- ============================================
+-- Migration Script for the contact distribution engine
+-- Created: 2026-10-19
+-- Purpose: Keep per-user active contact counts in user_assignment_load so
+--          round-robin picks read one row per user instead of counting
+--          every active user_contact_assignment on each call
+--
+-- Requires: migration_phase3_user_assignments.sql
+
+-- ============================================
+-- 1. LOAD TABLE
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS user_assignment_load (
+    user_id UUID PRIMARY KEY REFERENCES "user"(id) ON DELETE CASCADE,
+    organization_id UUID NOT NULL REFERENCES organization(id) ON DELETE CASCADE,
+
+    -- Maintained by triggers on user_contact_assignment
+    active_contacts BIGINT NOT NULL DEFAULT 0,
+
+    -- Share of round-robin contacts relative to other users (2 = twice as many)
+    round_robin_weight NUMERIC(6, 2) NOT NULL DEFAULT 1 CHECK (round_robin_weight > 0),
+
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_assignment_load_org ON user_assignment_load(organization_id);
+
+COMMENT ON TABLE user_assignment_load IS 'Per-user active contact counters and round-robin weights';
+
+-- ============================================
+-- 2. INCREMENTAL MAINTENANCE (statement-level triggers)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION maintain_user_assignment_load()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE user_assignment_load l
+        SET active_contacts = l.active_contacts - d.cnt,
+            updated_at = NOW()
+        FROM (
+            SELECT user_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE status = 'active'
+            GROUP BY user_id
+        ) d
+        WHERE l.user_id = d.user_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_assignment_load (user_id, organization_id, active_contacts)
+        SELECT user_id, MIN(organization_id::text)::uuid, COUNT(*)
+        FROM new_rows
+        WHERE status = 'active'
+        GROUP BY user_id
+        ON CONFLICT (user_id)
+        DO UPDATE SET
+            active_contacts = user_assignment_load.active_contacts + EXCLUDED.active_contacts,
+            updated_at = NOW();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_assignment_load_insert ON user_contact_assignment;
+DROP TRIGGER IF EXISTS user_assignment_load_update ON user_contact_assignment;
+DROP TRIGGER IF EXISTS user_assignment_load_delete ON user_contact_assignment;
+
+CREATE TRIGGER user_assignment_load_insert
+    AFTER INSERT ON user_contact_assignment
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_user_assignment_load();
+
+CREATE TRIGGER user_assignment_load_update
+    AFTER UPDATE ON user_contact_assignment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_user_assignment_load();
+
+CREATE TRIGGER user_assignment_load_delete
+    AFTER DELETE ON user_contact_assignment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_user_assignment_load();
+
+-- ============================================
+-- 3. RECONCILIATION
+-- ============================================
+
+-- Recount active contacts from user_contact_assignment (weights are kept).
+-- p_organization_id NULL = all organizations.
+CREATE OR REPLACE FUNCTION rebuild_user_assignment_load(p_organization_id UUID DEFAULT NULL)
+RETURNS INT AS $$
+DECLARE
+    v_count INT;
+BEGIN
+    LOCK TABLE user_contact_assignment IN SHARE MODE;
+
+    INSERT INTO user_assignment_load (user_id, organization_id, active_contacts)
+    SELECT u.id, u.organization_id, COUNT(uca.id)
+    FROM "user" u
+    LEFT JOIN user_contact_assignment uca ON uca.user_id = u.id AND uca.status = 'active'
+    WHERE p_organization_id IS NULL OR u.organization_id = p_organization_id
+    GROUP BY u.id, u.organization_id
+    ON CONFLICT (user_id)
+    DO UPDATE SET
+        organization_id = EXCLUDED.organization_id,
+        active_contacts = EXCLUDED.active_contacts,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION rebuild_user_assignment_load IS 'Recounts user_assignment_load.active_contacts from user_contact_assignment';
+
+-- Initial backfill
+SELECT rebuild_user_assignment_load();
+
+-- ============================================
+-- 4. ROUND-ROBIN PICK (reads counters)
+-- ============================================
+
+-- Same signature as phase 3: the eligible user with the lowest weighted load
+CREATE OR REPLACE FUNCTION get_next_user_round_robin(p_organization_id UUID)
+RETURNS UUID AS $$
+    SELECT u.id
+    FROM "user" u
+    LEFT JOIN user_assignment_load l ON l.user_id = u.id
+    WHERE u.organization_id = p_organization_id
+      AND u.status = 'active'
+      AND u.role IN ('member', 'admin', 'owner')
+    ORDER BY (COALESCE(l.active_contacts, 0) + 1) / COALESCE(l.round_robin_weight, 1), u.id
+    LIMIT 1;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_tables WHERE tablename = 'user_assignment_load') THEN
+        RAISE NOTICE '✅ user_assignment_load table created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Assignment Distribution migration completed';
+    RAISE NOTICE 'ℹ️  Tables created: 1';
+    RAISE NOTICE 'ℹ️  Triggers created: 3';
+    RAISE NOTICE 'ℹ️  Functions created: 3';
+END $$;
@@ -0,0 +1,87 @@
+-- ============================================
+-- PHASE 4: LOGIN LOOKUP FAST PATH
+-- ============================================
+-- Migration Script for /auth/login
+-- Created: 2026-10-19
+-- Purpose: Look users up by case-insensitive email from an index, without
+--          setting an RLS context (app.current_org_id) around the query
+--
+-- Note: Creating the unique index fails if two users' emails differ only
+--       in case. Resolve those first:
+--       SELECT lower(email), COUNT(*) FROM "user" GROUP BY 1 HAVING COUNT(*) > 1;
+
+-- ============================================
+-- 1. INDEXES
+-- ============================================
+
+-- Login: WHERE lower(email) = lower($1)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_email_lower ON "user"(lower(email));
+
+-- Redundant with the UNIQUE constraint index on "user"(email)
+DROP INDEX IF EXISTS idx_user_email;
+
+-- ============================================
+-- 2. LOOKUP FUNCTION
+-- ============================================
+
+-- Runs as the function owner, so the user_isolation RLS policy does not
+-- apply and callers need no org context. Returns password hashes: only the
+-- owner and the salesbrain_app role (section 3) may execute it.
+CREATE OR REPLACE FUNCTION auth_lookup_user(p_email TEXT)
+RETURNS TABLE (
+    id UUID,
+    organization_id UUID,
+    email TEXT,
+    password_hash TEXT,
+    role TEXT,
+    status TEXT,
+    first_name TEXT,
+    last_name TEXT
+) AS $$
+    SELECT u.id, u.organization_id, u.email, u.password_hash, u.role, u.status, u.first_name, u.last_name
+    FROM "user" u
+    WHERE lower(u.email) = lower(p_email);
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+REVOKE ALL ON FUNCTION auth_lookup_user(TEXT) FROM PUBLIC;
+
+COMMENT ON FUNCTION auth_lookup_user IS 'Login lookup by case-insensitive email (bypasses RLS)';
+
+-- ============================================
+-- 3. APPLICATION ROLE
+-- ============================================
+
+-- Group role allowed to run the lookup. The role the API connects as
+-- (DATABASE_TENANT_URL) must be a member unless it owns the function,
+-- i.e. ran this migration:
+--     GRANT salesbrain_app TO <api login role>;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT FROM pg_roles WHERE rolname = 'salesbrain_app') THEN
+        CREATE ROLE salesbrain_app NOLOGIN;
+    END IF;
+END $$;
+
+GRANT EXECUTE ON FUNCTION auth_lookup_user(TEXT) TO salesbrain_app;
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_indexes WHERE indexname = 'idx_user_email_lower') THEN
+        RAISE NOTICE '✅ idx_user_email_lower created successfully';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT FROM pg_auth_members m JOIN pg_roles r ON r.oid = m.roleid
+        WHERE r.rolname = 'salesbrain_app'
+    ) THEN
+        RAISE WARNING 'salesbrain_app has no members: GRANT salesbrain_app TO <api login role> unless the API connects as %', CURRENT_USER;
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Auth Lookup migration completed';
+    RAISE NOTICE 'ℹ️  Functions created: 1';
+    RAISE NOTICE 'ℹ️  Total indexes created: 1';
+END $$;
@@ -0,0 +1,258 @@
+-- ============================================
+-- PHASE 4: DASHBOARD ROLLUP TABLES
+-- ============================================
+-- Migration Script for incrementally maintained dashboard counters
+-- Created: 2026-10-19
+-- Purpose: /api/admin/dashboard/stats and webhook_log_stats read per-org,
+--          per-hour counters instead of aggregating message/webhook_log on
+--          every request
+
+-- ============================================
+-- 1. ROLLUP TABLES
+-- ============================================
+
+-- Messages per organization, hour and event type (email_sent, email_opened, ...)
+CREATE TABLE IF NOT EXISTS org_hourly_message_stats (
+    organization_id UUID NOT NULL,
+    bucket TIMESTAMPTZ NOT NULL, -- date_trunc('hour', created_at)
+    event_type VARCHAR(100) NOT NULL,
+    message_count BIGINT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (organization_id, bucket, event_type)
+);
+
+-- Webhook logs per organization, hour, event type, source and status
+-- organization_id uses the nil UUID for logs without an organization
+CREATE TABLE IF NOT EXISTS org_hourly_webhook_stats (
+    organization_id UUID NOT NULL,
+    bucket TIMESTAMPTZ NOT NULL,
+    event_type VARCHAR(100) NOT NULL,
+    event_source VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    log_count BIGINT NOT NULL DEFAULT 0,
+    retry_count_sum BIGINT NOT NULL DEFAULT 0,
+    last_received_at TIMESTAMPTZ,
+
+    PRIMARY KEY (organization_id, bucket, event_type, event_source, status)
+);
+
+-- Dashboard reads "last 24h" ranges across all organizations
+CREATE INDEX IF NOT EXISTS idx_org_hourly_message_stats_bucket ON org_hourly_message_stats(bucket DESC);
+CREATE INDEX IF NOT EXISTS idx_org_hourly_webhook_stats_bucket ON org_hourly_webhook_stats(bucket DESC);
+
+COMMENT ON TABLE org_hourly_message_stats IS 'Per-org hourly message counters, maintained by triggers on message';
+COMMENT ON TABLE org_hourly_webhook_stats IS 'Per-org hourly webhook log counters, maintained by triggers on webhook_log';
+
+-- ============================================
+-- 2. INCREMENTAL MAINTENANCE (statement-level triggers)
+-- ============================================
+-- One upsert per (org, hour, dimension) group per statement, in the same
+-- transaction as the insert, so counters are always consistent with the
+-- source rows.
+
+CREATE OR REPLACE FUNCTION rollup_message_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE org_hourly_message_stats s
+        SET message_count = s.message_count - d.cnt
+        FROM (
+            SELECT organization_id, date_trunc('hour', created_at) AS bucket,
+                   COALESCE(event_type, 'unknown') AS event_type, COUNT(*) AS cnt
+            FROM old_rows
+            GROUP BY 1, 2, 3
+        ) d
+        WHERE s.organization_id = d.organization_id
+          AND s.bucket = d.bucket
+          AND s.event_type = d.event_type;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO org_hourly_message_stats (organization_id, bucket, event_type, message_count)
+        SELECT organization_id, date_trunc('hour', created_at),
+               COALESCE(event_type, 'unknown'), COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2, 3
+        ON CONFLICT (organization_id, bucket, event_type)
+        DO UPDATE SET message_count = org_hourly_message_stats.message_count + EXCLUDED.message_count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rollup_webhook_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE org_hourly_webhook_stats s
+        SET log_count = s.log_count - d.cnt,
+            retry_count_sum = s.retry_count_sum - d.retries
+        FROM (
+            SELECT COALESCE(organization_id, '00000000-0000-0000-0000-000000000000'::UUID) AS organization_id,
+                   date_trunc('hour', created_at) AS bucket,
+                   event_type, COALESCE(event_source, 'unknown') AS event_source, status,
+                   COUNT(*) AS cnt, COALESCE(SUM(retry_count), 0) AS retries
+            FROM old_rows
+            GROUP BY 1, 2, 3, 4, 5
+        ) d
+        WHERE s.organization_id = d.organization_id
+          AND s.bucket = d.bucket
+          AND s.event_type = d.event_type
+          AND s.event_source = d.event_source
+          AND s.status = d.status;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO org_hourly_webhook_stats (
+            organization_id, bucket, event_type, event_source, status,
+            log_count, retry_count_sum, last_received_at
+        )
+        SELECT COALESCE(organization_id, '00000000-0000-0000-0000-000000000000'::UUID),
+               date_trunc('hour', created_at),
+               event_type, COALESCE(event_source, 'unknown'), status,
+               COUNT(*), COALESCE(SUM(retry_count), 0), MAX(created_at)
+        FROM new_rows
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (organization_id, bucket, event_type, event_source, status)
+        DO UPDATE SET
+            log_count = org_hourly_webhook_stats.log_count + EXCLUDED.log_count,
+            retry_count_sum = org_hourly_webhook_stats.retry_count_sum + EXCLUDED.retry_count_sum,
+            last_received_at = GREATEST(org_hourly_webhook_stats.last_received_at, EXCLUDED.last_received_at);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS message_stats_insert ON message;
+DROP TRIGGER IF EXISTS message_stats_update ON message;
+DROP TRIGGER IF EXISTS message_stats_delete ON message;
+
+CREATE TRIGGER message_stats_insert
+    AFTER INSERT ON message
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_message_stats();
+
+CREATE TRIGGER message_stats_update
+    AFTER UPDATE ON message
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_message_stats();
+
+CREATE TRIGGER message_stats_delete
+    AFTER DELETE ON message
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_message_stats();
+
+DROP TRIGGER IF EXISTS webhook_stats_insert ON webhook_log;
+DROP TRIGGER IF EXISTS webhook_stats_update ON webhook_log;
+DROP TRIGGER IF EXISTS webhook_stats_delete ON webhook_log;
+
+-- Status changes (failed -> retrying) and retry_count increments move counters
+CREATE TRIGGER webhook_stats_insert
+    AFTER INSERT ON webhook_log
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_webhook_stats();
+
+CREATE TRIGGER webhook_stats_update
+    AFTER UPDATE ON webhook_log
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_webhook_stats();
+
+CREATE TRIGGER webhook_stats_delete
+    AFTER DELETE ON webhook_log
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_webhook_stats();
+
+-- ============================================
+-- 3. REBUILD / RECONCILIATION
+-- ============================================
+
+-- Recompute the buckets in [p_from, p_to) from the source tables.
+-- Used for the initial backfill and as a periodic reconciliation job.
+-- SHARE locks block writers for the duration so the rebuild is consistent.
+CREATE OR REPLACE FUNCTION rebuild_dashboard_rollups(
+    p_from TIMESTAMPTZ DEFAULT '-infinity',
+    p_to TIMESTAMPTZ DEFAULT 'infinity'
+)
+RETURNS TABLE(message_buckets BIGINT, webhook_buckets BIGINT) AS $$
+DECLARE
+    v_message_buckets BIGINT;
+    v_webhook_buckets BIGINT;
+BEGIN
+    LOCK TABLE message, webhook_log IN SHARE MODE;
+
+    DELETE FROM org_hourly_message_stats WHERE bucket >= p_from AND bucket < p_to;
+    DELETE FROM org_hourly_webhook_stats WHERE bucket >= p_from AND bucket < p_to;
+
+    INSERT INTO org_hourly_message_stats (organization_id, bucket, event_type, message_count)
+    SELECT organization_id, date_trunc('hour', created_at), COALESCE(event_type, 'unknown'), COUNT(*)
+    FROM message
+    WHERE created_at >= p_from AND created_at < p_to
+    GROUP BY 1, 2, 3;
+
+    GET DIAGNOSTICS v_message_buckets = ROW_COUNT;
+
+    INSERT INTO org_hourly_webhook_stats (
+        organization_id, bucket, event_type, event_source, status,
+        log_count, retry_count_sum, last_received_at
+    )
+    SELECT COALESCE(organization_id, '00000000-0000-0000-0000-000000000000'::UUID),
+           date_trunc('hour', created_at),
+           event_type, COALESCE(event_source, 'unknown'), status,
+           COUNT(*), COALESCE(SUM(retry_count), 0), MAX(created_at)
+    FROM webhook_log
+    WHERE created_at >= p_from AND created_at < p_to
+    GROUP BY 1, 2, 3, 4, 5;
+
+    GET DIAGNOSTICS v_webhook_buckets = ROW_COUNT;
+
+    RETURN QUERY SELECT v_message_buckets, v_webhook_buckets;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION rebuild_dashboard_rollups IS 'Recomputes dashboard rollup buckets in [p_from, p_to) from message/webhook_log';
+
+-- Initial backfill
+SELECT * FROM rebuild_dashboard_rollups();
+
+-- ============================================
+-- 4. STATISTICS VIEW (reads rollups)
+-- ============================================
+
+-- Same columns as the phase 3 view; time windows are hour-granular
+DROP VIEW IF EXISTS webhook_log_stats;
+
+CREATE VIEW webhook_log_stats AS
+SELECT
+    event_type,
+    event_source,
+    status,
+    SUM(log_count)::BIGINT as total_count,
+    COALESCE(SUM(log_count) FILTER (WHERE bucket >= date_trunc('hour', NOW() - INTERVAL '1 hour')), 0)::BIGINT as last_hour,
+    COALESCE(SUM(log_count) FILTER (WHERE bucket >= date_trunc('hour', NOW() - INTERVAL '24 hours')), 0)::BIGINT as last_24h,
+    COALESCE(SUM(log_count) FILTER (WHERE status = 'failed'), 0)::BIGINT as failed_count,
+    SUM(retry_count_sum)::NUMERIC / NULLIF(SUM(log_count), 0) as avg_retry_count,
+    MAX(last_received_at) as last_received_at
+FROM org_hourly_webhook_stats
+GROUP BY event_type, event_source, status
+HAVING SUM(log_count) > 0;
+
+COMMENT ON VIEW webhook_log_stats IS 'Aggregated webhook statistics by event type and status (from org_hourly_webhook_stats)';
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_tables WHERE tablename = 'org_hourly_message_stats')
+       AND EXISTS (SELECT FROM pg_tables WHERE tablename = 'org_hourly_webhook_stats') THEN
+        RAISE NOTICE '✅ dashboard rollup tables created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Dashboard Rollups migration completed';
+    RAISE NOTICE 'ℹ️  Tables created: 2';
+    RAISE NOTICE 'ℹ️  Triggers created: 6';
+    RAISE NOTICE 'ℹ️  Functions created: 3';
+END $$;
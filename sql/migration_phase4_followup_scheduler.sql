@@ -0,0 +1,43 @@
+-- ============================================
+-- PHASE 4: FOLLOW-UP SCHEDULER
+-- ============================================
+-- Migration Script for the follow-up reminder scheduler
+-- Created: 2026-10-19
+-- Purpose: Let app/services/followup_service.py claim due follow-ups
+--          (next_followup_at <= now) in index order with SKIP LOCKED
+--
+-- Requires: migration_phase3_user_assignments.sql
+
+-- ============================================
+-- 1. COLUMNS
+-- ============================================
+
+-- Set when a reminder was dispatched (next_followup_at is cleared then)
+ALTER TABLE user_contact_assignment
+    ADD COLUMN IF NOT EXISTS followup_reminded_at TIMESTAMPTZ;
+
+-- ============================================
+-- 2. INDEXES
+-- ============================================
+
+-- Due scan: WHERE status = 'active' AND next_followup_at <= $2
+--           ORDER BY next_followup_at LIMIT $1 FOR UPDATE SKIP LOCKED
+-- Dispatched follow-ups drop out of the index, so it only holds pending ones.
+CREATE INDEX IF NOT EXISTS idx_user_contact_followup_due
+    ON user_contact_assignment(next_followup_at)
+    WHERE status = 'active' AND next_followup_at IS NOT NULL;
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_indexes WHERE indexname = 'idx_user_contact_followup_due') THEN
+        RAISE NOTICE '✅ idx_user_contact_followup_due created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Follow-up Scheduler migration completed';
+    RAISE NOTICE 'ℹ️  Columns added: 1';
+    RAISE NOTICE 'ℹ️  Total indexes created: 1';
+END $$;
@@ -0,0 +1,31 @@
+-- ============================================
+-- PHASE 4: MESSAGE KEYSET PAGINATION
+-- ============================================
+-- Migration Script for campaign message pagination
+-- Created: 2026-10-19
+-- Purpose: Serve /api/instantly/campaign/{id}/messages pages and NDJSON
+--          streams from an index instead of sorting + OFFSET
+
+-- ============================================
+-- 1. INDEXES
+-- ============================================
+
+-- Keyset pagination: WHERE campaign_id = $1 AND (created_at, id) < ($2, $3)
+--                    ORDER BY created_at DESC, id DESC
+-- For large existing tables run it by hand with CREATE INDEX CONCURRENTLY.
+CREATE INDEX IF NOT EXISTS idx_message_campaign_created
+    ON message(campaign_id, created_at DESC, id DESC);
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_indexes WHERE indexname = 'idx_message_campaign_created') THEN
+        RAISE NOTICE '✅ idx_message_campaign_created created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Message Keyset migration completed';
+    RAISE NOTICE 'ℹ️  Total indexes created: 1';
+END $$;
@@ -0,0 +1,60 @@
+-- ============================================
+-- PHASE 4: MESSAGE FULL-TEXT SEARCH
+-- ============================================
+-- Migration Script for indexed message search
+-- Created: 2026-10-19
+-- Purpose: Replace the four-column ILIKE scan in MessageService.search_messages
+--          with a ranked tsvector search plus trigram email matching
+
+-- ============================================
+-- 1. EXTENSIONS
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;   -- email substring matching
+CREATE EXTENSION IF NOT EXISTS btree_gin WITH SCHEMA public; -- organization_id inside the GIN index
+
+-- ============================================
+-- 2. SEARCH VECTOR COLUMN
+-- ============================================
+
+-- Maintained by PostgreSQL on every insert/update, no trigger needed.
+-- 'simple' config: messages are German and English, so no stemming/stop words.
+-- Body is capped to stay well below the 1MB tsvector limit.
+ALTER TABLE message ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, COALESCE(subject, '')), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, LEFT(COALESCE(body, ''), 100000)), 'B')
+    ) STORED;
+
+COMMENT ON COLUMN message.search_vector IS 'Full-text search vector (subject weight A, body weight B)';
+
+-- ============================================
+-- 3. INDEXES
+-- ============================================
+
+-- Tenant-scoped full-text search: WHERE organization_id = $1 AND search_vector @@ query
+CREATE INDEX IF NOT EXISTS idx_message_search_vector
+    ON message USING gin(organization_id, search_vector);
+
+-- Email substring search: from_email ILIKE '%q%' / to_email ILIKE '%q%'
+CREATE INDEX IF NOT EXISTS idx_message_from_email_trgm
+    ON message USING gin(from_email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_message_to_email_trgm
+    ON message USING gin(to_email gin_trgm_ops);
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT FROM information_schema.columns
+        WHERE table_name = 'message' AND column_name = 'search_vector'
+    ) THEN
+        RAISE NOTICE '✅ message.search_vector created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Message Search migration completed';
+    RAISE NOTICE 'ℹ️  Total indexes created: 3';
+END $$;
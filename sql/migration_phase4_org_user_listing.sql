@@ -0,0 +1,161 @@
+-- ============================================
+-- PHASE 4: ORGANIZATION USER LISTING
+-- ============================================
+-- Migration Script for /api/admin/users listings
+-- Created: 2026-10-19
+-- Purpose: Serve users with campaign and contact counts from the maintained
+--          user_assignment_load counters (one join per user) instead of
+--          get_user_campaign_count() / get_user_contact_count() per row,
+--          with keyset pagination by creation date or workload
+--
+-- Requires: migration_phase4_assignment_distribution.sql
+
+-- ============================================
+-- 1. CAMPAIGN COUNTER
+-- ============================================
+
+ALTER TABLE user_assignment_load
+    ADD COLUMN IF NOT EXISTS active_campaigns BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION maintain_user_campaign_load()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE user_assignment_load l
+        SET active_campaigns = l.active_campaigns - d.cnt,
+            updated_at = NOW()
+        FROM (
+            SELECT user_id, COUNT(*) AS cnt
+            FROM old_rows
+            WHERE status = 'active'
+            GROUP BY user_id
+        ) d
+        WHERE l.user_id = d.user_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_assignment_load (user_id, organization_id, active_campaigns)
+        SELECT user_id, MIN(organization_id::text)::uuid, COUNT(*)
+        FROM new_rows
+        WHERE status = 'active'
+        GROUP BY user_id
+        ON CONFLICT (user_id)
+        DO UPDATE SET
+            active_campaigns = user_assignment_load.active_campaigns + EXCLUDED.active_campaigns,
+            updated_at = NOW();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_campaign_load_insert ON user_campaign_assignment;
+DROP TRIGGER IF EXISTS user_campaign_load_update ON user_campaign_assignment;
+DROP TRIGGER IF EXISTS user_campaign_load_delete ON user_campaign_assignment;
+
+CREATE TRIGGER user_campaign_load_insert
+    AFTER INSERT ON user_campaign_assignment
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_user_campaign_load();
+
+CREATE TRIGGER user_campaign_load_update
+    AFTER UPDATE ON user_campaign_assignment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_user_campaign_load();
+
+CREATE TRIGGER user_campaign_load_delete
+    AFTER DELETE ON user_campaign_assignment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_user_campaign_load();
+
+-- ============================================
+-- 2. RECONCILIATION (now recounts both counters)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION rebuild_user_assignment_load(p_organization_id UUID DEFAULT NULL)
+RETURNS INT AS $$
+DECLARE
+    v_count INT;
+BEGIN
+    LOCK TABLE user_contact_assignment IN SHARE MODE;
+    LOCK TABLE user_campaign_assignment IN SHARE MODE;
+
+    INSERT INTO user_assignment_load (user_id, organization_id, active_contacts, active_campaigns)
+    SELECT
+        u.id,
+        u.organization_id,
+        COALESCE(ct.cnt, 0),
+        COALESCE(cp.cnt, 0)
+    FROM "user" u
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS cnt
+        FROM user_contact_assignment
+        WHERE status = 'active'
+        GROUP BY user_id
+    ) ct ON ct.user_id = u.id
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS cnt
+        FROM user_campaign_assignment
+        WHERE status = 'active'
+        GROUP BY user_id
+    ) cp ON cp.user_id = u.id
+    WHERE p_organization_id IS NULL OR u.organization_id = p_organization_id
+    ON CONFLICT (user_id)
+    DO UPDATE SET
+        organization_id = EXCLUDED.organization_id,
+        active_contacts = EXCLUDED.active_contacts,
+        active_campaigns = EXCLUDED.active_campaigns,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION rebuild_user_assignment_load IS 'Recounts user_assignment_load.active_contacts and active_campaigns from the assignment tables';
+
+-- Initial backfill of active_campaigns
+SELECT rebuild_user_assignment_load();
+
+-- ============================================
+-- 3. HELPER FUNCTIONS (read counters)
+-- ============================================
+
+-- Same signatures as phase 3, now a single-row lookup
+CREATE OR REPLACE FUNCTION get_user_campaign_count(p_user_id UUID)
+RETURNS INT AS $$
+    SELECT COALESCE((SELECT active_campaigns::int FROM user_assignment_load WHERE user_id = p_user_id), 0);
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION get_user_contact_count(p_user_id UUID)
+RETURNS INT AS $$
+    SELECT COALESCE((SELECT active_contacts::int FROM user_assignment_load WHERE user_id = p_user_id), 0);
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- 4. INDEXES
+-- ============================================
+
+-- Keyset pagination: WHERE organization_id = $1 AND (created_at, id) < ($2, $3)
+--                    ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_user_org_created
+    ON "user"(organization_id, created_at DESC, id DESC);
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT FROM information_schema.columns
+        WHERE table_name = 'user_assignment_load' AND column_name = 'active_campaigns'
+    ) THEN
+        RAISE NOTICE '✅ user_assignment_load.active_campaigns added successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Org User Listing migration completed';
+    RAISE NOTICE 'ℹ️  Triggers created: 3';
+    RAISE NOTICE 'ℹ️  Functions updated: 3';
+    RAISE NOTICE 'ℹ️  Total indexes created: 1';
+END $$;
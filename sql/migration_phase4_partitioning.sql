@@ -0,0 +1,328 @@
+-- ============================================
+-- PHASE 4: TIME-PARTITIONED EVENT TABLES
+-- ============================================
+-- Migration Script for monthly range partitioning
+-- Created: 2026-10-19
+-- Purpose: Partition webhook_log, message and event_log by created_at so
+--          retention is DROP/DETACH PARTITION instead of DELETE and
+--          "last hour / last 24h" filters only touch recent partitions
+--
+-- Requires: migration_phase4_dashboard_rollups.sql (webhook_log_stats must
+--           no longer depend on webhook_log)
+--
+-- ⚠️  Rewrites the three tables under an ACCESS EXCLUSIVE lock. Run during
+--     a maintenance window; webhook ingest is blocked while it runs.
+--
+-- Note: Aborts before converting anything if one of the tables has a UNIQUE
+--       index or constraint without created_at (deployed schemas may have
+--       some that sql/ doesn't, e.g. on message.external_id). Find them with:
+--       SELECT indexrelid::regclass FROM pg_index
+--       WHERE indrelid IN ('webhook_log'::regclass, 'message'::regclass, 'event_log'::regclass)
+--         AND indisunique AND NOT indisprimary;
+
+-- ============================================
+-- 1. PARTITION MANAGEMENT FUNCTIONS
+-- ============================================
+
+-- Partitions are named <table>_pYYYYMM and cover one calendar month (UTC)
+CREATE OR REPLACE FUNCTION monthly_partition_name(p_table TEXT, p_month DATE)
+RETURNS TEXT AS $$
+    SELECT p_table || '_p' || to_char(p_month, 'YYYYMM');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Create missing monthly partitions from p_from up to p_months_ahead months ahead
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    p_table TEXT,
+    p_months_ahead INT DEFAULT 3,
+    p_from TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS INT AS $$
+DECLARE
+    v_month DATE := date_trunc('month', p_from AT TIME ZONE 'UTC')::DATE;
+    v_last DATE := (date_trunc('month', NOW() AT TIME ZONE 'UTC') + make_interval(months => p_months_ahead))::DATE;
+    v_name TEXT;
+    v_created INT := 0;
+BEGIN
+    -- Several workers may run maintenance at the same time
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_monthly_partitions:' || p_table));
+
+    WHILE v_month <= v_last LOOP
+        v_name := monthly_partition_name(p_table, v_month);
+
+        IF to_regclass(v_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                v_name,
+                p_table,
+                v_month::TIMESTAMP AT TIME ZONE 'UTC',
+                (v_month + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC'
+            );
+            v_created := v_created + 1;
+        END IF;
+
+        v_month := (v_month + INTERVAL '1 month')::DATE;
+    END LOOP;
+
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION ensure_monthly_partitions IS 'Creates missing <table>_pYYYYMM partitions up to N months ahead';
+
+-- Detach (and by default drop) partitions that lie entirely before NOW() - p_keep_days.
+-- Rollup buckets of dropped ranges are removed too, so dashboard totals keep
+-- matching the table contents.
+CREATE OR REPLACE FUNCTION drop_expired_partitions(
+    p_table TEXT,
+    p_keep_days INT,
+    p_detach_only BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE(partition_name TEXT, estimated_rows BIGINT) AS $$
+DECLARE
+    v_part RECORD;
+    v_cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_keep_days);
+    v_month DATE;
+    v_lower TIMESTAMPTZ;
+    v_upper TIMESTAMPTZ;
+BEGIN
+    FOR v_part IN
+        SELECT c.relname::TEXT AS relname, c.reltuples
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = p_table::REGCLASS
+          AND c.relname ~ ('^' || p_table || '_p[0-9]{6}$')
+        ORDER BY c.relname
+    LOOP
+        v_month := to_date(right(v_part.relname, 6), 'YYYYMM');
+        v_lower := v_month::TIMESTAMP AT TIME ZONE 'UTC';
+        v_upper := (v_month + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC';
+
+        -- Partitions are ordered oldest first
+        EXIT WHEN v_upper > v_cutoff;
+
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', p_table, v_part.relname);
+        IF NOT p_detach_only THEN
+            EXECUTE format('DROP TABLE %I', v_part.relname);
+        END IF;
+
+        IF p_table = 'message' THEN
+            DELETE FROM org_hourly_message_stats WHERE bucket >= v_lower AND bucket < v_upper;
+        ELSIF p_table = 'webhook_log' THEN
+            DELETE FROM org_hourly_webhook_stats WHERE bucket >= v_lower AND bucket < v_upper;
+        END IF;
+
+        partition_name := v_part.relname;
+        estimated_rows := GREATEST(v_part.reltuples, 0)::BIGINT;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION drop_expired_partitions IS 'Retention: detaches/drops monthly partitions older than N days';
+
+-- Unique indexes and constraints (other than the primary key) must contain
+-- created_at to be created on the partitioned table. Fails, naming them,
+-- before anything is changed: rewriting them to include created_at would
+-- silently weaken them (e.g. message.external_id would only be unique per
+-- timestamp).
+CREATE OR REPLACE FUNCTION check_monthly_partitionable(p_table TEXT)
+RETURNS VOID AS $$
+DECLARE
+    v_unique TEXT;
+BEGIN
+    SELECT string_agg(c.relname, ', ' ORDER BY c.relname)
+    INTO v_unique
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid = p_table::REGCLASS
+      AND i.indisunique
+      AND NOT i.indisprimary
+      AND NOT EXISTS (
+          SELECT FROM generate_series(1, i.indnkeyatts) AS k
+          WHERE pg_get_indexdef(i.indexrelid, k, true) = 'created_at'
+      );
+
+    IF v_unique IS NOT NULL THEN
+        RAISE EXCEPTION 'Cannot partition %: unique indexes without created_at: %', p_table, v_unique
+            USING HINT = 'Drop them (or their constraints), or recreate them including created_at, then rerun the migration';
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Convert an existing table into a monthly partitioned table with the same
+-- columns, defaults, generated columns, indexes, foreign keys, triggers and
+-- RLS policies. The primary key becomes (id, created_at).
+CREATE OR REPLACE FUNCTION convert_to_monthly_partitions(
+    p_table TEXT,
+    p_months_ahead INT DEFAULT 3
+)
+RETURNS VOID AS $$
+DECLARE
+    v_legacy TEXT := p_table || '_unpartitioned';
+    v_index_defs TEXT[];
+    v_trigger_defs TEXT[];
+    v_fk_defs TEXT[];
+    v_policy_defs TEXT[];
+    v_rls BOOLEAN;
+    v_insert_cols TEXT;
+    v_select_cols TEXT;
+    v_min TIMESTAMPTZ;
+    v_def TEXT;
+BEGIN
+    IF EXISTS (SELECT FROM pg_partitioned_table WHERE partrelid = to_regclass(p_table)) THEN
+        RAISE NOTICE 'ℹ️  % is already partitioned', p_table;
+        RETURN;
+    END IF;
+
+    EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', p_table);
+    PERFORM check_monthly_partitionable(p_table);
+
+    -- Capture dependent objects while they still reference the original table
+    SELECT array_agg(pg_get_indexdef(i.indexrelid))
+    INTO v_index_defs
+    FROM pg_index i
+    WHERE i.indrelid = p_table::REGCLASS AND NOT i.indisprimary;
+
+    SELECT array_agg(pg_get_triggerdef(t.oid))
+    INTO v_trigger_defs
+    FROM pg_trigger t
+    WHERE t.tgrelid = p_table::REGCLASS AND NOT t.tgisinternal;
+
+    SELECT array_agg(format('ALTER TABLE %I ADD CONSTRAINT %I %s', p_table, conname, pg_get_constraintdef(oid)))
+    INTO v_fk_defs
+    FROM pg_constraint
+    WHERE conrelid = p_table::REGCLASS AND contype = 'f';
+
+    SELECT array_agg(format(
+        'CREATE POLICY %I ON %I AS %s FOR %s TO %s%s%s',
+        policyname, p_table, permissive, cmd, array_to_string(roles, ', '),
+        CASE WHEN qual IS NOT NULL THEN ' USING (' || qual || ')' ELSE '' END,
+        CASE WHEN with_check IS NOT NULL THEN ' WITH CHECK (' || with_check || ')' ELSE '' END
+    ))
+    INTO v_policy_defs
+    FROM pg_policies
+    WHERE schemaname = current_schema() AND tablename = p_table;
+
+    SELECT relrowsecurity INTO v_rls FROM pg_class WHERE oid = p_table::REGCLASS;
+
+    SELECT
+        string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position),
+        string_agg(
+            CASE WHEN column_name = 'created_at' THEN 'COALESCE(created_at, NOW())' ELSE quote_ident(column_name) END,
+            ', ' ORDER BY ordinal_position
+        )
+    INTO v_insert_cols, v_select_cols
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = p_table AND is_generated = 'NEVER';
+
+    -- Swap in the partitioned table
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', p_table, v_legacy);
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED INCLUDING COMMENTS) '
+        'PARTITION BY RANGE (created_at)',
+        p_table, v_legacy
+    );
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN created_at SET NOT NULL', p_table);
+
+    EXECUTE format('SELECT MIN(created_at) FROM %I', v_legacy) INTO v_min;
+    PERFORM ensure_monthly_partitions(p_table, p_months_ahead, COALESCE(v_min, NOW()));
+    -- Safety net if maintenance falls behind; stays empty in normal operation
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', p_table || '_default', p_table);
+
+    -- Copy data before building indexes (faster), then drop the old table.
+    -- No CASCADE: fail loudly if anything else still depends on it.
+    EXECUTE format('INSERT INTO %I (%s) SELECT %s FROM %I', p_table, v_insert_cols, v_select_cols, v_legacy);
+    EXECUTE format('DROP TABLE %I', v_legacy);
+
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, created_at)', p_table);
+
+    FOREACH v_def IN ARRAY COALESCE(v_index_defs, '{}') LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    FOREACH v_def IN ARRAY COALESCE(v_fk_defs, '{}') LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    FOREACH v_def IN ARRAY COALESCE(v_trigger_defs, '{}') LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    IF v_rls THEN
+        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', p_table);
+    END IF;
+
+    FOREACH v_def IN ARRAY COALESCE(v_policy_defs, '{}') LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    EXECUTE format('ANALYZE %I', p_table);
+
+    RAISE NOTICE '✅ % converted to monthly partitions', p_table;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 2. CONVERT TABLES
+-- ============================================
+
+-- Check all three first, so none is converted if one can't be
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY['webhook_log', 'message', 'event_log'] LOOP
+        IF NOT EXISTS (SELECT FROM pg_partitioned_table WHERE partrelid = to_regclass(v_table)) THEN
+            PERFORM check_monthly_partitionable(v_table);
+        END IF;
+    END LOOP;
+END $$;
+
+SELECT convert_to_monthly_partitions('webhook_log');
+SELECT convert_to_monthly_partitions('message');
+SELECT convert_to_monthly_partitions('event_log');
+
+-- ============================================
+-- 3. RETENTION (replaces DELETE-based cleanup)
+-- ============================================
+
+-- Same signature as phase 3. Retention is now month-granular: a partition is
+-- dropped once all of its rows are older than days_to_keep.
+-- deleted_count is the planner estimate (pg_class.reltuples) of dropped rows.
+CREATE OR REPLACE FUNCTION cleanup_old_webhook_logs(days_to_keep INT DEFAULT 90)
+RETURNS TABLE(deleted_count BIGINT) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT COALESCE(SUM(estimated_rows), 0)::BIGINT
+    FROM drop_expired_partitions('webhook_log', days_to_keep);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION cleanup_old_webhook_logs IS 'Drops webhook_log partitions older than specified days (default: 90 days)';
+
+-- ============================================
+-- 4. SCHEDULED JOBS
+-- ============================================
+
+-- The API runs ensure_monthly_partitions on startup and daily
+-- (app/services/partition_service.py). With pg_cron instead:
+-- SELECT cron.schedule('ensure_partitions', '0 1 * * *', $$
+--     SELECT ensure_monthly_partitions(t) FROM unnest(ARRAY['webhook_log', 'message', 'event_log']) t
+-- $$);
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF (SELECT COUNT(*) FROM pg_partitioned_table
+        WHERE partrelid IN (to_regclass('webhook_log'), to_regclass('message'), to_regclass('event_log'))) = 3 THEN
+        RAISE NOTICE '✅ webhook_log, message, event_log partitioned successfully';
+    ELSE
+        RAISE EXCEPTION '❌ Failed to partition event tables';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Partitioning migration completed';
+    RAISE NOTICE 'ℹ️  Functions created: 5';
+END $$;
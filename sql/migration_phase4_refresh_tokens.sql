@@ -0,0 +1,72 @@
+-- ============================================
+-- PHASE 4: REFRESH TOKENS & REVOCATION
+-- ============================================
+-- Migration Script for /auth/refresh and /auth/logout
+-- Created: 2026-10-19
+-- Purpose: Rotating refresh tokens (grouped in families = sessions) and a
+--          revocation list mirrored in memory by app/services/token_service.py
+--          (synced with NOTIFY on the token_revoked channel)
+
+-- ============================================
+-- 1. REFRESH TOKENS
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS refresh_token (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Session: all refresh tokens descending from one login
+    family_id UUID NOT NULL,
+
+    user_id UUID NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    organization_id UUID NOT NULL REFERENCES organization(id) ON DELETE CASCADE,
+
+    -- SHA-256 of the token; the token itself is never stored
+    token_hash BYTEA NOT NULL UNIQUE,
+
+    expires_at TIMESTAMPTZ NOT NULL,
+    rotated_at TIMESTAMPTZ,   -- set when exchanged for a new token
+    revoked_at TIMESTAMPTZ,   -- set on logout / reuse detection
+
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_token_family ON refresh_token(family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_token_user ON refresh_token(user_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_token_expires ON refresh_token(expires_at);
+
+COMMENT ON TABLE refresh_token IS 'Rotating refresh tokens (hashed), one family per login session';
+
+-- ============================================
+-- 2. REVOCATION LIST
+-- ============================================
+
+-- token_key: 'jti:<access token id>' or 'sid:<refresh token family>'
+-- Rows are only needed until the revoked access tokens expire.
+CREATE TABLE IF NOT EXISTS revoked_token (
+    token_key TEXT PRIMARY KEY,
+    expires_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_token_expires ON revoked_token(expires_at);
+
+COMMENT ON TABLE revoked_token IS 'Revoked access tokens / sessions until their access tokens expire';
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_tables WHERE tablename = 'refresh_token') THEN
+        RAISE NOTICE '✅ refresh_token table created successfully';
+    END IF;
+
+    IF EXISTS (SELECT FROM pg_tables WHERE tablename = 'revoked_token') THEN
+        RAISE NOTICE '✅ revoked_token table created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Refresh Tokens migration completed';
+    RAISE NOTICE 'ℹ️  Tables created: 2';
+    RAISE NOTICE 'ℹ️  Total indexes created: 4';
+END $$;
@@ -0,0 +1,52 @@
+-- ============================================
+-- PHASE 4: WEBHOOK LOG PAYLOAD SEARCH
+-- ============================================
+-- Migration Script for indexed webhook payload search
+-- Created: 2026-10-19
+-- Purpose: Let get_webhook_logs search payloads without casting every row
+--          to text. Field terms use idx_webhook_log_payload_gin (@>, @?),
+--          free text uses a trigram index on payload_text.
+
+-- ============================================
+-- 1. EXTENSIONS
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+-- ============================================
+-- 2. PAYLOAD TEXT COLUMN
+-- ============================================
+
+-- Text rendering of the payload, maintained by PostgreSQL on insert/update
+ALTER TABLE webhook_log ADD COLUMN IF NOT EXISTS payload_text TEXT
+    GENERATED ALWAYS AS (payload::text) STORED;
+
+COMMENT ON COLUMN webhook_log.payload_text IS 'payload rendered as text for trigram free-text search';
+
+-- ============================================
+-- 3. INDEXES
+-- ============================================
+
+-- Already created in phase 3; serves @> containment and @? jsonpath terms
+CREATE INDEX IF NOT EXISTS idx_webhook_log_payload_gin ON webhook_log USING gin(payload);
+
+-- Free-text fallback: payload_text ILIKE '%q%'
+CREATE INDEX IF NOT EXISTS idx_webhook_log_payload_text_trgm
+    ON webhook_log USING gin(payload_text gin_trgm_ops);
+
+-- ============================================
+-- MIGRATION COMPLETE
+-- ============================================
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT FROM information_schema.columns
+        WHERE table_name = 'webhook_log' AND column_name = 'payload_text'
+    ) THEN
+        RAISE NOTICE '✅ webhook_log.payload_text created successfully';
+    END IF;
+
+    RAISE NOTICE '✅ Phase 4 Webhook Log Search migration completed';
+    RAISE NOTICE 'ℹ️  Total indexes created: 1';
+END $$;
@@ -0,0 +1,47 @@
+"""
+Tests for login lookups and the unknown-email cache
+"""
+
+from app.services import auth_service
+
+
+async def test_unknown_emails_are_cached(monkeypatch):
+    """Test that repeated lookups of an unknown email skip the database"""
+    lookups = []
+
+    async def fetch(email):
+        lookups.append(email)
+        return {"id": "u1", "email": email} if email == "known@example.com" else None
+
+    monkeypatch.setattr(auth_service, "_fetch_login_user", fetch)
+    auth_service._unknown_emails.invalidate()
+
+    assert await auth_service.get_login_user("Nobody@Example.com") is None
+    assert await auth_service.get_login_user("nobody@example.com ") is None
+    assert lookups == ["nobody@example.com"]
+
+    # Existing users are never cached
+    assert (await auth_service.get_login_user("KNOWN@example.com"))["id"] == "u1"
+    assert (await auth_service.get_login_user("known@example.com"))["id"] == "u1"
+    assert lookups.count("known@example.com") == 2
+
+
+async def test_unknown_email_cache_expires(monkeypatch):
+    """Test that an unknown email is looked up again after the TTL (user created meanwhile)"""
+    users = {}
+
+    async def fetch(email):
+        return users.get(email)
+
+    cache = auth_service._unknown_emails
+    clock = [0.0]
+    monkeypatch.setattr(cache, "clock", lambda: clock[0])
+    monkeypatch.setattr(auth_service, "_fetch_login_user", fetch)
+    cache.invalidate()
+
+    assert await auth_service.get_login_user("new@example.com") is None
+    users["new@example.com"] = {"id": "u2"}
+    assert await auth_service.get_login_user("new@example.com") is None
+
+    clock[0] += cache.ttl
+    assert (await auth_service.get_login_user("new@example.com"))["id"] == "u2"
@@ -0,0 +1,123 @@
+"""
+Tests for the TTL cache with stale-while-revalidate
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import TTLCache
+
+
+class Clock:
+    """Controllable replacement for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def counting_loader():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return len(calls)
+
+    return load, calls
+
+
+async def test_fresh_value_is_cached(clock):
+    """Test that a fresh value is served without reloading"""
+    cache = TTLCache(ttl=5, clock=clock)
+    load, calls = counting_loader()
+
+    assert await cache.get_or_load("org", load) == 1
+    clock.now += 4
+    assert await cache.get_or_load("org", load) == 1
+    assert len(calls) == 1
+
+
+async def test_concurrent_misses_share_one_load(clock):
+    """Test that concurrent callers of a missing key trigger one load"""
+    cache = TTLCache(ttl=5, clock=clock)
+    load, calls = counting_loader()
+
+    results = await asyncio.gather(*(cache.get_or_load("org", load) for _ in range(10)))
+
+    assert results == [1] * 10
+    assert len(calls) == 1
+
+
+async def test_stale_value_served_while_revalidating(clock):
+    """Test that a stale value is returned immediately and refreshed in the background"""
+    cache = TTLCache(ttl=5, stale_ttl=30, clock=clock)
+    load, calls = counting_loader()
+
+    await cache.get_or_load("org", load)
+    clock.now += 10
+
+    assert await cache.get_or_load("org", load) == 1
+    await asyncio.sleep(0.01)
+    assert cache.peek("org") == 2
+    assert len(calls) == 2
+
+
+async def test_expired_value_is_reloaded(clock):
+    """Test that a value past ttl + stale_ttl is loaded synchronously"""
+    cache = TTLCache(ttl=5, stale_ttl=30, clock=clock)
+    load, _ = counting_loader()
+
+    await cache.get_or_load("org", load)
+    clock.now += 40
+
+    assert await cache.get_or_load("org", load) == 2
+
+
+async def test_failed_background_refresh_keeps_stale_value(clock):
+    """Test that refresh errors don't drop the cached value"""
+    cache = TTLCache(ttl=5, stale_ttl=30, clock=clock)
+    cache.set("org", "cached")
+    clock.now += 10
+
+    async def failing():
+        raise RuntimeError("db down")
+
+    assert await cache.get_or_load("org", failing) == "cached"
+    await asyncio.sleep(0.01)
+    assert cache.peek("org") == "cached"
+
+
+async def test_lru_eviction_and_invalidate(clock):
+    """Test max_entries eviction and invalidation"""
+    cache = TTLCache(ttl=5, max_entries=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.peek("a") is None
+    assert len(cache) == 2
+
+    cache.invalidate("b")
+    assert cache.peek("b") is None
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_get_only_returns_fresh_values(clock):
+    """Test that get() never loads and ignores expired entries"""
+    cache = TTLCache(ttl=5, stale_ttl=30, clock=clock)
+    cache.set("k", "v")
+
+    assert cache.get("k") == "v"
+    clock.now += 5
+    assert cache.get("k") is None
+    assert cache.get("missing", "default") == "default"
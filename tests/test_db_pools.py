@@ -0,0 +1,86 @@
+"""
+Tests for concurrent and degraded database pool initialization
+"""
+
+import asyncio
+
+import pytest
+
+from app.core import db
+from app.core.config import settings
+
+
+class FakePool:
+    def __init__(self, dsn):
+        self.dsn = dsn
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+async def fake_create_pool(monkeypatch):
+    """asyncpg.create_pool stand-in: slow, and failing for DSNs in `down`"""
+    calls = {"started": [], "down": set(), "kwargs": []}
+
+    async def create_pool(dsn, **kwargs):
+        calls["started"].append(dsn)
+        calls["kwargs"].append(kwargs)
+        await asyncio.sleep(0.1)
+        if dsn in calls["down"]:
+            raise OSError(f"{dsn} unreachable")
+        return FakePool(dsn)
+
+    monkeypatch.setattr(db.asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(db, "global_kb_pool", None)
+    monkeypatch.setattr(db, "tenant_db_pool", None)
+    monkeypatch.setattr(db, "pool_states", {})
+    yield calls
+    for task in db._connect_tasks.values():
+        task.cancel()
+    db._connect_tasks.clear()
+
+
+async def test_pools_are_created_concurrently(fake_create_pool):
+    """Test that both pools start connecting at once"""
+    started = asyncio.get_running_loop().time()
+    await db.init_db_pools()
+
+    assert asyncio.get_running_loop().time() - started < 0.19
+    assert db.global_kb_pool.dsn == settings.database_global_url
+    assert db.tenant_db_pool.dsn == settings.database_tenant_url
+    assert db.pool_states["tenant"]["state"] == "connected"
+
+
+async def test_no_warmup_connects_lazily(fake_create_pool, monkeypatch):
+    """Test that disabling warm-up creates pools without idle connections"""
+    monkeypatch.setattr(settings, "db_pool_warmup", False)
+    await db.init_db_pools()
+
+    assert [kwargs["min_size"] for kwargs in fake_create_pool["kwargs"]] == [0, 0]
+
+
+async def test_failure_aborts_startup_by_default(fake_create_pool):
+    """Test that a failing pool fails startup and the other pool is closed"""
+    fake_create_pool["down"].add(settings.database_global_url)
+
+    with pytest.raises(OSError):
+        await db.init_db_pools()
+
+    assert db.global_kb_pool is None and db.tenant_db_pool is None
+    assert db.pool_states["global_kb"]["state"] == "failed"
+
+
+async def test_degraded_startup_retries_in_background(fake_create_pool, monkeypatch):
+    """Test that degraded mode starts without a database and reports it as not ready"""
+    monkeypatch.setattr(settings, "db_startup_degraded", True)
+    fake_create_pool["down"].add(settings.database_global_url)
+
+    await db.init_db_pools()
+
+    assert db.tenant_db_pool is not None
+    assert db.global_kb_pool is None
+    assert db.pool_states["global_kb"]["state"] == "connecting"
+    assert await db.check_global_kb_health() is False
+    assert "global_kb" in db._connect_tasks
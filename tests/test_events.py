@@ -0,0 +1,89 @@
+"""
+Tests for the live activity broadcaster
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.events import Broadcaster
+from app.services.activity_feed_service import publish_activity, send_activity, webhook_activity_event
+
+
+async def test_publish_filters_by_organization():
+    """Test that org-filtered subscribers only get their organization's events"""
+    broadcaster = Broadcaster()
+    org_a, org_b = uuid4(), uuid4()
+
+    async with broadcaster.subscribe() as all_events, broadcaster.subscribe(org_a) as only_a:
+        assert broadcaster.publish({"organization_id": str(org_a), "n": 1}) == 2
+        assert broadcaster.publish({"organization_id": str(org_b), "n": 2}) == 1
+        assert broadcaster.publish({"organization_id": None, "n": 3}) == 1
+
+        assert all_events.qsize() == 3
+        assert (await only_a.get())["n"] == 1
+        assert only_a.empty()
+
+    assert broadcaster.subscriber_count == 0
+
+
+async def test_slow_subscriber_drops_oldest():
+    """Test that a full queue drops its oldest event instead of blocking"""
+    broadcaster = Broadcaster(queue_size=2)
+
+    async with broadcaster.subscribe() as queue:
+        for n in range(5):
+            broadcaster.publish({"n": n})
+
+        assert [(await queue.get())["n"] for _ in range(2)] == [3, 4]
+
+
+def test_webhook_activity_event_shape():
+    """Test that feed items are JSON-ready"""
+    log_id, org_id = uuid4(), uuid4()
+    created_at = datetime(2025, 10, 12, 8, 30, tzinfo=timezone.utc)
+
+    event = webhook_activity_event(
+        log_id, "email_sent", "instantly", "success", created_at,
+        organization_id=org_id, contact_email="lead@example.com"
+    )
+
+    assert event["id"] == str(log_id)
+    assert event["organization_id"] == str(org_id)
+    assert event["description"] == "Webhook received: email_sent"
+    assert event["timestamp"] == "2025-10-12T08:30:00+00:00"
+
+
+class FailingNotifyConn:
+    def __init__(self):
+        self.savepoints = []
+
+    def is_in_transaction(self):
+        return True
+
+    @asynccontextmanager
+    async def transaction(self):
+        try:
+            yield
+        except Exception:
+            self.savepoints.append("rolled back")
+            raise
+        self.savepoints.append("released")
+
+    async def execute(self, query, *args):
+        raise RuntimeError("payload string too long")
+
+
+async def test_publish_failure_rolls_back_savepoint_only(monkeypatch):
+    """Test that a failed notify inside a transaction doesn't abort the caller's transaction"""
+    monkeypatch.setattr(settings, "activity_feed_notify", True)
+    conn = FailingNotifyConn()
+
+    await publish_activity(conn, {"type": "webhook"})
+    assert conn.savepoints == ["rolled back"]
+
+    with pytest.raises(RuntimeError):
+        await send_activity(conn, {"type": "webhook"})
@@ -0,0 +1,68 @@
+"""
+Tests for follow-up reminder grouping
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.services.activity_feed_service import fits_notify
+from app.services.followup_service import MAX_FOLLOWUPS_PER_EVENT, followup_reminder_events
+
+
+def _row(user_id, organization_id, due_at, first_name="Ada", last_name=None):
+    return {
+        "assignment_id": uuid4(),
+        "user_id": user_id,
+        "contact_id": uuid4(),
+        "organization_id": organization_id,
+        "due_at": due_at,
+        "contact_email": "lead@example.com",
+        "first_name": first_name,
+        "last_name": last_name
+    }
+
+
+def test_followup_events_per_user():
+    """Test that follow-ups are grouped into one reminder per assigned user"""
+    now = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+    org_id, alice, bob = uuid4(), uuid4(), uuid4()
+    rows = [
+        _row(alice, org_id, now - timedelta(hours=2)),
+        _row(alice, org_id, now - timedelta(hours=1), last_name="Lovelace"),
+        _row(bob, org_id, now, first_name=None),
+    ]
+
+    events = followup_reminder_events(rows, now)
+
+    assert [event["user_id"] for event in events] == [str(alice), str(bob)]
+    assert events[0]["organization_id"] == str(org_id)
+    assert [f["contact_name"] for f in events[0]["followups"]] == ["Ada", "Ada Lovelace"]
+    assert events[1]["followups"][0]["contact_name"] is None
+    assert events[1]["followups"][0]["due_at"] == now.isoformat()
+
+
+def test_followup_events_are_chunked():
+    """Test that a user with many due follow-ups gets several bounded events"""
+    now = datetime.now(timezone.utc)
+    user_id, org_id = uuid4(), uuid4()
+    rows = [_row(user_id, org_id, now) for _ in range(MAX_FOLLOWUPS_PER_EVENT + 1)]
+
+    events = followup_reminder_events(rows, now)
+
+    assert [len(event["followups"]) for event in events] == [MAX_FOLLOWUPS_PER_EVENT, 1]
+
+
+def test_followup_events_fit_notify_payload():
+    """Test that long names split events by payload size and oversized ones are trimmed"""
+    now = datetime.now(timezone.utc)
+    user_id, org_id = uuid4(), uuid4()
+    rows = [_row(user_id, org_id, now, first_name="Zoë " * 100) for _ in range(MAX_FOLLOWUPS_PER_EVENT)]
+    rows.append(_row(user_id, org_id, now, first_name="Ω" * 5000))
+
+    events = followup_reminder_events(rows, now)
+
+    assert len(events) > 2
+    assert all(fits_notify(event) for event in events)
+    assert sum(len(event["followups"]) for event in events) == len(rows)
+    assert events[-1]["followups"][-1]["contact_name"] is None
+    assert events[-1]["followups"][-1]["contact_email"] is None
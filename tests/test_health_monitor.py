@@ -0,0 +1,116 @@
+"""
+Tests for the background health monitor and the probes served from it
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from app.core import db, health
+from app.core.health import HealthMonitor
+from app.main import app
+
+
+class FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetchval(self, query, timeout=None):
+        if self.pool.fail:
+            raise ConnectionError("connection refused")
+        return 1
+
+
+class FakePool:
+    def __init__(self, fail=False, hang=False):
+        self.fail = fail
+        self.hang = hang
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        if self.hang:
+            await asyncio.wait_for(asyncio.sleep(10), timeout)
+        self.acquired += 1
+        yield FakeConn(self)
+
+    def get_size(self):
+        return 4
+
+    def get_idle_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 10
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    pools = {"global_kb": FakePool(), "tenant": FakePool()}
+    monkeypatch.setattr(db, "global_kb_pool", pools["global_kb"])
+    monkeypatch.setattr(db, "tenant_db_pool", pools["tenant"])
+    monkeypatch.setattr(db, "pool_states", {})
+    return pools
+
+
+async def test_check_records_latency_and_saturation(pools):
+    """Test that a check stores latency and pool occupancy"""
+    monitor = HealthMonitor(interval=5, timeout=1)
+    await monitor.check_all()
+
+    snapshot = monitor.snapshot()
+    assert monitor.ready()
+    assert snapshot["tenant"]["ok"] and snapshot["tenant"]["latency_ms"] >= 0
+    assert snapshot["tenant"]["pool"] == {"size": 4, "idle": 1, "in_use": 3, "max_size": 10, "saturation": 0.3}
+
+
+async def test_failures_and_timeouts_make_not_ready(pools):
+    """Test that failing or saturated (hanging) pools fail readiness"""
+    pools["global_kb"].fail = True
+    pools["tenant"].hang = True
+    monitor = HealthMonitor(interval=5, timeout=0.05)
+
+    await monitor.check_all()
+    await monitor.check("global_kb")
+
+    snapshot = monitor.snapshot()
+    assert not monitor.ready()
+    assert snapshot["global_kb"]["consecutive_failures"] == 2
+    assert "connection refused" in snapshot["global_kb"]["error"]
+    assert snapshot["tenant"]["error"].startswith("TimeoutError")
+
+
+async def test_stale_results_are_not_ready(pools):
+    """Test that results older than a few intervals don't count"""
+    now = [1000.0]
+    monitor = HealthMonitor(interval=5, timeout=1, clock=lambda: now[0])
+    await monitor.check_all()
+    assert monitor.ready()
+
+    now[0] += 60
+    assert not monitor.ready()
+    assert monitor.snapshot()["tenant"]["stale"]
+
+
+async def test_probes_do_not_touch_pools(pools, monkeypatch):
+    """Test that /health and /health/ready are served from memory"""
+    monitor = HealthMonitor(interval=5, timeout=1)
+    monkeypatch.setattr(health, "health_monitor", monitor)
+    monkeypatch.setattr("app.api.health.health_monitor", monitor)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/health/ready")).status_code == 503
+
+        await monitor.check_all()
+        acquired = pools["tenant"].acquired
+
+        ready = await client.get("/health/ready")
+        body = (await client.get("/health")).json()
+
+    assert ready.status_code == 200
+    assert body["status"] == "ok"
+    assert body["databases"] == {"global_kb": "connected", "tenant": "connected"}
+    assert body["checks"]["tenant"]["pool"]["in_use"] == 3
+    assert pools["tenant"].acquired == acquired
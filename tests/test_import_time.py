@@ -0,0 +1,56 @@
+"""
+Import-time budget for the API
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter.
+Budgets can be raised on slow machines with IMPORT_BUDGET_TOTAL_MS and
+IMPORT_BUDGET_APP_MS.
+"""
+
+import os
+import subprocess
+import sys
+
+# Only needed by specific endpoints or tasks, imported on first use
+LAZY_MODULES = (
+    "httpx",
+    "tenacity",
+    "jose",
+    "passlib",
+    "pyarrow",
+    "redis",
+    "app.integrations.instantly.client",
+)
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True, env=os.environ.copy())
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Module -> (self_us, cumulative_us) from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    """Test that optional and integration-only dependencies load lazily"""
+    result = run_python("-c", f"import sys, app.main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])")
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_import_time_budget():
+    """Test that importing app.main stays within the import-time budget"""
+    modules = parse_importtime(run_python("-X", "importtime", "-c", "import app.main").stderr)
+
+    total_ms = modules["app.main"][1] / 1000
+    app_ms = sum(self_us for name, (self_us, _) in modules.items() if name == "app" or name.startswith("app.")) / 1000
+
+    assert total_ms < float(os.environ.get("IMPORT_BUDGET_TOTAL_MS", 4000)), f"import app.main took {total_ms:.0f}ms"
+    assert app_ms < float(os.environ.get("IMPORT_BUDGET_APP_MS", 1000)), f"app modules took {app_ms:.0f}ms (self time)"
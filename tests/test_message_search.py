@@ -0,0 +1,21 @@
+"""
+Tests for message search query building
+"""
+
+from app.services.message_service import build_prefix_tsquery
+
+
+def test_prefix_tsquery_terms():
+    """Test that every word becomes a prefix term"""
+    assert build_prefix_tsquery("Meet demo") == "meet:* & demo:*"
+
+
+def test_prefix_tsquery_strips_operators():
+    """Test that tsquery operators in user input cannot break the query"""
+    assert build_prefix_tsquery("demo & !(pricing | ':*") == "demo:* & pricing:*"
+    assert build_prefix_tsquery("Rückfrage") == "rückfrage:*"
+
+
+def test_prefix_tsquery_empty():
+    """Test that queries without words return None"""
+    assert build_prefix_tsquery("@@ --") is None
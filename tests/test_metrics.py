@@ -0,0 +1,111 @@
+"""
+Tests for request/database metrics and the /metrics endpoint
+"""
+
+from collections import namedtuple
+
+import httpx
+import pytest
+
+from app.core import metrics
+from app.core.metrics import Histogram, api_call_summary, render, sql_operation
+from app.main import app
+
+LoggedQuery = namedtuple("LoggedQuery", "query args timeout elapsed exception conn_addr conn_params")
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that histogram samples follow the Prometheus bucket layout"""
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/x",), value)
+
+    lines = histogram.samples()
+
+    assert lines == [
+        'latency_seconds_bucket{route="/x",le="0.1"} 2',
+        'latency_seconds_bucket{route="/x",le="1.0"} 3',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/x"} 3.65',
+        'latency_seconds_count{route="/x"} 4',
+    ]
+
+
+async def test_requests_recorded_by_route_template():
+    """Test that requests are labelled with the route template and status"""
+    async with _client() as client:
+        await client.get("/")
+        await client.get("/no/such/path")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/",status="200"} 1' in body
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/"} 1' in body
+    assert "/no/such/path" not in body
+    # The scrape itself is still in flight while rendering
+    assert 'http_requests_in_flight{method="GET"} 1' in body
+
+
+async def test_api_call_summary_skips_probes():
+    """Test that the dashboard numbers come from recorded requests, without probes"""
+    async with _client() as client:
+        await client.get("/")
+        await client.get("/")
+        await client.get("/metrics")
+
+    summary = api_call_summary()
+
+    assert summary["total"] == 2
+    assert summary["errors"] == 0
+    assert summary["status"] == "healthy"
+    assert summary["avg_response_time"] > 0
+
+
+def test_api_call_summary_degraded_on_errors():
+    """Test that a high 5xx rate marks the API as degraded"""
+    metrics.http_requests_total.inc(("GET", "/api/admin/users", "200"), 9)
+    metrics.http_requests_total.inc(("GET", "/api/admin/users", "503"), 1)
+
+    summary = api_call_summary(error_rate_threshold=0.05)
+
+    assert summary["total"] == 10
+    assert summary["errors"] == 1
+    assert summary["status"] == "degraded"
+    assert api_call_summary()["avg_response_time"] == 0
+
+
+async def test_query_timer_records_queries():
+    """Test that the pool init callback times queries per pool and statement type"""
+    class FakeConn:
+        def add_query_logger(self, callback):
+            self.callback = callback
+
+    conn = FakeConn()
+    await metrics.query_timer("tenant")(conn)
+    conn.callback(LoggedQuery("SELECT 1", (), None, 0.002, None, None, None))
+    conn.callback(LoggedQuery("\n  UPDATE contact SET x = 1", (), None, 0.2, ValueError(), None, None))
+
+    assert metrics.db_query_duration_seconds.count(("tenant", "SELECT")) == 1
+    assert metrics.db_query_errors_total.value(("tenant", "UPDATE")) == 1
+    assert 'db_query_duration_seconds_sum{pool="tenant",operation="UPDATE"} 0.2' in render()
+
+
+def test_sql_operation():
+    assert sql_operation("  with x as (select 1) select * from x") == "WITH"
+    assert sql_operation("(SELECT 1) UNION (SELECT 2)") == "SELECT"
+    assert sql_operation("SET app.current_org_id = 'x'") == "OTHER"
+    assert sql_operation("") == "OTHER"
@@ -0,0 +1,200 @@
+"""
+Tests for onboarding link caching and batched access tracking
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.services import onboarding_link_service
+from app.services.onboarding_link_service import LinkAccessBuffer, access_updates
+
+
+def test_access_buffer_coalesces_hits():
+    """Test that repeated accesses collapse into one update per link"""
+    buffer = LinkAccessBuffer(max_clients=2)
+    t0 = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+    buffer.record("tok", "10.0.0.1", "ua-1", t0)
+    buffer.record("tok", "10.0.0.1", "ua-1", t0 + timedelta(seconds=1))
+    buffer.record("tok", "10.0.0.2", "ua-2", t0 + timedelta(seconds=2))
+    buffer.record("tok", "10.0.0.3", "ua-3", t0 + timedelta(seconds=3))
+    buffer.record("other", "10.0.0.9", "ua-9", t0)
+
+    rows = access_updates(buffer.drain())
+
+    assert len(buffer) == 0
+    assert [row["link_token"] for row in rows] == ["other", "tok"]
+    tok = rows[1]
+    assert tok["hits"] == 4
+    assert tok["first_at"] == t0.isoformat()
+    assert tok["last_at"] == (t0 + timedelta(seconds=3)).isoformat()
+    # Capped at max_clients distinct values, repeated IPs keep their latest time
+    assert tok["ips"] == [
+        {"ip": "10.0.0.1", "timestamp": (t0 + timedelta(seconds=1)).isoformat()},
+        {"ip": "10.0.0.2", "timestamp": (t0 + timedelta(seconds=2)).isoformat()},
+    ]
+
+
+def test_access_buffer_merge_after_failed_flush():
+    """Test that drained accesses can be put back without losing hits"""
+    buffer = LinkAccessBuffer()
+    t0 = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+    buffer.record("tok", "10.0.0.1", "ua", t0)
+    pending = buffer.drain()
+    buffer.record("tok", "10.0.0.2", "ua", t0 + timedelta(seconds=5))
+    buffer.merge(pending)
+
+    [row] = access_updates(buffer.drain())
+    assert row["hits"] == 2
+    assert row["first_at"] == t0.isoformat()
+    assert {ip["ip"] for ip in row["ips"]} == {"10.0.0.1", "10.0.0.2"}
+
+
+async def test_cancelled_flusher_finishes_its_flush(monkeypatch):
+    """Test that shutting down the flusher mid-flush neither loses nor re-queues accesses"""
+    import asyncio
+    from contextlib import asynccontextmanager
+
+    from app.core import db
+
+    started, release = asyncio.Event(), asyncio.Event()
+    written = []
+
+    class FakeConn:
+        async def execute(self, query, payload):
+            started.set()
+            await release.wait()
+            written.append(payload)
+            return "UPDATE 1"
+
+    class FakePool:
+        @asynccontextmanager
+        async def acquire(self):
+            yield FakeConn()
+
+    monkeypatch.setattr(db, "tenant_db_pool", FakePool())
+    monkeypatch.setattr(onboarding_link_service, "access_buffer", LinkAccessBuffer())
+    onboarding_link_service.access_buffer.record("tok", "10.0.0.1", "ua", datetime.now(timezone.utc))
+
+    task = asyncio.create_task(onboarding_link_service.run_access_flusher(interval_seconds=0.001))
+    await started.wait()
+    task.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert len(written) == 1
+    assert await onboarding_link_service.flush_link_access() == 0
+
+
+async def test_cancelled_flush_puts_accesses_back(monkeypatch):
+    """Test that a flush cancelled mid-write keeps its accesses for the next flush"""
+    import asyncio
+    from contextlib import asynccontextmanager
+
+    from app.core import db
+
+    class FakePool:
+        @asynccontextmanager
+        async def acquire(self):
+            raise asyncio.CancelledError()
+            yield
+
+    monkeypatch.setattr(db, "tenant_db_pool", FakePool())
+    monkeypatch.setattr(onboarding_link_service, "access_buffer", LinkAccessBuffer())
+    onboarding_link_service.access_buffer.record("tok", "10.0.0.1", "ua", datetime.now(timezone.utc))
+
+    try:
+        await onboarding_link_service.flush_link_access()
+    except asyncio.CancelledError:
+        pass
+
+    [row] = access_updates(onboarding_link_service.access_buffer.drain())
+    assert row["hits"] == 1
+
+
+async def test_token_lookup_is_cached(monkeypatch):
+    """Test that token lookups hit the database once until invalidated"""
+    calls = []
+
+    async def fetch(link_token):
+        calls.append(link_token)
+        return {"link_token": link_token, "status": "active"}
+
+    monkeypatch.setattr(onboarding_link_service, "_fetch_link_by_token", fetch)
+    onboarding_link_service._link_cache.invalidate()
+
+    first = await onboarding_link_service.get_onboarding_link_by_token("tok")
+    first["status"] = "mutated"
+    second = await onboarding_link_service.get_onboarding_link_by_token("tok")
+
+    assert calls == ["tok"]
+    assert second["status"] == "active"
+
+    onboarding_link_service._link_cache.invalidate("tok")
+    await onboarding_link_service.get_onboarding_link_by_token("tok")
+    assert calls == ["tok", "tok"]
+
+
+async def test_revoke_invalidates_all_workers(monkeypatch):
+    """Test that revoking drops the cached link here and notifies other workers"""
+    from contextlib import asynccontextmanager
+    from uuid import uuid4
+
+    from app.core import db
+
+    class FakeConn:
+        def __init__(self):
+            self.notified = []
+
+        async def fetchval(self, query, *args):
+            return "tok"
+
+        async def execute(self, query, *args):
+            self.notified.append(args)
+
+    class FakePool:
+        def __init__(self):
+            self.conn = FakeConn()
+
+        @asynccontextmanager
+        async def acquire(self):
+            yield self.conn
+
+    async def fetch(link_token):
+        return {"link_token": link_token, "status": "active"}
+
+    pool = FakePool()
+    monkeypatch.setattr(db, "tenant_db_pool", pool)
+    monkeypatch.setattr(onboarding_link_service, "_fetch_link_by_token", fetch)
+    cache = onboarding_link_service._link_cache
+    cache.invalidate()
+
+    await onboarding_link_service.get_onboarding_link_by_token("tok")
+    assert await onboarding_link_service.revoke_onboarding_link(uuid4(), uuid4())
+
+    assert cache.get("tok") is None
+    assert pool.conn.notified == [(onboarding_link_service.CHANNEL, "tok")]
+
+    # Another worker's notification drops this worker's entry
+    await onboarding_link_service.get_onboarding_link_by_token("tok")
+    onboarding_link_service._on_invalidation(None, 1, onboarding_link_service.CHANNEL, "tok")
+    assert cache.get("tok") is None
+
+
+async def test_expired_link_entries_are_not_served_stale(monkeypatch):
+    """Test that the link cache reloads after its TTL instead of serving stale entries"""
+    statuses = iter(["active", "revoked"])
+
+    async def fetch(link_token):
+        return {"link_token": link_token, "status": next(statuses)}
+
+    cache = onboarding_link_service._link_cache
+    clock = [0.0]
+    monkeypatch.setattr(cache, "clock", lambda: clock[0])
+    monkeypatch.setattr(onboarding_link_service, "_fetch_link_by_token", fetch)
+    cache.invalidate()
+
+    assert (await onboarding_link_service.get_onboarding_link_by_token("tok"))["status"] == "active"
+    clock[0] += cache.ttl
+    assert (await onboarding_link_service.get_onboarding_link_by_token("tok"))["status"] == "revoked"
@@ -0,0 +1,60 @@
+"""
+Tests for keyset pagination cursors
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.pagination import (
+    encode_cursor,
+    decode_cursor,
+    decode_sort_cursor,
+    encode_sort_cursor,
+    next_cursor_for,
+)
+
+
+def test_cursor_roundtrip():
+    """Test that a cursor decodes to the sort key it was built from"""
+    created_at = datetime(2025, 10, 12, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    cursor = encode_cursor(created_at, row_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+def test_decode_invalid_cursor():
+    """Test that malformed cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_next_cursor_for_last_page():
+    """Test that a short page has no next cursor"""
+    rows = [{"id": uuid4(), "created_at": datetime.now(timezone.utc)}]
+
+    assert next_cursor_for(rows, limit=10) is None
+    assert next_cursor_for(rows, limit=1) == encode_cursor(rows[0]["created_at"], rows[0]["id"])
+
+
+def test_sort_cursor_roundtrip():
+    """Test that sort cursors keep timestamps and integer sort values"""
+    created_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    assert decode_sort_cursor(encode_sort_cursor("created_at", created_at, row_id), "created_at") == (created_at, row_id)
+    assert decode_sort_cursor(encode_sort_cursor("contacts", 42, row_id), "contacts") == (42, row_id)
+
+
+def test_sort_cursor_rejects_other_sort():
+    """Test that a cursor can't be replayed against a different sort"""
+    cursor = encode_sort_cursor("contacts", 42, uuid4())
+
+    with pytest.raises(ValueError):
+        decode_sort_cursor(cursor, "campaigns")
+    with pytest.raises(ValueError):
+        decode_sort_cursor("not-a-cursor", "contacts")
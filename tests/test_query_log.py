@@ -0,0 +1,173 @@
+"""
+Tests for the slow query log and sampled EXPLAIN capture
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from app.core import db
+from app.core.query_log import EXPLAIN_MIN_INTERVAL_SECONDS, SlowQueryLog, TracedConnection, param_shapes, service_caller
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def start(self):
+        self.conn.log.append("BEGIN")
+
+    async def rollback(self):
+        self.conn.log.append("ROLLBACK")
+
+
+class FakeConn:
+    def __init__(self):
+        self.log = []
+
+    def transaction(self, readonly=False):
+        assert readonly
+        return FakeTransaction(self)
+
+    async def execute(self, query, *args):
+        self.log.append(query)
+
+    async def fetchval(self, query, *args):
+        self.log.append(query)
+        return json.dumps([{"Plan": {"Node Type": "Seq Scan"}}])
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConn()
+
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        yield self.conn
+
+
+def _slow_log(tmp_path, sample_rate=1.0, clock=None):
+    return SlowQueryLog(
+        threshold_ms=100,
+        explain_sample_rate=sample_rate,
+        explain_path=str(tmp_path / "plans" / "slow.jsonl"),
+        clock=clock or FakeClock(),
+        sample=lambda: 0.5
+    )
+
+
+def test_param_shapes_hide_values():
+    """Test that parameters are described by type and length only"""
+    shapes = param_shapes(["secret@example.com", None, 42, [uuid4(), uuid4()], {"a": 1}, b"xy"])
+
+    assert shapes == ["str(18)", "null", "int", "list[UUID](2)", "dict(1)", "bytes(2)"]
+
+
+def test_service_caller_tags_service_method():
+    """Test that queries are attributed to the first app.services frame"""
+    namespace = {"__name__": "app.services.fake_service", "service_caller": service_caller}
+    exec("def list_things():\n    return helper()\n", namespace)
+    namespace["helper"] = lambda: service_caller(depth=2)
+
+    assert namespace["list_things"]() == "fake_service.list_things"
+
+
+def test_fast_queries_not_logged(tmp_path, caplog):
+    slow_log = _slow_log(tmp_path)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+        slow_log.observe("tenant", "x_service.f", "SELECT 1", (), 0.05)
+
+    assert caplog.records == []
+
+
+async def test_slow_query_logged_and_plan_captured(tmp_path, caplog, monkeypatch):
+    """Test that a slow SELECT is logged with its shapes and its plan is written"""
+    pool = FakePool()
+    monkeypatch.setattr(db, "tenant_db_pool", pool)
+    slow_log = _slow_log(tmp_path)
+    query = "SELECT *\n    FROM contact WHERE email = $1"
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+        slow_log.observe("tenant", "contact_service.find", query, ("lead@example.com",), 0.25)
+    await asyncio.gather(*slow_log._tasks)
+
+    message = caplog.records[0].getMessage()
+    assert "250.0ms" in message
+    assert "contact_service.find" in message
+    assert "SELECT * FROM contact WHERE email = $1" in message
+    assert "['str(16)']" in message
+    assert "lead@example.com" not in message
+
+    assert pool.conn.log[0] == "BEGIN"
+    assert pool.conn.log[2].startswith("EXPLAIN (ANALYZE, BUFFERS")
+    assert pool.conn.log[-1] == "ROLLBACK"
+
+    entries = [json.loads(line) for line in (tmp_path / "plans" / "slow.jsonl").read_text().splitlines()]
+    assert len(entries) == 1
+    assert entries[0]["caller"] == "contact_service.find"
+    assert entries[0]["param_shapes"] == ["str(16)"]
+    assert entries[0]["plan"][0]["Plan"]["Node Type"] == "Seq Scan"
+
+
+async def test_explain_only_sampled_reads(tmp_path, monkeypatch):
+    """Test that writes are never explained and each caller at most once per interval"""
+    pool = FakePool()
+    monkeypatch.setattr(db, "tenant_db_pool", pool)
+    clock = FakeClock()
+    slow_log = _slow_log(tmp_path, clock=clock)
+
+    slow_log.observe("tenant", "a_service.update", "UPDATE contact SET x = $1", (1,), 1.0)
+    assert not slow_log._tasks
+
+    slow_log.observe("tenant", "a_service.read", "SELECT 1", (), 1.0)
+    await asyncio.gather(*slow_log._tasks)
+    slow_log.observe("tenant", "a_service.read", "SELECT 1", (), 1.0)
+    assert not slow_log._tasks
+
+    clock.now += EXPLAIN_MIN_INTERVAL_SECONDS
+    slow_log.observe("tenant", "a_service.read", "SELECT 1", (), 1.0)
+    assert len(slow_log._tasks) == 1
+    await asyncio.gather(*slow_log._tasks)
+
+    unsampled = _slow_log(tmp_path, sample_rate=0.1)
+    unsampled.observe("tenant", "a_service.read", "SELECT 1", (), 1.0)
+    assert not unsampled._tasks
+
+
+async def test_traced_connection_reports_queries(monkeypatch):
+    """Test that traced connections report the calling code, timing and errors"""
+    from app.core import query_log
+
+    observed = []
+    monkeypatch.setattr(query_log.slow_query_log, "observe", lambda *args: observed.append(args))
+
+    class FakeTraced:
+        pool_name = "global_kb"
+
+    async def failing_fetch(query, *args):
+        raise ValueError("boom")
+
+    async def run_query():
+        try:
+            await TracedConnection._traced(FakeTraced(), failing_fetch, "SELECT $1", (7,))
+        except ValueError:
+            return
+        raise AssertionError("error not propagated")
+
+    await run_query()
+
+    pool, caller, query, args, elapsed, error = observed[0]
+    assert (pool, query, args) == ("global_kb", "SELECT $1", (7,))
+    assert isinstance(error, ValueError)
+    assert elapsed >= 0
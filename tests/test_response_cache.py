@@ -0,0 +1,84 @@
+"""
+Tests for the response cache decorator
+"""
+
+from fastapi import FastAPI, HTTPException, Query
+import httpx
+import pytest
+
+from app.core import response_cache
+from app.core.response_cache import MemoryBackend, cached_response, invalidate_tags
+
+calls = []
+
+app = FastAPI()
+
+
+@app.get("/items")
+@cached_response(tags=["items"])
+async def list_items(status_filter: str = Query("all", alias="status")):
+    calls.append(status_filter)
+    if status_filter == "broken":
+        raise HTTPException(status_code=500, detail="broken")
+    return {"status": status_filter, "version": len(calls)}
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    calls.clear()
+    response_cache.set_backend(MemoryBackend())
+    yield
+    response_cache.set_backend(None)
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_response_is_cached_per_query(client):
+    """Test that repeated requests are served from cache, keyed on the query"""
+    first = await client.get("/items?status=active")
+    second = await client.get("/items?status=active")
+    other = await client.get("/items?status=paused")
+
+    assert first.json() == second.json() == {"status": "active", "version": 1}
+    assert other.json()["status"] == "paused"
+    assert calls == ["active", "paused"]
+
+
+async def test_tenants_do_not_share_entries(client):
+    """Test that different Authorization headers get separate entries"""
+    await client.get("/items", headers={"Authorization": "Bearer a"})
+    await client.get("/items", headers={"Authorization": "Bearer b"})
+
+    assert len(calls) == 2
+
+
+async def test_etag_not_modified(client):
+    """Test that a matching If-None-Match returns an empty 304"""
+    etag = (await client.get("/items")).headers["etag"]
+
+    response = await client.get("/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+async def test_invalidate_tags(client):
+    """Test that invalidating a tag forces a reload"""
+    await client.get("/items")
+    await invalidate_tags("items")
+    response = await client.get("/items")
+
+    assert response.json()["version"] == 2
+
+
+async def test_errors_are_not_cached(client):
+    """Test that HTTPExceptions pass through uncached"""
+    assert (await client.get("/items?status=broken")).status_code == 500
+    assert (await client.get("/items?status=broken")).status_code == 500
+    assert calls == ["broken", "broken"]
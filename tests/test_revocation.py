@@ -0,0 +1,143 @@
+"""
+Tests for the token revocation list and its use in get_current_user
+"""
+
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth, db
+from app.core.auth import VerifiedTokenCache, get_current_user
+from app.core.revocation import RevocationList, jti_key, sid_key
+from app.core.security import create_access_token, decode_access_token
+from app.services import token_service
+from app.services.token_service import access_token_claims, hash_refresh_token
+
+
+def test_revocations_expire():
+    """Test that entries only count until their expiry and are pruned"""
+    now = [100.0]
+    revoked = RevocationList(clock=lambda: now[0])
+
+    revoked.add("jti:a", 110)
+    revoked.add("jti:old", 50)
+    assert revoked.is_revoked("jti:a")
+    assert revoked.is_revoked(None, "jti:a")
+    assert not revoked.is_revoked("jti:b", None)
+    assert len(revoked) == 1
+
+    now[0] = 110
+    assert not revoked.is_revoked("jti:a")
+    assert revoked.prune() == 1
+
+
+def test_merge_keeps_live_entries():
+    """Test that a full reload adds unexpired revocations without dropping live ones"""
+    now = [100.0]
+    revoked = RevocationList(clock=lambda: now[0])
+    revoked.add("jti:live", 200)
+    revoked.add("jti:short", 120)
+
+    revoked.merge([("sid:s1", 150), ("sid:s2", 90), ("jti:short", 180)])
+
+    assert revoked.is_revoked("sid:s1")
+    assert not revoked.is_revoked("sid:s2")
+    assert revoked.is_revoked("jti:live")
+
+    now[0] = 150
+    assert revoked.is_revoked("jti:short")
+    assert revoked.prune() == 1
+
+
+async def test_revoked_session_rejects_cached_tokens(monkeypatch):
+    """Test that revoking a session rejects its access tokens, cached or not"""
+    revoked = RevocationList()
+    monkeypatch.setattr(auth, "revoked_tokens", revoked)
+    monkeypatch.setattr(auth, "token_cache", VerifiedTokenCache())
+
+    claims = access_token_claims(
+        {"user_id": "u1", "organization_id": "o1", "role": "admin", "email": "a@example.com"},
+        family_id="f1"
+    )
+    token = create_access_token(claims)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    payload = decode_access_token(token)
+
+    assert payload["sid"] == "f1" and payload["jti"]
+    assert (await get_current_user(credentials)).user_id == "u1"
+
+    revoked.add(sid_key("f1"), payload["exp"])
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(credentials)
+    assert exc.value.status_code == 401
+
+
+async def test_revoked_jti(monkeypatch):
+    """Test that a single revoked access token is rejected"""
+    revoked = RevocationList()
+    monkeypatch.setattr(auth, "revoked_tokens", revoked)
+    monkeypatch.setattr(auth, "token_cache", VerifiedTokenCache())
+
+    token = create_access_token({"user_id": "u1", "organization_id": "o1", "role": "admin", "email": "a@example.com"})
+    payload = decode_access_token(token)
+    revoked.add(jti_key(payload["jti"]), payload["exp"])
+
+    with pytest.raises(HTTPException):
+        await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def test_refresh_tokens_are_hashed():
+    """Test that refresh tokens are stored as fixed-size digests"""
+    assert hash_refresh_token("abc") == hash_refresh_token("abc")
+    assert len(hash_refresh_token("abc")) == 32
+    assert hash_refresh_token("abc") != hash_refresh_token("abd")
+
+
+class RLSTokenConn:
+    """Tenant connection whose "user" rows are only visible in their organization"""
+
+    def __init__(self, user_id, org_id):
+        self.org_setting = ""
+        self.user_org = org_id
+        self.token = {
+            "id": uuid4(), "family_id": uuid4(), "user_id": user_id, "organization_id": org_id,
+            "expired": False, "rotated_at": None, "revoked_at": None
+        }
+        self.user = {"role": "admin", "email": "a@example.com", "status": "active"}
+        self.inserted = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetchrow(self, query, *args):
+        if "FROM refresh_token" in query:
+            return self.token
+        return self.user if self.org_setting == str(self.user_org) else None
+
+    async def execute(self, query, *args):
+        if "set_config('app.current_org_id'" in query:
+            self.org_setting = args[0]
+        elif "INSERT INTO refresh_token" in query:
+            self.inserted += 1
+
+
+async def test_refresh_reads_user_in_token_organization(monkeypatch):
+    """Test that refresh sees the user through the RLS policy of the token's organization"""
+    user_id, org_id = uuid4(), uuid4()
+    conn = RLSTokenConn(user_id, org_id)
+    monkeypatch.setattr(db, "tenant_db_pool", conn)
+
+    session = await token_service.refresh_session("token")
+
+    claims = decode_access_token(session["access_token"])
+    assert claims["user_id"] == str(user_id)
+    assert claims["role"] == "admin"
+    assert conn.inserted == 1
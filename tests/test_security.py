@@ -0,0 +1,39 @@
+"""
+Tests for the password hash pool
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import PasswordHasher, PasswordHasherBusy, hash_password, verify_password_async
+
+
+async def test_verify_password_async():
+    """Test that verification on the pool matches the blocking version"""
+    hashed = hash_password("s3cret")
+
+    assert await verify_password_async("s3cret", hashed) is True
+    assert await verify_password_async("wrong", hashed) is False
+
+
+async def test_hasher_rejects_when_saturated():
+    """Test that operations beyond workers + max_waiting are rejected"""
+    hasher = PasswordHasher(workers=1, max_waiting=1)
+    release = threading.Event()
+
+    try:
+        running = [asyncio.create_task(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert hasher.pending == 2
+
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.run(release.wait)
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert hasher.pending == 0
+    finally:
+        release.set()
+        hasher.shutdown()
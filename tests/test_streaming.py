@@ -0,0 +1,68 @@
+"""
+Tests for the streaming export encoders
+"""
+
+import csv
+import gzip
+import json
+from datetime import datetime, timezone
+from io import StringIO
+from uuid import uuid4
+
+from app.core import streaming
+from app.core.streaming import iter_csv, iter_json_array, iter_ndjson, gzip_chunks
+
+
+async def records(count):
+    for i in range(count):
+        yield {
+            "id": uuid4(),
+            "event_type": "email_sent",
+            "created_at": datetime(2025, 10, 12, tzinfo=timezone.utc),
+            "n": i
+        }
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+async def test_iter_ndjson_chunks(monkeypatch):
+    """Test that NDJSON output is chunked and every line parses"""
+    monkeypatch.setattr(streaming, "CHUNK_SIZE", 256)
+
+    chunks = await collect(iter_ndjson(records(50)))
+    lines = "".join(chunks).splitlines()
+
+    assert len(chunks) > 1
+    assert [json.loads(line)["n"] for line in lines] == list(range(50))
+
+
+async def test_iter_json_array_is_valid_json(monkeypatch):
+    """Test that the chunked JSON array parses as one document"""
+    monkeypatch.setattr(streaming, "CHUNK_SIZE", 256)
+
+    assert json.loads("".join(await collect(iter_json_array(records(20)))))[19]["n"] == 19
+    assert json.loads("".join(await collect(iter_json_array(records(0))))) == []
+
+
+async def test_iter_csv_header_and_rows(monkeypatch):
+    """Test that CSV output has one header and ignores extra keys"""
+    monkeypatch.setattr(streaming, "CHUNK_SIZE", 128)
+
+    chunks = await collect(iter_csv(records(30), ["event_type", "n"]))
+    rows = list(csv.DictReader(StringIO("".join(chunks))))
+
+    assert len(chunks) > 1
+    assert len(rows) == 30
+    assert rows[29] == {"event_type": "email_sent", "n": "29"}
+
+
+async def test_gzip_chunks_roundtrip():
+    """Test that gzip output decompresses to the original stream"""
+    text = "".join(await collect(iter_ndjson(records(100))))
+    compressed = b"".join(await collect(gzip_chunks(iter_ndjson(records(100)))))
+
+    decoded = gzip.decompress(compressed).decode("utf-8")
+    assert [json.loads(line)["n"] for line in decoded.splitlines()] == \
+        [json.loads(line)["n"] for line in text.splitlines()]
@@ -0,0 +1,65 @@
+"""
+Tests for the verified-token cache used by get_current_user
+"""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth
+from app.core.auth import VerifiedTokenCache, get_current_user
+from app.core.security import create_access_token
+from app.models.auth import TokenData
+
+USER = TokenData(user_id="u1", organization_id="o1", role="admin", email="a@example.com")
+
+
+def test_cache_respects_exp():
+    """Test that entries are served until the token's exp, then dropped"""
+    now = [1000.0]
+    cache = VerifiedTokenCache(clock=lambda: now[0])
+
+    cache.set("token", USER, exp=1010)
+    assert cache.get("token") is USER
+
+    now[0] = 1010
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+    cache.set("expired", USER, exp=900)
+    assert len(cache) == 0
+
+
+def test_cache_is_bounded_lru():
+    """Test that the least recently used token is evicted first"""
+    cache = VerifiedTokenCache(max_entries=2, clock=lambda: 0.0)
+
+    cache.set("a", USER, exp=10)
+    cache.set("b", USER, exp=10)
+    cache.get("a")
+    cache.set("c", USER, exp=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is USER and cache.get("c") is USER
+
+
+async def test_get_current_user_uses_cache(monkeypatch):
+    """Test that a token is verified once and invalid tokens are never cached"""
+    monkeypatch.setattr(auth, "token_cache", VerifiedTokenCache())
+    decoded = []
+    real_decode = auth.decode_access_token
+    monkeypatch.setattr(auth, "decode_access_token", lambda token: decoded.append(token) or real_decode(token))
+
+    token = create_access_token({"user_id": "u1", "organization_id": "o1", "role": "admin", "email": "a@example.com"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    first = await get_current_user(credentials)
+    second = await get_current_user(credentials)
+    assert first == second and first.user_id == "u1"
+    assert len(decoded) == 1
+
+    bad = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token + "x")
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await get_current_user(bad)
+    assert len(decoded) == 3
@@ -0,0 +1,200 @@
+"""
+Tests for set-based user assignment helpers
+"""
+
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from app.core import db
+from app.services import user_assignment_service
+from app.services.user_assignment_service import _all_failed, _org_users_query, _outcomes, plan_round_robin
+
+
+def test_outcomes_per_id():
+    """Test that upsert rows map to created / updated / failed outcomes"""
+    created, updated, missing = uuid4(), uuid4(), uuid4()
+    rows = [
+        {"contact_id": created, "inserted": True},
+        {"contact_id": updated, "inserted": False},
+        {"contact_id": missing, "inserted": None},
+    ]
+
+    result = _outcomes(rows, ("contact_id",), "Contact not found in organization")
+
+    assert [item["outcome"] for item in result["results"]] == ["created", "updated", "failed"]
+    assert result["success_count"] == 2
+    assert result["created_count"] == 1
+    assert result["updated_count"] == 1
+    assert result["failed"] == [{"contact_id": str(missing), "error": "Contact not found in organization"}]
+
+
+def test_outcomes_for_pairs():
+    """Test that bulk rows keep both ids"""
+    user_id, contact_id = uuid4(), uuid4()
+
+    result = _outcomes([{"user_id": user_id, "contact_id": contact_id, "inserted": True}], ("user_id", "contact_id"), "")
+
+    assert result["results"] == [{"user_id": str(user_id), "contact_id": str(contact_id), "outcome": "created"}]
+
+
+def test_all_failed():
+    """Test the result of a failed statement"""
+    result = _all_failed([{"campaign_id": "a"}, {"campaign_id": "b"}], "boom")
+
+    assert result["success_count"] == 0
+    assert result["failed_count"] == 2
+    assert result["results"][0] == {"campaign_id": "a", "error": "boom", "outcome": "failed"}
+
+
+async def test_batch_size_limit(monkeypatch):
+    """Test that oversized batches are rejected before touching the database"""
+    monkeypatch.setattr(user_assignment_service, "MAX_BATCH_SIZE", 2)
+
+    with pytest.raises(ValueError):
+        await user_assignment_service.assign_contacts_to_user(uuid4(), [uuid4()] * 3, uuid4(), uuid4())
+
+
+class FakeTenantDB:
+    """Tenant pool over in-memory users, contacts and assignments"""
+
+    def __init__(self, org_id):
+        self.users = {}
+        self.contacts = {}
+        self.owners = {}
+        self.weights = {}
+        self.inserted = []
+        self.add_user(org_id)
+
+    def add_user(self, org_id):
+        user_id = uuid4()
+        self.users[user_id] = org_id
+        return user_id
+
+    def add_contact(self, org_id, owner=None):
+        contact_id = uuid4()
+        self.contacts[contact_id] = org_id
+        if owner:
+            self.owners[contact_id] = owner
+        return contact_id
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetch(self, query, *args):
+        if "FROM contact" in query:
+            ids, org_id = args
+            return [{"id": i} for i in ids if self.contacts.get(i) == org_id]
+        if "FROM user_contact_assignment" in query:
+            ids, org_id = args
+            return [{"contact_id": i, "user_id": self.owners[i]} for i in ids if i in self.owners]
+        (org_id,) = args
+        return [
+            {"user_id": user_id, "active_contacts": 0, "weight": 1}
+            for user_id, user_org in self.users.items() if user_org == org_id
+        ]
+
+    async def execute(self, query, *args):
+        if "INSERT INTO user_assignment_load" in query:
+            user_id, org_id, weight = args
+            if self.users.get(user_id) != org_id:
+                return "INSERT 0 0"
+            self.weights[user_id] = weight
+            return "INSERT 0 1"
+        if "INSERT INTO user_contact_assignment" in query:
+            user_ids, contact_ids, org_id, _ = args
+            assert all(self.contacts[i] == org_id for i in contact_ids)
+            self.inserted.extend(zip(contact_ids, user_ids))
+        return "SELECT 1"
+
+
+async def test_round_robin_weight_requires_membership(monkeypatch):
+    """Test that the weight is only set for a user of the given organization"""
+    org_id, other_org_id = uuid4(), uuid4()
+    fake = FakeTenantDB(org_id)
+    user_id = fake.add_user(org_id)
+    monkeypatch.setattr(db, "tenant_db_pool", fake)
+
+    assert await user_assignment_service.set_round_robin_weight(user_id, other_org_id, 2.0) is False
+    assert await user_assignment_service.set_round_robin_weight(uuid4(), org_id, 2.0) is False
+    assert fake.weights == {}
+
+    assert await user_assignment_service.set_round_robin_weight(user_id, org_id, 2.0) is True
+    assert fake.weights == {user_id: 2.0}
+
+
+async def test_distribute_skips_owned_and_foreign_contacts(monkeypatch):
+    """Test that owned contacts are skipped and foreign or unknown ones fail per id"""
+    org_id, other_org_id = uuid4(), uuid4()
+    fake = FakeTenantDB(org_id)
+    owner = next(iter(fake.users))
+    fake.add_user(other_org_id)
+    new = fake.add_contact(org_id)
+    owned = fake.add_contact(org_id, owner=owner)
+    foreign = fake.add_contact(other_org_id)
+    unknown = uuid4()
+    monkeypatch.setattr(db, "tenant_db_pool", fake)
+
+    result = await user_assignment_service.distribute_contacts_round_robin(
+        [new, owned, foreign, unknown, new], org_id, owner
+    )
+
+    assert fake.inserted == [(new, owner)]
+    assert result["assignments"] == [{"contact_id": str(new), "user_id": str(owner)}]
+    assert result["skipped"] == [{"contact_id": str(owned), "user_id": str(owner)}]
+    assert [item["contact_id"] for item in result["failed"]] == [str(foreign), str(unknown)]
+    assert (result["assigned_count"], result["skipped_count"], result["failed_count"]) == (1, 1, 2)
+
+
+def test_plan_round_robin_balances_loads():
+    """Test that the least-loaded user is filled up first, then picks alternate"""
+    a, b = uuid4(), uuid4()
+
+    picks = plan_round_robin([(a, 0, 1.0), (b, 3, 1.0)], 5)
+
+    assert picks.count(a) == 4
+    assert picks.count(b) == 1
+    assert picks[:3] == [a, a, a]
+
+
+def test_plan_round_robin_weights():
+    """Test that weights scale each user's share"""
+    a, b = uuid4(), uuid4()
+
+    picks = plan_round_robin([(a, 0, 2.0), (b, 0, 1.0)], 300)
+
+    assert picks.count(a) == 200
+    assert picks.count(b) == 100
+
+
+def test_plan_round_robin_without_users():
+    """Test that no users means no picks"""
+    assert plan_round_robin([], 10) == []
+
+
+def test_org_users_query_keyset():
+    """Test that workload listings page on (count, id) in the sort direction"""
+    sql = _org_users_query("contacts", "desc", keyset=True, limit=True)
+
+    assert "get_user_contact_count" not in sql
+    assert "AND (COALESCE(l.active_contacts, 0), u.id) < ($2, $3)" in sql
+    assert "ORDER BY COALESCE(l.active_contacts, 0) DESC, u.id DESC" in sql
+    assert "LIMIT $4" in sql
+
+    sql = _org_users_query("created_at", "asc", keyset=False, limit=True)
+    assert "(u.created_at, u.id) >" not in sql
+    assert "LIMIT $2" in sql
+
+
+def test_org_users_query_invalid_sort():
+    """Test that unknown sorts and orders are rejected"""
+    with pytest.raises(ValueError):
+        _org_users_query("email; DROP TABLE", "desc", keyset=False, limit=False)
+    with pytest.raises(ValueError):
+        _org_users_query("contacts", "sideways", keyset=False, limit=False)
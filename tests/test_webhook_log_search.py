@@ -0,0 +1,62 @@
+"""
+Tests for webhook log payload search translation
+"""
+
+import pytest
+
+from app.services.webhook_log_service import (
+    build_payload_search_clauses,
+    parse_payload_search,
+)
+
+
+def test_parse_field_terms_and_free_text():
+    """Test that field terms are split from free text"""
+    terms, free_text = parse_payload_search(
+        'lead_email:max@beispiel.ch campaign_name:"Q4 Outreach" timeout'
+    )
+
+    assert terms == [("lead_email", "max@beispiel.ch"), ("campaign_name", "Q4 Outreach")]
+    assert free_text == "timeout"
+
+
+def test_text_mode_ignores_field_syntax():
+    """Test that text mode treats field:value as plain text"""
+    assert parse_payload_search("https://acme.ch", mode="text") == ([], "https://acme.ch")
+
+
+def test_auto_mode_keeps_plain_text_searches():
+    """Test that URLs and unknown keys stay substring searches in auto mode"""
+    assert parse_payload_search("https://acme.ch/x") == ([], "https://acme.ch/x")
+    assert parse_payload_search("note:call unibox_url://x") == ([], "note:call unibox_url://x")
+
+    clauses = build_payload_search_clauses("https://acme.ch/x")
+    assert clauses == [("wl.payload_text ILIKE {0}", ["%https://acme.ch/x%"])]
+
+
+def test_structured_mode_requires_terms():
+    """Test that structured mode rejects free text"""
+    with pytest.raises(ValueError):
+        parse_payload_search("timeout", mode="structured")
+
+
+def test_containment_clauses():
+    """Test translation into containment and jsonpath predicates"""
+    clauses = build_payload_search_clauses(
+        "lead.email:max@beispiel.ch open_count:3 bounce_type:*", mode="structured"
+    )
+
+    assert clauses[0] == ("wl.payload @> {0}::jsonb", ['{"lead": {"email": "max@beispiel.ch"}}'])
+    assert clauses[1] == (
+        "(wl.payload @> {0}::jsonb OR wl.payload @> {1}::jsonb)",
+        ['{"open_count": "3"}', '{"open_count": 3}']
+    )
+    assert clauses[2] == ("wl.payload @? {0}::jsonpath", ['$."bounce_type"'])
+
+
+def test_prefix_and_free_text_clauses():
+    """Test prefix jsonpath and trigram fallback"""
+    clauses = build_payload_search_clauses("event_type:email_* 100%")
+
+    assert clauses[0] == ("wl.payload @? {0}::jsonpath", ['$."event_type" ? (@ starts with "email_")'])
+    assert clauses[1] == ("wl.payload_text ILIKE {0}", ["%100\\%%"])